@@ -0,0 +1,618 @@
+"""
+Model Openness Tool - Asynchronous Model Scraper
+
+asyncio counterpart of ModelScraper for large batch runs. The HuggingFace
+requests and GitHub repository probes of a whole batch run on one event loop
+over a shared aiohttp connection pool. Metadata extraction, component and
+license detection and YAML formatting are inherited unchanged from
+ModelScraper, so both engines produce identical drafts.
+
+Requires the optional aiohttp dependency (pip install aiohttp).
+
+Example:
+    scraper = AsyncModelScraper(concurrency=32)
+    results = asyncio.run(scraper.scrape_many(model_ids, '../models'))
+"""
+
+import asyncio
+import contextvars
+import functools
+import json
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from requests.structures import CaseInsensitiveDict
+from requests.utils import parse_header_links
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from http_cache import ResponseCache
+from http_session import (
+    RETRY_STATUSES, STREAM_CHUNK_SIZE, THROTTLE_STATUSES, HostRateLimiter, backoff_delay,
+    iter_json_array, parse_retry_after
+)
+from model_scraper import DEFAULT_MAX_CARD_BYTES, DEFAULT_MAX_TREE_BYTES, ModelScraper
+from repo_tree import DEFAULT_TREE_DEPTH, RepoFeatures, tree_url
+from scrape_result import ScrapeResult
+
+
+class AsyncModelScraper(ModelScraper):
+    """Scrapes many models concurrently on a single asyncio event loop."""
+
+    def __init__(
+        self,
+        hf_token: Optional[str] = None,
+        concurrency: int = 16,
+        rate_limit: Optional[float] = None,
+        timeout: float = 30.0,
+        probe_timeout: float = 5.0,
+        cache: Optional[ResponseCache] = None,
+        max_card_bytes: Optional[int] = DEFAULT_MAX_CARD_BYTES,
+        max_tree_bytes: Optional[int] = DEFAULT_MAX_TREE_BYTES,
+        tree_depth: int = DEFAULT_TREE_DEPTH
+    ):
+        """Initialize the scraper.
+
+        Args:
+            hf_token: Optional HuggingFace API token for accessing gated models
+            concurrency: Maximum number of models scraped at the same time
+            rate_limit: Maximum requests per second per host (None means unlimited
+                until a host throttles)
+            timeout: Total timeout in seconds for HuggingFace requests
+            probe_timeout: Total timeout in seconds for GitHub repository probes
+            cache: Optional on-disk HTTP response cache shared with the threaded engine
+            max_card_bytes: Bytes of the model card read at most (None for no limit)
+            max_tree_bytes: Bytes of each repository file listing page read at
+                most (None for no limit)
+            tree_depth: Subdirectory levels of the repository listed below the
+                top level (0 for the top level only)
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncModelScraper requires aiohttp (pip install aiohttp)")
+
+        super().__init__(
+            hf_token=hf_token,
+            cache=cache,
+            max_card_bytes=max_card_bytes,
+            max_tree_bytes=max_tree_bytes,
+            tree_depth=tree_depth
+        )
+        self.cache = cache
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = HostRateLimiter(rate_limit or 0.0)
+        # Retry settings and request counters are shared with the threaded session
+        self.stats = self.session.stats
+        self.timeout = timeout
+        self.probe_timeout = probe_timeout
+        self._client = None
+        self._repo_probes: Dict[str, 'asyncio.Future'] = {}
+
+    async def __aenter__(self) -> 'AsyncModelScraper':
+        """Open the shared HTTP client."""
+        headers = {}
+        if self.hf_token:
+            headers['Authorization'] = f'Bearer {self.hf_token}'
+        # Each model in flight issues up to three HuggingFace requests at once
+        connector = aiohttp.TCPConnector(limit=self.concurrency * 3, ttl_dns_cache=300)
+        self._client = aiohttp.ClientSession(connector=connector, headers=headers)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        await self._client.close()
+        self._client = None
+        self._repo_probes = {}
+
+    async def _request(self, method: str, url: str, timeout: float, max_bytes: Optional[int] = None):
+        """Send a request and read the response body, logging it to the session's recorder.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            timeout: Total timeout in seconds
+            max_bytes: Body bytes read at most; a body cut off there is not cached
+
+        Returns:
+            Tuple of (status_code, body_text, headers)
+
+        Raises:
+            aiohttp.ClientError: On connection errors
+            asyncio.TimeoutError: If the request does not finish in time
+        """
+        trace = {'retries': 0, 'blocked': 0.0, 'rate_limited': 0, 'cache_status': 'bypass', 'size': None}
+        recorder = self.session.recorder
+        if recorder is None:
+            return await self._send(method, url, timeout, max_bytes, trace)
+
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            status, body, headers = await self._send(method, url, timeout, max_bytes, trace)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            recorder.record(
+                method, url, None, started, time.perf_counter() - start,
+                retries=trace['retries'], blocked=trace['blocked'], rate_limited=trace['rate_limited'],
+                error=str(e) or type(e).__name__
+            )
+            raise
+        recorder.record(
+            method, url, status, started, time.perf_counter() - start,
+            size=trace['size'],
+            cache_status=trace['cache_status'],
+            retries=trace['retries'],
+            blocked=trace['blocked'],
+            rate_limited=trace['rate_limited'],
+            content_type=headers.get('Content-Type')
+        )
+        return status, body, headers
+
+    async def _send(self, method: str, url: str, timeout: float, max_bytes: Optional[int], trace: Dict):
+        """Send a request and read the response body.
+
+        Responses are served from and stored in the response cache when one
+        is configured. Requests are paced and retried like those of the
+        threaded session (see RateLimitedSession). The aiohttp timeout covers connecting and reading the
+        body, and the connection is released back to the pool even when the
+        task is cancelled mid-request.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            timeout: Total timeout in seconds
+            max_bytes: Body bytes read at most; a body cut off there is not cached
+            trace: Dictionary receiving the retries, blocked time, 429 count,
+                cache status and body size (see RateLimitedSession.send)
+
+        Returns:
+            Tuple of (status_code, body_text, headers)
+
+        Raises:
+            aiohttp.ClientError: On connection errors
+            asyncio.TimeoutError: If the request does not finish in time
+        """
+        entry = None
+        # The client sends the session's Authorization header with every request
+        authorization = self.session.headers.get('Authorization')
+        if self.cache is not None:
+            trace['cache_status'] = 'miss'
+            entry = self.cache.get(method, url, authorization)
+            if entry is not None and self.cache.is_fresh(entry):
+                return self._cached_result(entry, 'hit', trace)
+            if self.cache.offline:
+                raise aiohttp.ClientConnectionError(f"Offline mode: {url} is not in the cache")
+
+        headers = {'If-None-Match': entry.etag} if entry is not None and entry.etag else None
+        host = urlparse(url).netloc
+        # Like RateLimitedSession, only idempotent requests are retried
+        retries = self.session.max_retries if method in ('GET', 'HEAD', 'OPTIONS') else 0
+        attempt = 0
+
+        while True:
+            delay = self.rate_limiter.reserve(host)
+            if delay > 0:
+                await asyncio.sleep(delay)
+                trace['blocked'] += delay
+            trace['retries'] = attempt
+            self.stats.increment('requests')
+
+            try:
+                async with self._client.request(
+                    method,
+                    self.session.resolve(url),
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                    allow_redirects=True
+                ) as response:
+                    status = response.status
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    throttled = status in THROTTLE_STATUSES
+                    if throttled:
+                        self.stats.increment('throttled')
+                        self.rate_limiter.throttle(host, retry_after)
+                    if status == 429:
+                        trace['rate_limited'] += 1
+
+                    if status not in RETRY_STATUSES or attempt >= retries:
+                        if status in RETRY_STATUSES:
+                            self.stats.increment('failed')
+                        else:
+                            self.rate_limiter.succeed(host)
+
+                        if status == 304 and entry is not None:
+                            self.cache.touch(entry)
+                            return self._cached_result(entry, 'revalidated', trace)
+
+                        body = b''
+                        truncated = False
+                        if method != 'HEAD':
+                            chunks = []
+                            size = 0
+                            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                                if max_bytes is not None and size + len(chunk) > max_bytes:
+                                    chunks.append(chunk[:max_bytes - size])
+                                    truncated = True
+                                    break
+                                chunks.append(chunk)
+                                size += len(chunk)
+                            body = b''.join(chunks)
+                        trace['size'] = len(body)
+                        if self.cache is not None and not truncated:
+                            self.cache.put(method, url, status, response.headers, body, authorization)
+                        return (status, body.decode(response.charset or 'utf-8', errors='replace'),
+                                CaseInsensitiveDict(response.headers))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= retries:
+                    self.stats.increment('failed')
+                    raise
+                retry_after = None
+                throttled = False
+
+            if retry_after is None:
+                delay = backoff_delay(attempt, self.session.backoff)
+            else:
+                # When throttled the limiter already holds the host until then
+                delay = 0.0 if throttled else retry_after
+
+            attempt += 1
+            self.stats.increment('retried')
+            if delay > 0:
+                await asyncio.sleep(delay)
+                trace['blocked'] += delay
+
+    @staticmethod
+    def _cached_result(entry, cache_status: str, trace: Dict) -> Tuple[int, str, CaseInsensitiveDict]:
+        """Answer a request from a cached entry.
+
+        Args:
+            entry: Cached response (see http_cache.CachedResponse)
+            cache_status: 'hit' or 'revalidated'
+            trace: Dictionary receiving the cache status and body size
+
+        Returns:
+            Tuple of (status_code, body_text, headers)
+        """
+        trace['cache_status'] = cache_status
+        trace['size'] = len(entry.body)
+        return entry.status, entry.body.decode('utf-8', errors='replace'), CaseInsensitiveDict(entry.headers)
+
+    async def scrape_huggingface_model_async(
+        self,
+        model_id: str,
+        fetch_card: bool = True,
+        fetch_tree: bool = True
+    ) -> Dict:
+        """Scrape model information from HuggingFace.
+
+        Args:
+            model_id: HuggingFace model ID (e.g., 'meta-llama/Llama-3-8B')
+            fetch_card: Whether to download the model card (README.md)
+            fetch_tree: Whether to list the repository files
+
+        Returns:
+            ScrapeResult containing scraped model information (same shape as
+            ModelScraper.scrape_huggingface_model), or {} on failure
+        """
+        print(f"Scraping HuggingFace model: {model_id}")
+
+        fetches = [self._fetch_model_info_async(model_id)]
+        if fetch_card:
+            fetches.append(self._fetch_model_card_async(model_id))
+        if fetch_tree:
+            fetches.append(self._fetch_repo_features_async(model_id))
+
+        results = await asyncio.gather(*fetches, return_exceptions=True)
+
+        model_info = results[0]
+        if isinstance(model_info, asyncio.CancelledError):
+            raise model_info
+        if isinstance(model_info, Exception):
+            print(f"Error fetching model info: {model_info}")
+            return {}
+
+        model_card_content = results[1] if fetch_card else ""
+        if isinstance(model_card_content, asyncio.CancelledError):
+            raise model_card_content
+        if isinstance(model_card_content, BaseException):
+            print(f"Error fetching model card: {model_card_content}")
+            model_card_content = ""
+        repo_features = results[-1] if fetch_tree else None
+        if isinstance(repo_features, BaseException):
+            raise repo_features
+
+        return ScrapeResult(self, {
+            'model_id': model_id,
+            'model_info': model_info,
+            'model_card': model_card_content,
+            'repo_files': repo_features.paths if repo_features else [],
+            'repo_feature_files': repo_features.feature_paths if repo_features else [],
+            'confidence': {}
+        }, repo_features=repo_features or RepoFeatures())
+
+    async def _fetch_model_info_async(self, model_id: str) -> Dict:
+        """Fetch model info from the HuggingFace API.
+
+        Args:
+            model_id: HuggingFace model ID
+
+        Returns:
+            Model info dictionary
+
+        Raises:
+            RuntimeError: If the API returns an error status
+        """
+        api_url = f"https://huggingface.co/api/models/{model_id}"
+        status, body, _ = await self._request('GET', api_url, self.timeout)
+        if status >= 400:
+            raise RuntimeError(f"{status} Error for url: {api_url}")
+        return json.loads(body)
+
+    async def _fetch_model_card_async(self, model_id: str) -> str:
+        """Fetch the raw model card (README.md).
+
+        Args:
+            model_id: HuggingFace model ID
+
+        Returns:
+            Model card text, or an empty string if unavailable
+        """
+        card_url = f"https://huggingface.co/{model_id}/raw/main/README.md"
+        try:
+            status, body, _ = await self._request('GET', card_url, self.timeout, self.max_card_bytes)
+            if status == 200:
+                return body
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        return ""
+
+    async def _fetch_repo_features_async(self, model_id: str) -> Optional[RepoFeatures]:
+        """List the repository files, including subdirectories, and index them.
+
+        Walks the tree like RepoTreeWalker.walk, within the same budget, with
+        the directories of each round listed concurrently.
+
+        Args:
+            model_id: HuggingFace model ID
+
+        Returns:
+            RepoFeatures of the repository, or None if unavailable
+        """
+        walker = self.tree_walker
+        features = RepoFeatures()
+        try:
+            subdirs = await self._list_directory_async(model_id, '', None, features)
+        except (aiohttp.ClientError, asyncio.TimeoutError, RuntimeError, ValueError):
+            return None
+
+        queue = walker.prioritize(subdirs, 1)
+        listed = 0
+        while queue:
+            batch = []
+            while queue and len(batch) < walker.workers:
+                if listed >= walker.max_directories or features.files >= walker.max_files:
+                    features.truncated = True
+                    queue = []
+                    break
+                batch.append(queue.pop(0))
+                listed += 1
+
+            results = await asyncio.gather(
+                *(self._list_directory_async(model_id, path, role, features) for path, role, _ in batch),
+                return_exceptions=True
+            )
+            for (_, _, depth), result in zip(batch, results):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                if isinstance(result, Exception):
+                    features.truncated = True
+                else:
+                    queue += walker.prioritize(result, depth + 1)
+
+        if features.truncated:
+            print(f"File listing of {model_id} truncated after {features.files} files")
+        return features
+
+    async def _list_directory_async(
+        self,
+        model_id: str,
+        path: str,
+        role: Optional[str],
+        features: RepoFeatures
+    ) -> List[Tuple[str, Optional[str]]]:
+        """List one repository directory, following pagination, and index its entries.
+
+        Args:
+            model_id: HuggingFace model ID
+            path: Directory path ('' for the top level)
+            role: Role of the directory or of one of its parents, if any
+            features: Index to add the entries to
+
+        Returns:
+            (path, role) tuples of the subdirectories found
+
+        Raises:
+            RuntimeError: If the API returns an error status
+        """
+        walker = self.tree_walker
+        subdirs = []
+        url = tree_url(model_id, path)
+        while url and features.files < walker.max_files:
+            status, body, headers = await self._request('GET', url, self.timeout, self.max_tree_bytes)
+            if status != 200:
+                raise RuntimeError(f"{status} Error for url: {url}")
+            links = parse_header_links(headers.get('Link', ''))
+            url = next((link['url'] for link in links if link.get('rel') == 'next'), None)
+            # A page cut off by the byte cap still yields its complete entries
+            walker.index_entries(iter_json_array([body.encode('utf-8')]), role, features, subdirs)
+        return subdirs
+
+    async def _repo_exists_async(self, repo_url: str) -> bool:
+        """Probe whether a GitHub repo exists and memoize the result.
+
+        Args:
+            repo_url: GitHub repository URL
+
+        Returns:
+            True if repo exists, False otherwise
+        """
+        try:
+            status, _, _ = await self._request('HEAD', repo_url, self.probe_timeout)
+            exists = status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            exists = False
+        self.repo_prober.record(repo_url, exists)
+        return exists
+
+    async def _probe_repositories_async(self, scraped_data: Dict) -> None:
+        """Probe the inferred GitHub repositories of a model in priority order.
+
+        Results are memoized in the shared repository prober so the
+        synchronous _detect_repository can run without network access.
+        Probing stops at the first existing candidate, as in
+        RepoProber.probe_batch; every model of the batch runs on the same
+        loop, so the probes of different models still overlap, and probes
+        already started for another model (e.g. from the same organization)
+        are shared rather than repeated.
+
+        Args:
+            scraped_data: Dictionary containing scraped model information
+        """
+        # Repositories linked from the model card take precedence, no probing needed
+        if self.analyze_card(scraped_data).github_urls:
+            return
+
+        for url, _ in self._repository_candidates(scraped_data.get('model_id', '')):
+            exists = self.repo_prober.cached(url, count_hit=True)
+            if exists is None:
+                key = self.repo_prober.key(url)
+                if key not in self._repo_probes:
+                    self._repo_probes[key] = asyncio.ensure_future(self._repo_exists_async(url))
+                exists = await self._repo_probes[key]
+            if exists:
+                return
+
+    async def scrape_to_file_async(self, model_id: str, output_dir: str) -> Dict:
+        """Scrape a single model and write its draft YAML file.
+
+        Args:
+            model_id: HuggingFace model ID or URL
+            output_dir: Directory to write the YAML file to
+
+        Returns:
+            Result dictionary (see ModelScraper.scrape_to_file)
+        """
+        start = time.monotonic()
+        model_id = self.normalize_model_input(model_id)
+        result = {'model_id': model_id, 'status': 'failed', 'output': None, 'error': None}
+
+        try:
+            scraped_data = await self.scrape_huggingface_model_async(model_id)
+            if not scraped_data:
+                result['error'] = 'Failed to scrape model data'
+            else:
+                await self._probe_repositories_async(scraped_data)
+                # Detection, formatting and file I/O would stall every request in flight
+                result['output'] = await self._run_in_thread(self.write_draft, scraped_data, output_dir)
+                result['status'] = 'success'
+        except Exception as e:
+            result['error'] = str(e)
+
+        result['elapsed'] = time.monotonic() - start
+        if self.metrics is not None:
+            self.metrics.model_scraped(result)
+        return result
+
+    @staticmethod
+    async def _run_in_thread(func: Callable, *args):
+        """Run a blocking function on the default executor, keeping the context.
+
+        Like asyncio.to_thread (Python 3.9+): context variables such as the
+        stage profiler's current model are visible in the thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(contextvars.copy_context().run, func, *args))
+
+    async def scrape_many(
+        self,
+        model_ids: Iterable[str],
+        output_dir: str,
+        on_result: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """Scrape many models concurrently, at most `concurrency` at a time.
+
+        Args:
+            model_ids: HuggingFace model IDs or URLs
+            output_dir: Directory to write the YAML files to
+            on_result: Optional callback invoked with each result as it completes
+
+        Returns:
+            List of result dictionaries in completion order
+        """
+        if self._client is None:
+            async with self:
+                return await self.scrape_many(model_ids, output_dir, on_result)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def scrape_one(model_id: str) -> Dict:
+            async with semaphore:
+                return await self.scrape_to_file_async(model_id, output_dir)
+
+        results = []
+        for future in asyncio.as_completed([scrape_one(model_id) for model_id in model_ids]):
+            result = await future
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+
+    def iter_scrape_many(
+        self,
+        model_ids: Iterable[str],
+        output_dir: str,
+        workers: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """Run scrape_many on its own event loop and yield results as they complete.
+
+        This lets synchronous callers such as model_scraper.run_batch use
+        the async engine as a drop-in replacement for the thread pool.
+
+        Args:
+            model_ids: HuggingFace model IDs or URLs
+            output_dir: Directory to write the YAML files to
+            workers: Overrides the concurrency limit if given
+
+        Yields:
+            Result dictionaries in completion order
+        """
+        if workers:
+            self.concurrency = max(1, workers)
+
+        results: queue.Queue = queue.Queue()
+        done = object()
+        errors: List[BaseException] = []
+
+        def run_loop():
+            try:
+                asyncio.run(self.scrape_many(list(model_ids), output_dir, on_result=results.put))
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                results.put(done)
+
+        thread = threading.Thread(target=run_loop, daemon=True)
+        thread.start()
+        while True:
+            result = results.get()
+            if result is done:
+                break
+            yield result
+        thread.join()
+        # Re-raise in the caller so a failed loop is not mistaken for a short batch
+        if errors:
+            raise errors[0]
@@ -10,8 +10,13 @@ MIN_DOWNLOADS=${MIN_DOWNLOADS:-50000}  # Default: 50k downloads
 LIMIT=${LIMIT:-1000}                   # Default: check 1000 models
 MAX_MODELS=${MAX_MODELS:-20}           # Default: process 20 models (safety limit)
 OUTPUT_DIR=${OUTPUT_DIR:-../models}    # Default: ../models directory
-REPORT_FILE="missing_models_report.txt"
+REPORT_FILE="missing_models.ndjson"
 HF_TOKEN=${HF_TOKEN:-""}              # Optional HuggingFace token
+WORKERS=${WORKERS:-4}                  # Default: scrape 4 models concurrently
+RATE_LIMIT=${RATE_LIMIT:-2}            # Default: 2 requests/second per host
+JOURNAL=${JOURNAL:-scrape_journal.jsonl}  # Checkpoint journal, completed models are skipped on re-runs
+RETRIES=${RETRIES:-2}                  # Default: retry failed models twice
+METRICS_DIR=${METRICS_DIR:-""}         # Optional node_exporter textfile collector directory
 
 # Colors for output
 RED='\033[0;31m'
@@ -31,10 +36,12 @@ echo "  Min downloads: $MIN_DOWNLOADS"
 echo "  Limit: $LIMIT models"
 echo ""
 
-python find_missing_models.py \
-    --min-downloads "$MIN_DOWNLOADS" \
-    --limit "$LIMIT" \
-    --output "$REPORT_FILE"
+FIND_CMD=(python find_missing_models.py --min-downloads "$MIN_DOWNLOADS" --limit "$LIMIT" \
+    --format ndjson --output "$REPORT_FILE")
+if [ -n "$METRICS_DIR" ]; then
+    FIND_CMD+=(--metrics-textfile "$METRICS_DIR/mot_find_missing.prom")
+fi
+"${FIND_CMD[@]}"
 
 if [ ! -f "$REPORT_FILE" ]; then
     echo -e "${RED}Error: Report file not generated${NC}"
@@ -45,10 +52,9 @@ fi
 echo ""
 echo -e "${YELLOW}Step 2: Extracting model IDs from report...${NC}"
 
-# Extract lines with model IDs (format: "  org/model-name    downloads")
-# Look for lines starting with spaces followed by org/model pattern
-MODEL_IDS=$(grep -E "^  [a-zA-Z0-9_-]+/[a-zA-Z0-9_.-]+" "$REPORT_FILE" | \
-    awk '{print $1}' | \
+# One JSON record per missing model, most downloaded first
+MODEL_IDS=$(python -c 'import json, sys; [print(json.loads(line)["id"]) for line in sys.stdin if line.strip()]' \
+    < "$REPORT_FILE" | \
     head -n "$MAX_MODELS")
 
 MODEL_COUNT=$(echo "$MODEL_IDS" | wc -l | tr -d ' ')
@@ -74,60 +80,35 @@ if [[ ! $REPLY =~ ^[Yy]$ ]]; then
     exit 0
 fi
 
-# Step 4: Scrape each model
+# Step 4: Scrape all models
 echo ""
 echo -e "${YELLOW}Step 3: Scraping models...${NC}"
 echo ""
 
-SUCCESS_COUNT=0
-FAIL_COUNT=0
-FAILED_MODELS=()
-
 # Create output directory if it doesn't exist
 mkdir -p "$OUTPUT_DIR"
 
-# Loop through each model
-CURRENT=0
-while IFS= read -r MODEL_ID; do
-    CURRENT=$((CURRENT + 1))
-    echo -e "${BLUE}[$CURRENT/$MODEL_COUNT] Scraping: $MODEL_ID${NC}"
-    
-    # Build command with optional token
-    CMD="python model_scraper.py \"$MODEL_ID\" --output-dir \"$OUTPUT_DIR\""
-    if [ -n "$HF_TOKEN" ]; then
-        CMD="$CMD --hf-token \"$HF_TOKEN\""
-    fi
-    
-    # Run scraper
-    if eval "$CMD"; then
-        echo -e "${GREEN}  ✓ Success${NC}"
-        SUCCESS_COUNT=$((SUCCESS_COUNT + 1))
-    else
-        echo -e "${RED}  ✗ Failed${NC}"
-        FAIL_COUNT=$((FAIL_COUNT + 1))
-        FAILED_MODELS+=("$MODEL_ID")
-    fi
-    
-    echo ""
-    
-    # Small delay to avoid rate limiting
-    sleep 1
-done <<< "$MODEL_IDS"
+# Build command with optional token
+CMD=(python model_scraper.py --input-file - --output-dir "$OUTPUT_DIR" \
+    --workers "$WORKERS" --rate-limit "$RATE_LIMIT" \
+    --journal "$JOURNAL" --retries "$RETRIES")
+if [ -n "$HF_TOKEN" ]; then
+    CMD+=(--hf-token "$HF_TOKEN")
+fi
+if [ -n "$METRICS_DIR" ]; then
+    CMD+=(--metrics-textfile "$METRICS_DIR/mot_scrape.prom")
+fi
 
-# Step 5: Summary
-echo ""
-echo -e "${BLUE}========================================${NC}"
-echo -e "${BLUE}Summary${NC}"
-echo -e "${BLUE}========================================${NC}"
-echo -e "${GREEN}Successful: $SUCCESS_COUNT${NC}"
-echo -e "${RED}Failed: $FAIL_COUNT${NC}"
-echo ""
+# Scrape all models in one process; the scraper prints per-model results
+# and a success/failure summary, and exits non-zero if any model failed.
+# Models recorded as done in the journal are skipped, so an interrupted
+# batch can simply be re-run.
+BATCH_STATUS=0
+echo "$MODEL_IDS" | "${CMD[@]}" || BATCH_STATUS=$?
 
-if [ $FAIL_COUNT -gt 0 ]; then
-    echo -e "${RED}Failed models:${NC}"
-    for MODEL in "${FAILED_MODELS[@]}"; do
-        echo "  - $MODEL"
-    done
+echo ""
+if [ $BATCH_STATUS -ne 0 ]; then
+    echo -e "${RED}Some models failed to scrape (see summary above)${NC}"
     echo ""
 fi
 
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Model Openness Tool - Benchmarks
+
+Measures the model scraper and the missing models finder against a local
+HuggingFace stand-in (mock_hf_server.py), so performance changes can be
+compared run to run without touching the real API. The server runs in this
+process; each scenario runs in a fresh subprocess, so its peak RSS and
+timings are its own.
+
+Scenarios:
+    single        Latency of scraping one model, repeated --repeat times
+    batch         Throughput of scraping --models models with --workers workers
+    finder-1k     Finder paging through a 1,000 model listing
+    finder-10k    Finder paging through a 10,000 model listing
+    finder-100k   Finder paging through a 100,000 model listing
+
+Results are written as JSON (see --output) for tracking regressions.
+
+Usage:
+    python benchmark.py [--scenarios single,batch,...] [--latency SECONDS] [--output FILE]
+
+Example:
+    python benchmark.py --latency 0.05 --throttle-rate 0.01 --output bench.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from mock_hf_server import MockHuggingFaceServer, PayloadStore
+
+SCENARIOS = ('single', 'batch', 'finder-1k', 'finder-10k', 'finder-100k')
+FINDER_SIZES = {'finder-1k': 1000, 'finder-10k': 10000, 'finder-100k': 100000}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB elsewhere
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def endpoints_for(server_url: str) -> Dict[str, str]:
+    """Endpoint overrides sending the tools' requests to the server."""
+    return {'https://huggingface.co': server_url, 'https://github.com': f"{server_url}/github"}
+
+
+def make_scraper(args):
+    """Create the scraper of the selected engine, pointed at the server."""
+    if args.engine == 'async':
+        from async_scraper import AsyncModelScraper
+        scraper = AsyncModelScraper(concurrency=args.workers, rate_limit=0)
+    else:
+        from model_scraper import ModelScraper
+        scraper = ModelScraper(rate_limit=0, pool_size=max(10, args.workers))
+    scraper.session.endpoints = endpoints_for(args.server)
+    scraper.session.backoff = args.backoff
+    return scraper
+
+
+def run_single(args, output_dir: str) -> Dict:
+    """Scrape one model --repeat times, one after another."""
+    scraper = make_scraper(args)
+    model_id = args.model_ids[0]
+    latencies = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        if args.engine == 'async':
+            results = list(scraper.iter_scrape_many([model_id], output_dir))
+        else:
+            results = [scraper.scrape_to_file(model_id, output_dir)]
+        latencies.append(time.perf_counter() - start)
+        if results[0]['status'] != 'success':
+            raise RuntimeError(f"Scraping {model_id} failed: {results[0]['error']}")
+    return {
+        'models': args.repeat,
+        'latency_seconds': {
+            'min': min(latencies),
+            'median': statistics.median(latencies),
+            'p95': percentile(latencies, 0.95),
+            'max': max(latencies),
+        },
+        'http': scraper.session.stats.snapshot(),
+    }
+
+
+def run_batch(args, output_dir: str) -> Dict:
+    """Scrape --models models concurrently."""
+    scraper = make_scraper(args)
+    model_ids = args.model_ids[:args.models]
+    start = time.perf_counter()
+    if args.engine == 'async':
+        results = list(scraper.iter_scrape_many(model_ids, output_dir))
+    else:
+        results = scraper.scrape_many(model_ids, output_dir, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for r in results if r['status'] != 'success')
+    return {
+        'models': len(results),
+        'failed': failed,
+        'models_per_second': len(results) / elapsed if elapsed else 0.0,
+        'http': scraper.session.stats.snapshot(),
+    }
+
+
+def run_finder(args, size: int) -> Dict:
+    """Page through the first size models of the listing."""
+    from find_missing_models import MissingModelsFinder
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        finder = MissingModelsFinder(models_dir=models_dir, page_window=args.window)
+        finder.session.endpoints = endpoints_for(args.server)
+        finder.session.backoff = args.backoff
+        start = time.perf_counter()
+        models = finder.get_huggingface_models(min_downloads=0, limit=size, fields=['downloads', 'tags'])
+        elapsed = time.perf_counter() - start
+    return {
+        'models': len(models),
+        'pages': -(-len(models) // finder.PAGE_SIZE),
+        'models_per_second': len(models) / elapsed if elapsed else 0.0,
+        'http': finder.session.stats.snapshot(),
+    }
+
+
+def run_scenario(args) -> Dict:
+    """Run one scenario in this process (the benchmark's child mode)."""
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as output_dir, open(os.devnull, 'w') as devnull:
+        # The tools report progress on stdout, which carries the result here
+        with contextlib.redirect_stdout(devnull):
+            if args.scenario == 'single':
+                result = run_single(args, output_dir)
+            elif args.scenario == 'batch':
+                result = run_batch(args, output_dir)
+            else:
+                result = run_finder(args, FINDER_SIZES[args.scenario])
+    result.update({
+        'scenario': args.scenario,
+        'wall_seconds': time.perf_counter() - start,
+        'cpu_seconds': time.process_time() - start_cpu,
+        'peak_rss_mb': peak_rss_mb(),
+    })
+    return result
+
+
+def child_command(args, scenario: str, server_url: str, model_ids: List[str]) -> List[str]:
+    """Command line running one scenario in a subprocess."""
+    return [
+        sys.executable, os.path.abspath(__file__),
+        '--run-scenario', scenario,
+        '--server', server_url,
+        '--engine', args.engine,
+        '--workers', str(args.workers),
+        '--models', str(args.models),
+        '--repeat', str(args.repeat),
+        '--window', str(args.window),
+        '--backoff', str(args.backoff),
+        '--model-ids', ','.join(model_ids),
+    ]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the model scraper and missing models finder against a local HuggingFace stand-in'
+    )
+    parser.add_argument(
+        '--scenarios',
+        default=','.join(SCENARIOS),
+        help=f"Comma-separated scenarios to run (default: {','.join(SCENARIOS)})"
+    )
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads',
+                        help='Scraper engine (default: threads)')
+    parser.add_argument('--models', type=int, default=50, help='Models scraped by the batch scenario (default: 50)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent models in the batch scenario (default: 8)')
+    parser.add_argument('--repeat', type=int, default=10, help='Repetitions of the single scenario (default: 10)')
+    parser.add_argument('--window', type=int, default=4,
+                        help='Listing pages the finder fetches concurrently (default: 4)')
+    parser.add_argument('--backoff', type=float, default=1.0,
+                        help='Retry backoff of the tools in seconds (default: 1.0)')
+    parser.add_argument('--latency', type=float, default=0.02,
+                        help='Seconds the server delays each response (default: 0.02)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with 500 (default: 0)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with 429 (default: 0)')
+    parser.add_argument('--retry-after', type=float, default=0.0,
+                        help='Retry-After seconds sent with 429 responses (default: 0)')
+    parser.add_argument('--payloads', help='Directory of recorded payloads to replay (see mock_hf_server.py)')
+    parser.add_argument('--card-kb', type=int, default=8, help='Size of generated model cards in KB (default: 8)')
+    parser.add_argument('--tree-files', type=int, default=20,
+                        help='Weight shards in generated repository trees (default: 20)')
+    parser.add_argument('--output', help='File to write the JSON results to (default: stdout)')
+    # Child mode, used internally to run each scenario in its own process
+    parser.add_argument('--run-scenario', dest='scenario', help=argparse.SUPPRESS)
+    parser.add_argument('--server', help=argparse.SUPPRESS)
+    parser.add_argument('--model-ids', type=lambda value: value.split(','), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(args)))
+        return
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    listing_size = max([FINDER_SIZES.get(name, 0) for name in scenarios] + [args.models, 1])
+    store = PayloadStore(args.payloads, listing_size, args.card_kb, args.tree_files)
+    server = MockHuggingFaceServer(
+        store,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after
+    ).start()
+    model_ids = [model['id'] for model in store.listing[:max(1, args.models)]]
+
+    results = []
+    try:
+        for name in scenarios:
+            print(f"Running {name}...", file=sys.stderr)
+            requests_before = dict(server.counts)
+            child = subprocess.run(
+                child_command(args, name, server.url, model_ids),
+                stdout=subprocess.PIPE,
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                universal_newlines=True
+            )
+            if child.returncode != 0:
+                results.append({'scenario': name, 'error': f"exited with status {child.returncode}"})
+                continue
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+            result['server_requests'] = {
+                route: count - requests_before.get(route, 0)
+                for route, count in server.counts.items()
+                if count != requests_before.get(route, 0)
+            }
+            results.append(result)
+            print(f"  {result['wall_seconds']:.2f}s wall, {result['cpu_seconds']:.2f}s CPU, "
+                  f"{result['peak_rss_mb']:.0f} MB peak RSS", file=sys.stderr)
+    finally:
+        server.stop()
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'engine': args.engine,
+            'models': args.models,
+            'workers': args.workers,
+            'repeat': args.repeat,
+            'window': args.window,
+            'latency': args.latency,
+            'error_rate': args.error_rate,
+            'throttle_rate': args.throttle_rate,
+            'retry_after': args.retry_after,
+            'payloads': args.payloads,
+            'card_kb': args.card_kb,
+            'tree_files': args.tree_files,
+        },
+        'results': results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    sys.exit(1 if any('error' in r for r in results) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Model Openness Tool - Model Card Analyzer
+
+Analyzes a HuggingFace model card (README.md) once for all of the scraper's
+detectors. Component, license, repository, name and architecture detection
+used to rescan and re-lowercase the full card text independently, several
+times per model; ModelCardAnalyzer lowercases the card once, checks the
+keyword groups once per card, and evaluates each precompiled link and
+heading pattern at most once, sharing the results between detectors.
+
+Each keyword is looked up with its own str.__contains__ scan of the
+lowercased card, stopping at the first hit of a group. These scans run in
+C and beat both a combined regex alternation and a pure Python
+Aho-Corasick automaton on cards of a few hundred KB.
+
+Example:
+    card = ModelCardAnalyzer(readme_text)
+    if card.has('paper'):
+        ...
+    repos = card.github_urls
+"""
+
+import re
+from functools import cached_property
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import yaml
+
+# Keyword groups looked up in the lowercased card; a group matches if any of
+# its keywords occurs as a substring
+KEYWORD_GROUPS = {
+    'technical_report': ('technical report', 'tech report', 'documentation'),
+    'paper': ('paper', 'arxiv', 'publication'),
+    'evaluation': ('evaluation', 'benchmark', 'performance', 'results'),
+    'training_data': ('training data', 'trained on', 'dataset'),
+    'transformer': ('transformer',),
+    'decoder': ('decoder',),
+    'encoder': ('encoder',),
+    'diffusion': ('diffusion',),
+}
+
+GITHUB_URL_RE = re.compile(r'https://github\.com/[^/\s"<>]+/[^/\s"<>]+')
+MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+LICENSE_LINE_RE = re.compile(r'[*\-\s]*\*?\*?[Ll]icense\*?\*?:\s*\[([^\]]+)\]\(([^)]+)\)')
+FRONTMATTER_RE = re.compile(r'^---\s*\n(.*?)\n---', re.DOTALL | re.MULTILINE)
+HEADING_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+HEADING_PREFIX_RE = re.compile(r'^(Model Card for|Model:|Model\s+)', re.IGNORECASE)
+
+
+class ModelCardAnalyzer:
+    """Structured, computed-once view of a model card shared by all detectors.
+
+    Every attribute is computed on first access and then reused, so a
+    detector that is never consulted costs nothing.
+    """
+
+    def __init__(self, text: str):
+        """Wrap a model card.
+
+        Args:
+            text: Raw model card text (may be empty)
+        """
+        self.text = text or ''
+
+    def __bool__(self) -> bool:
+        return bool(self.text)
+
+    @cached_property
+    def lower(self) -> str:
+        """The card text, lowercased."""
+        return self.text.lower()
+
+    @cached_property
+    def keywords(self) -> FrozenSet[str]:
+        """Names of the KEYWORD_GROUPS found in the card."""
+        lower = self.lower
+        return frozenset(
+            group for group, words in KEYWORD_GROUPS.items()
+            if any(word in lower for word in words)
+        )
+
+    def has(self, group: str) -> bool:
+        """Check whether any keyword of a group occurs in the card.
+
+        Args:
+            group: Name of a KEYWORD_GROUPS entry
+
+        Returns:
+            True if the group matched
+        """
+        return group in self.keywords
+
+    @cached_property
+    def github_urls(self) -> List[str]:
+        """GitHub repository URLs in order of appearance."""
+        return GITHUB_URL_RE.findall(self.text)
+
+    @cached_property
+    def links(self) -> List[Tuple[str, str]]:
+        """Markdown links as (text, url) tuples in order of appearance."""
+        return MARKDOWN_LINK_RE.findall(self.text)
+
+    @cached_property
+    def license_line_url(self) -> Optional[str]:
+        """Target of the first 'License: [text](url)' line, if any."""
+        match = LICENSE_LINE_RE.search(self.text)
+        return match.group(2) if match else None
+
+    @cached_property
+    def frontmatter(self) -> Dict:
+        """Parsed YAML frontmatter, or {} if missing or invalid."""
+        match = FRONTMATTER_RE.search(self.text)
+        if match:
+            try:
+                data = yaml.safe_load(match.group(1))
+                if isinstance(data, dict):
+                    return data
+            except Exception:
+                pass
+        return {}
+
+    @cached_property
+    def heading(self) -> Optional[str]:
+        """First top-level heading with common 'Model Card for' prefixes removed."""
+        match = HEADING_RE.search(self.text)
+        if not match:
+            return None
+        return HEADING_PREFIX_RE.sub('', match.group(1).strip()).strip()
@@ -13,36 +13,263 @@ Example:
 """
 
 import argparse
+import contextlib
+import itertools
 import json
 import os
 import re
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from urllib.parse import quote
 
 import requests
-import yaml
+
+from fuzzy_match import FuzzyMatcher
+from http_cache import ResponseCache, add_cache_arguments, cache_from_args
+from http_recorder import add_recorder_arguments, combine_recorders, finish_recording, recorder_from_args
+from http_session import RateLimitedSession
+from model_index import load_index
+from mot_corpus import load_corpus
+from scrape_metrics import add_metrics_arguments, finish_metrics, metrics_from_args
+from stage_profiler import FINDER_STAGES, add_profile_arguments, finish_profile, profiler_from_args
+
+
+def priority_for_downloads(downloads: int) -> str:
+    """Map a download count to its report priority bucket.
+    
+    Args:
+        downloads: Number of downloads on HuggingFace
+    
+    Returns:
+        'high_priority' (>100k), 'medium_priority' (10k-100k) or 'low_priority' (<10k)
+    """
+    if downloads >= 100000:
+        return 'high_priority'
+    if downloads >= 10000:
+        return 'medium_priority'
+    return 'low_priority'
+
+
+# Pipeline tags used to group missing models by type, first match wins
+TYPE_TAGS = [
+    'text-generation', 'text2text-generation',
+    'image-to-text', 'text-to-image',
+    'automatic-speech-recognition', 'audio-classification',
+    'image-classification', 'object-detection'
+]
+
+
+def model_type_for_tags(tags: List[str]) -> str:
+    """Pick the report model type of a HuggingFace model from its tags.
+    
+    Args:
+        tags: HuggingFace model tags
+    
+    Returns:
+        The first tag found in TYPE_TAGS, or 'other'
+    """
+    for tag in tags:
+        if tag in TYPE_TAGS:
+            return tag
+    return 'other'
+
+
+class ListingSnapshot:
+    """Persisted record of the HuggingFace models seen by previous runs.
+    
+    Lets the finder report only models that are new, or whose metadata
+    changed, since the last run. The listing is still paged as in a full
+    run: moves between download buckets only show up in the downloads-sorted
+    listing, so paging by lastModified would miss them.
+    """
+    
+    # Listing fields recorded per model; also requested from the API in
+    # place of full=True when a snapshot is in use
+    FIELDS = ['downloads', 'lastModified', 'tags']
+    
+    def __init__(self, path: str):
+        """Load the snapshot, starting empty if the file does not exist.
+        
+        Args:
+            path: Path to the snapshot JSON file
+        """
+        self.path = Path(path)
+        self.models: Dict[str, Dict] = {}
+        self.updated_at: Optional[str] = None
+        
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.models = data.get('models', {})
+            self.updated_at = data.get('updated_at')
+    
+    def compare(self, hf_model: Dict) -> str:
+        """Compare a HuggingFace model against the snapshot.
+        
+        Download counts change every day, so they only count as a change
+        when the model moves to a different priority bucket.
+        
+        Args:
+            hf_model: HuggingFace model dictionary
+        
+        Returns:
+            'new', 'changed' or 'unchanged'
+        """
+        previous = self.models.get(hf_model.get('id', ''))
+        if previous is None:
+            return 'new'
+        
+        if previous.get('lastModified') != hf_model.get('lastModified'):
+            return 'changed'
+        if sorted(previous.get('tags', [])) != sorted(hf_model.get('tags', [])):
+            return 'changed'
+        if (priority_for_downloads(previous.get('downloads', 0)) !=
+                priority_for_downloads(hf_model.get('downloads', 0))):
+            return 'changed'
+        return 'unchanged'
+    
+    def diff(self, hf_models: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Split HuggingFace models into new and changed ones.
+        
+        Args:
+            hf_models: List of HuggingFace model dictionaries
+        
+        Returns:
+            Tuple of (new_models, changed_models); unchanged models are dropped
+        """
+        new_models = []
+        changed_models = []
+        for hf_model in hf_models:
+            status = self.compare(hf_model)
+            if status == 'new':
+                new_models.append(hf_model)
+            elif status == 'changed':
+                changed_models.append(hf_model)
+        return new_models, changed_models
+    
+    def update(self, hf_models: List[Dict]) -> None:
+        """Record the current metadata of HuggingFace models.
+        
+        Models not in the list are kept, so a run with a smaller --limit
+        does not forget models seen earlier.
+        
+        Args:
+            hf_models: List of HuggingFace model dictionaries
+        """
+        for hf_model in hf_models:
+            self.models[hf_model.get('id', '')] = {
+                field: hf_model.get(field) for field in self.FIELDS
+            }
+        self.updated_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    
+    def save(self) -> None:
+        """Write the snapshot atomically, so an interrupted run keeps the old one."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'updated_at': self.updated_at, 'models': self.models}, f)
+        os.replace(tmp_path, self.path)
+
+
+def parse_fields(value: str) -> List[str]:
+    """Parse a comma-separated --fields value.
+    
+    Args:
+        value: Field names, e.g. 'downloads,tags'
+    
+    Returns:
+        Field names to request; 'id' is dropped as the API always returns it
+    """
+    return [f.strip() for f in value.split(',') if f.strip() and f.strip() != 'id']
+
+
+def listing_fields(
+    fields: Optional[List[str]],
+    snapshot: Optional[ListingSnapshot],
+    min_downloads: int = 0
+) -> Optional[List[str]]:
+    """Pick the model fields to request from the listing.
+    
+    Args:
+        fields: Fields requested with --fields (None for full records)
+        snapshot: Snapshot in use, whose tracked fields are always needed
+        min_downloads: Download threshold; above 0 the downloads are needed
+            to stop paging (see MissingModelsFinder.iter_huggingface_models)
+    
+    Returns:
+        Field names, or None to request full records
+    """
+    if snapshot is not None:
+        fields = ListingSnapshot.FIELDS + (fields or [])
+    elif fields is None:
+        return None
+    if min_downloads > 0:
+        fields = ['downloads'] + fields
+    return list(dict.fromkeys(fields))
 
 
 class MissingModelsFinder:
     """Finds models on HuggingFace that are missing from MOT."""
     
-    def __init__(self, models_dir: str = "../models"):
+    # Models per listing page
+    PAGE_SIZE = 100
+    
+    def __init__(
+        self,
+        models_dir: str = "../models",
+        cache: Optional[ResponseCache] = None,
+        fuzzy_threshold: Optional[float] = 0.9,
+        corpus_cache: Optional[str] = None,
+        model_index: Optional[str] = None,
+        page_window: int = 4,
+        pagination: str = 'skip'
+    ):
         """Initialize the finder.
         
         Args:
             models_dir: Path to MOT models directory
+            cache: Optional on-disk HTTP response cache shared across runs
+            fuzzy_threshold: Minimum fuzzy match score for a model to count as
+                already in MOT when no identifier matches exactly (None disables)
+            corpus_cache: Optional cache file of parsed MOT YAML files, so only
+                changed files are reparsed
+            model_index: Optional compiled model index file (see model_index.py)
+                to load MOT models from instead of the YAML files; rebuilt
+                automatically when missing or out of date
+            page_window: Number of listing pages fetched concurrently (skip pagination)
+            pagination: 'skip' to request pages by offset, several at a time, or
+                'cursor' to follow the API's Link: rel="next" headers one page at a time
         """
         self.models_dir = Path(models_dir)
-        self.session = requests.Session()
+        self.corpus_cache = Path(corpus_cache) if corpus_cache else None
+        self.model_index = model_index
+        self.fuzzy_threshold = fuzzy_threshold
+        self.page_window = max(1, page_window)
+        self.pagination = pagination
+        self.session = RateLimitedSession(cache=cache, pool_size=max(10, self.page_window))
         self.session.headers.update({
             'User-Agent': 'MOT-Missing-Models-Finder/1.0'
         })
+        # Optional scrape_metrics.ScrapeMetrics counting listed and matched models
+        self.metrics = None
+        
+        # Page requests sent by the last listing (see _iter_listing_pages)
+        self.listing_requests = 0
+        
+        # Inverted index of the last loaded MOT models (see build_identifier_index)
+        self._indexed_models: Optional[Dict] = None
+        self.identifier_index: Dict[str, Tuple[int, str]] = {}
+        self.fuzzy_matcher: Optional[FuzzyMatcher] = None
     
     def get_mot_models(self) -> Dict[str, Dict]:
         """Get all models currently in MOT database.
         
+        Also builds the identifier index used by is_model_in_mot.
+        
         Returns:
             Dictionary mapping model names/IDs to their metadata
         """
@@ -53,111 +280,318 @@ class MissingModelsFinder:
             print(f"Warning: Models directory not found: {self.models_dir}")
             return mot_models
         
+        if self.model_index:
+            mot_models = self._load_model_index()
+            self.build_identifier_index(mot_models)
+            print(f"Loaded {len(mot_models)} models from MOT database\n")
+            return mot_models
+        
         yaml_files = list(self.models_dir.glob("*.yml"))
         print(f"Found {len(yaml_files)} YAML files in MOT database")
         
+        documents, errors = load_corpus(yaml_files, cache_file=self.corpus_cache)
+        
         for yaml_file in yaml_files:
             try:
-                with open(yaml_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
+                if str(yaml_file) in errors:
+                    raise ValueError(errors[str(yaml_file)])
+                data = documents[str(yaml_file)]
                 
                 if not data or 'release' not in data:
                     continue
                 
                 release = data['release']
-                model_name = release.get('name', '')
-                origin = release.get('origin', '')
-                huggingface = release.get('huggingface', '')
-                
-                # Store multiple identifiers for matching
-                identifiers = set()
-                if model_name:
-                    identifiers.add(model_name.lower())
-                    identifiers.add(model_name.lower().replace('-', '_'))
-                    identifiers.add(model_name.lower().replace('_', '-'))
-                if origin:
-                    identifiers.add(origin.lower())
-                if huggingface:
-                    # Extract model ID from HuggingFace URL
-                    hf_id = huggingface.replace('https://huggingface.co/', '')
-                    identifiers.add(hf_id.lower())
-                
-                mot_models[yaml_file.stem] = {
-                    'name': model_name,
-                    'origin': origin,
-                    'huggingface': huggingface,
-                    'identifiers': identifiers,
-                    'file': yaml_file.name
-                }
-                
+                mot_models[yaml_file.stem] = self._mot_entry(
+                    yaml_file.name,
+                    release.get('name', ''),
+                    release.get('origin', ''),
+                    release.get('huggingface', '')
+                )
+            
             except Exception as e:
                 print(f"Warning: Error reading {yaml_file.name}: {e}")
                 continue
+
+        self.build_identifier_index(mot_models)
         
         print(f"Loaded {len(mot_models)} models from MOT database\n")
         return mot_models
     
+    def _load_model_index(self) -> Dict[str, Dict]:
+        """Load MOT models from the compiled model index.
+        
+        Returns:
+            Dictionary mapping model names/IDs to their metadata (same shape
+            as when loaded from the YAML files)
+        """
+        mot_models = {}
+        with load_index(str(self.models_dir), self.model_index, corpus_cache=self.corpus_cache) as index:
+            print(f"Found {index.source_count} YAML files in MOT database (index: {self.model_index})")
+            for model in index:
+                mot_models[model.file.rsplit('.', 1)[0]] = self._mot_entry(
+                    model.file, model.name, model.origin, model.huggingface
+                )
+        return mot_models
+    
+    @staticmethod
+    def _mot_entry(file: str, model_name: str, origin: str, huggingface: str) -> Dict:
+        """Build the metadata of one MOT model, including its match identifiers.
+        
+        Args:
+            file: YAML file name
+            model_name: Release name
+            origin: Release origin
+            huggingface: HuggingFace URL
+        
+        Returns:
+            Dictionary of model metadata
+        """
+        # Store multiple identifiers for matching
+        identifiers = set()
+        if model_name:
+            identifiers.add(model_name.lower())
+            identifiers.add(model_name.lower().replace('-', '_'))
+            identifiers.add(model_name.lower().replace('_', '-'))
+        if origin:
+            identifiers.add(origin.lower())
+        if huggingface:
+            # Extract model ID from HuggingFace URL
+            hf_id = huggingface.replace('https://huggingface.co/', '')
+            identifiers.add(hf_id.lower())
+        
+        return {
+            'name': model_name,
+            'origin': origin,
+            'huggingface': huggingface,
+            'identifiers': identifiers,
+            'file': file
+        }
+
+    def build_identifier_index(self, mot_models: Dict) -> Dict[str, Tuple[int, str]]:
+        """Build an inverted index from normalized identifier to MOT model file.
+        
+        Each identifier maps to (position, file) of the first MOT model that
+        has it, so lookups pick the same file a scan in mot_models order would.
+        The fuzzy name matcher for the same models is rebuilt alongside.
+        
+        Args:
+            mot_models: Dictionary of MOT models
+        
+        Returns:
+            Dictionary mapping identifiers to (position, file) tuples
+        """
+        index = {}
+        for position, mot_data in enumerate(mot_models.values()):
+            for identifier in mot_data.get('identifiers', set()):
+                index.setdefault(identifier, (position, mot_data['file']))
+        
+        self._indexed_models = mot_models
+        self.identifier_index = index
+        self.fuzzy_matcher = FuzzyMatcher(mot_models)
+        return index
+    
     def get_huggingface_models(
         self,
         min_downloads: int = 1000,
         limit: int = 1000,
-        model_type: Optional[str] = None
+        model_type: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> List[Dict]:
-        """Get popular models from HuggingFace.
+        """Fetch popular models from HuggingFace.
         
         Args:
             min_downloads: Minimum number of downloads to consider
             limit: Maximum number of models to fetch
             model_type: Filter by model type (e.g., 'text-generation')
-            
+            fields: Model fields to request instead of the full records (the id is always included)
+        
         Returns:
             List of model dictionaries
         """
+        return list(self.iter_huggingface_models(min_downloads, limit, model_type, fields))
+
+    def iter_huggingface_models(
+        self,
+        min_downloads: int = 1000,
+        limit: int = 1000,
+        model_type: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict]:
+        """Fetch popular models from HuggingFace, yielding each page as it arrives.
+        
+        The listing is sorted by downloads, so paging stops at the first model
+        below min_downloads instead of walking the rest of the listing.
+        
+        Args:
+            min_downloads: Minimum number of downloads to consider
+            limit: Maximum number of models to fetch
+            model_type: Filter by model type (e.g., 'text-generation')
+            fields: Model fields to request instead of the full records (the id
+                is always included, and the downloads when min_downloads is set)
+        
+        Yields:
+            Model dictionaries in listing order
+        """
         print(f"Fetching models from HuggingFace (min downloads: {min_downloads:,})...")
+        # Without the downloads every model would read as 0 and end the listing
+        fields = listing_fields(fields, None, min_downloads)
         
         models = []
-        page = 0
-        
-        while len(models) < limit:
-            # HuggingFace API endpoint for models
-            url = "https://huggingface.co/api/models"
-            params = {
-                'sort': 'downloads',
-                'direction': -1,
-                'limit': 100,
-                'skip': page * 100,
-                'full': True
-            }
-            
-            if model_type:
-                params['filter'] = model_type
-            
-            try:
-                response = self.session.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                batch = response.json()
-                
-                if not batch:
-                    break
-                
+        max_pages = -(-limit // self.PAGE_SIZE)
+        pages = self._iter_listing_pages(model_type, fields, max_pages=max_pages)
+        pages_read = 0
+        below_threshold = False
+        
+        try:
+            for batch in pages:
+                pages_read += 1
                 for model in batch:
                     downloads = model.get('downloads', 0)
-                    if downloads >= min_downloads:
-                        models.append(model)
+                    if downloads < min_downloads:
+                        # The listing is sorted by downloads, so no later model can qualify
+                        below_threshold = True
+                        break
+                    
+                    models.append(model)
+                    yield model
                     
                     if len(models) >= limit:
                         break
                 
-                page += 1
                 print(f"  Fetched {len(models)} models so far...", end='\r')
-                
-            except requests.exceptions.RequestException as e:
-                print(f"\nError fetching models: {e}")
-                break
+                if below_threshold or len(models) >= limit:
+                    break
+        
+        except requests.exceptions.RequestException as e:
+            # Transient errors were already retried by the session
+            print(f"\nError fetching models: {e} (listing stopped after {len(models)} models)")
+        finally:
+            pages.close()
+        
+        if below_threshold:
+            # Pages requested ahead of the consumer count as spent
+            print(f"\nStopped after {pages_read} pages: listing fell below {min_downloads:,} downloads "
+                  f"(saved {max(0, max_pages - self.listing_requests)} page requests)", end='')
+        print(f"\nFetched {len(models)} models from HuggingFace ({self.session.stats.summary()})\n")
+
+    def _listing_params(self, model_type: Optional[str], fields: Optional[List[str]]) -> Dict:
+        """Build the query parameters of the downloads-sorted model listing.
+        
+        Args:
+            model_type: Filter by model type (e.g., 'text-generation')
+            fields: Model fields to request instead of the full records
         
-        print(f"\nFetched {len(models)} models from HuggingFace\n")
-        return models
+        Returns:
+            Query parameters for https://huggingface.co/api/models
+        """
+        params = {
+            'sort': 'downloads',
+            'direction': -1,
+            'limit': self.PAGE_SIZE,
+        }
+        
+        if fields:
+            params['expand[]'] = fields
+        else:
+            params['full'] = True
+        
+        if model_type:
+            params['filter'] = model_type
+        
+        return params
     
+    def _fetch_listing_page(self, url: str, params: Optional[Dict]) -> Tuple[List[Dict], Optional[str]]:
+        """Fetch one page of the model listing.
+        
+        Args:
+            url: Listing URL
+            params: Query parameters (None if already part of the URL)
+        
+        Returns:
+            Tuple of (models, next_url) where next_url is the Link: rel="next" target, if any
+        
+        Raises:
+            requests.exceptions.RequestException: If the page could not be fetched
+        """
+        response = self.session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        models = response.json()
+        if self.metrics is not None:
+            self.metrics.listing_page(models)
+        return models, response.links.get('next', {}).get('url')
+    
+    def _iter_listing_pages(
+        self,
+        model_type: Optional[str],
+        fields: Optional[List[str]],
+        max_pages: Optional[int] = None
+    ) -> Iterator[List[Dict]]:
+        """Fetch listing pages in order until the listing is exhausted or the consumer stops.
+        
+        With 'skip' pagination up to page_window pages are requested ahead
+        concurrently; with 'cursor' pagination each page's Link header
+        names the next one, so pages are fetched one after another.
+        
+        Args:
+            model_type: Filter by model type (e.g., 'text-generation')
+            fields: Model fields to request instead of the full records
+            max_pages: Number of pages the caller expects to need; pages past
+                it are only requested one at a time, when actually consumed
+        
+        Yields:
+            Lists of model dictionaries, one per page, in listing order
+        
+        Once the generator is closed, listing_requests holds the number of
+        page requests it sent, including pages fetched ahead but not consumed.
+        """
+        url = "https://huggingface.co/api/models"
+        params = self._listing_params(model_type, fields)
+        # next() on a count is atomic, so fetch threads can share it
+        requests_sent = itertools.count()
+        self.listing_requests = 0
+        
+        if self.pagination == 'cursor':
+            try:
+                while url:
+                    next(requests_sent)
+                    batch, url = self._fetch_listing_page(url, params)
+                    params = None  # The next URL carries the query and cursor
+                    if not batch:
+                        return
+                    yield batch
+            finally:
+                self.listing_requests = next(requests_sent)
+            return
+        
+        def fetch(page: int) -> List[Dict]:
+            next(requests_sent)
+            return self._fetch_listing_page(url, dict(params, skip=page * self.PAGE_SIZE))[0]
+        
+        executor = ThreadPoolExecutor(max_workers=self.page_window)
+        pending = deque()
+        try:
+            next_page = 0
+            consumed = 0
+            while True:
+                while len(pending) < self.page_window and (
+                    not pending or max_pages is None or next_page < max(max_pages, consumed + 1)
+                ):
+                    pending.append(executor.submit(fetch, next_page))
+                    next_page += 1
+                
+                batch = pending.popleft().result()
+                consumed += 1
+                if not batch:
+                    return
+                yield batch
+                if len(batch) < self.PAGE_SIZE:
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            self.listing_requests = next(requests_sent)
+
     def normalize_model_id(self, model_id: str) -> Set[str]:
         """Generate normalized variations of a model ID for matching.
         
@@ -188,25 +622,165 @@ class MissingModelsFinder:
     def is_model_in_mot(self, hf_model: Dict, mot_models: Dict) -> Tuple[bool, str]:
         """Check if a HuggingFace model is already in MOT.
         
+        Exact identifier matches are tried first; failing that, the best
+        fuzzy name match counts if it scores at least fuzzy_threshold.
+        
         Args:
             hf_model: HuggingFace model dictionary
             mot_models: Dictionary of MOT models
-            
+        
         Returns:
             Tuple of (is_present, matched_file)
         """
+        matched_file, _ = self._match_model(hf_model, mot_models)
+        return bool(matched_file), matched_file
+    
+    def find_candidates(self, hf_model: Dict, mot_models: Dict) -> List[Tuple[str, float]]:
+        """Rank the MOT models whose names approximately match a HuggingFace model.
+        
+        Args:
+            hf_model: HuggingFace model dictionary
+            mot_models: Dictionary of MOT models
+        
+        Returns:
+            List of (mot_file, score) tuples, best match first
+        """
+        if mot_models is not self._indexed_models:
+            self.build_identifier_index(mot_models)
+        return self.fuzzy_matcher.candidates(hf_model.get('id', ''))
+    
+    def _match_model(self, hf_model: Dict, mot_models: Dict) -> Tuple[str, List[Tuple[str, float]]]:
+        """Match a HuggingFace model against MOT.
+        
+        Args:
+            hf_model: HuggingFace model dictionary
+            mot_models: Dictionary of MOT models
+        
+        Returns:
+            Tuple of (matched_file, candidates); matched_file is '' if the model
+            is missing, candidates are the ranked fuzzy matches (empty when an
+            identifier matched exactly or fuzzy matching is disabled)
+        """
+        if mot_models is not self._indexed_models:
+            self.build_identifier_index(mot_models)
+        
         model_id = hf_model.get('id', '')
         variations = self.normalize_model_id(model_id)
         
-        for mot_file, mot_data in mot_models.items():
-            mot_identifiers = mot_data.get('identifiers', set())
-            
-            # Check if any variation matches
-            if variations & mot_identifiers:
-                return True, mot_data['file']
+        # Check if any variation matches, preferring the earliest MOT model
+        hits = [self.identifier_index[v] for v in variations if v in self.identifier_index]
+        if hits:
+            return min(hits)[1], []
         
-        return False, ''
+        if self.fuzzy_threshold is None:
+            return '', []
+        
+        candidates = self.fuzzy_matcher.candidates(model_id)
+        if candidates and candidates[0][1] >= self.fuzzy_threshold:
+            return candidates[0][0], candidates
+        return '', candidates
     
+    def match_models(
+        self,
+        hf_models: List[Dict],
+        mot_models: Dict
+    ) -> Tuple[Dict[str, str], List[Dict], Dict[str, List[Tuple[str, float]]]]:
+        """Match a whole HuggingFace listing against MOT in one pass.
+        
+        Args:
+            hf_models: List of HuggingFace model dictionaries
+            mot_models: Dictionary of MOT models
+        
+        Returns:
+            Tuple of (matches, missing_models, candidates) where matches maps
+            HuggingFace model IDs to the matched MOT file, missing_models lists
+            the HuggingFace models not found in MOT, and candidates maps the IDs
+            of missing models to their near-miss (mot_file, score) candidates
+        """
+        matches = {}
+        missing_models = []
+        candidates = {}
+        
+        for hf_model in hf_models:
+            matched_file, model_candidates = self._match_model(hf_model, mot_models)
+            self._count_match(hf_model, matched_file)
+            if matched_file:
+                matches[hf_model.get('id', '')] = matched_file
+            else:
+                missing_models.append(hf_model)
+                if model_candidates:
+                    candidates[hf_model.get('id', '')] = model_candidates
+        
+        return matches, missing_models, candidates
+
+    def iter_missing_models(
+        self,
+        hf_models: Iterable[Dict],
+        mot_models: Dict,
+        snapshot: Optional[ListingSnapshot] = None,
+        changed_only: bool = False
+    ) -> Iterator[Dict]:
+        """Match HuggingFace models against MOT one at a time, yielding a record per missing model.
+        
+        Works on a lazy listing (see iter_huggingface_models), so each record
+        is produced as soon as its model has been fetched and matched.
+        
+        Args:
+            hf_models: HuggingFace model dictionaries
+            mot_models: Dictionary of MOT models
+            snapshot: Optional snapshot to compare each model against
+            changed_only: Skip models the snapshot has seen unchanged
+        
+        Yields:
+            Record dictionaries (see missing_model_record)
+        """
+        for hf_model in hf_models:
+            status = snapshot.compare(hf_model) if snapshot is not None else None
+            if changed_only and status == 'unchanged':
+                continue
+            
+            matched_file, candidates = self._match_model(hf_model, mot_models)
+            self._count_match(hf_model, matched_file)
+            if not matched_file:
+                yield self.missing_model_record(hf_model, candidates, status)
+    
+    def _count_match(self, hf_model: Dict, matched_file: str) -> None:
+        """Count a matched model in the metrics, if any."""
+        if self.metrics is not None:
+            self.metrics.model_matched(bool(matched_file), priority_for_downloads(hf_model.get('downloads', 0)))
+    
+    @staticmethod
+    def missing_model_record(
+        hf_model: Dict,
+        candidates: List[Tuple[str, float]],
+        status: Optional[str] = None
+    ) -> Dict:
+        """Build the machine-readable record of a missing model.
+        
+        Args:
+            hf_model: HuggingFace model dictionary
+            candidates: Near-miss (mot_file, score) candidates
+            status: Snapshot status ('new', 'changed' or 'unchanged'), if known
+        
+        Returns:
+            JSON-serializable record dictionary
+        """
+        model_id = hf_model.get('id', '')
+        downloads = hf_model.get('downloads', 0)
+        tags = hf_model.get('tags', [])
+        record = {
+            'id': model_id,
+            'downloads': downloads,
+            'tags': tags,
+            'priority': priority_for_downloads(downloads),
+            'type': model_type_for_tags(tags),
+            'url': f"https://huggingface.co/{model_id}",
+            'candidates': [{'file': f, 'score': score} for f, score in candidates],
+        }
+        if status is not None:
+            record['snapshot_status'] = status
+        return record
+
     def categorize_missing_models(
         self, 
         missing_models: List[Dict]
@@ -231,26 +805,10 @@ class MissingModelsFinder:
             tags = model.get('tags', [])
             
             # Priority by downloads
-            if downloads >= 100000:
-                categories['high_priority'].append(model)
-            elif downloads >= 10000:
-                categories['medium_priority'].append(model)
-            else:
-                categories['low_priority'].append(model)
+            categories[priority_for_downloads(downloads)].append(model)
             
             # By type
-            model_type = 'other'
-            type_tags = [
-                'text-generation', 'text2text-generation', 
-                'image-to-text', 'text-to-image',
-                'automatic-speech-recognition', 'audio-classification',
-                'image-classification', 'object-detection'
-            ]
-            
-            for tag in tags:
-                if tag in type_tags:
-                    model_type = tag
-                    break
+            model_type = model_type_for_tags(tags)
             
             if model_type not in categories['by_type']:
                 categories['by_type'][model_type] = []
@@ -262,7 +820,8 @@ class MissingModelsFinder:
         self,
         missing_models: List[Dict],
         mot_models: Dict,
-        output_file: Optional[str] = None
+        output_file: Optional[str] = None,
+        candidates: Optional[Dict[str, List[Tuple[str, float]]]] = None
     ) -> str:
         """Generate a report of missing models.
         
@@ -270,6 +829,7 @@ class MissingModelsFinder:
             missing_models: List of missing model dictionaries
             mot_models: Dictionary of MOT models
             output_file: Optional file to save report
+            candidates: Optional near-miss MOT candidates per missing model ID
             
         Returns:
             Report text
@@ -315,6 +875,9 @@ class MissingModelsFinder:
                 if tags:
                     report_lines.append(f"    Tags: {tags}")
                 report_lines.append(f"    URL: https://huggingface.co/{model_id}")
+                if candidates and model_id in candidates:
+                    similar = ', '.join(f"{f} ({score:.0%})" for f, score in candidates[model_id][:3])
+                    report_lines.append(f"    Similar in MOT: {similar}")
                 report_lines.append("")
         
         # Medium priority models
@@ -356,6 +919,61 @@ class MissingModelsFinder:
         return report_text
 
 
+def stream_ndjson(finder: MissingModelsFinder, args) -> int:
+    """Stream one JSON record per missing model as it is found.
+    
+    Records go to --output (or stdout) and are flushed one by one, so a
+    consumer can start on the first models while later listing pages are
+    still being fetched. Progress messages go to stderr.
+    
+    Args:
+        finder: Configured finder
+        args: Parsed command-line arguments
+    
+    Returns:
+        Process exit code
+    """
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    snapshot = ListingSnapshot(args.snapshot) if args.snapshot else None
+    seen = []
+    
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            mot_models = finder.get_mot_models()
+            
+            def listing():
+                for hf_model in finder.iter_huggingface_models(
+                    min_downloads=args.min_downloads,
+                    limit=args.limit,
+                    model_type=args.model_type,
+                    fields=listing_fields(args.fields, snapshot)
+                ):
+                    seen.append(hf_model)
+                    yield hf_model
+            
+            count = 0
+            for record in finder.iter_missing_models(listing(), mot_models, snapshot, args.changed_only):
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+                count += 1
+            
+            print(f"Found {count} missing models")
+            if snapshot is not None:
+                snapshot.update(seen)
+                snapshot.save()
+                print(f"Snapshot saved to: {snapshot.path}")
+    except BrokenPipeError:
+        # The consumer stopped reading (e.g. piped into head); silence the
+        # final flush of stdout at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    
+    return 0
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -386,12 +1004,85 @@ def main():
         '--model-type',
         help='Filter by model type (e.g., text-generation, image-to-text)'
     )
+    parser.add_argument(
+        '--fields',
+        type=parse_fields,
+        help='Comma-separated model fields to request instead of full records, e.g. downloads,tags (default: full records)'
+    )
+    parser.add_argument(
+        '--window',
+        type=int,
+        default=4,
+        help='Number of listing pages fetched concurrently (default: 4)'
+    )
+    parser.add_argument(
+        '--pagination',
+        choices=['skip', 'cursor'],
+        default='skip',
+        help='Page through the listing by offset (concurrently) or by following Link headers (default: skip)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['text', 'ndjson'],
+        default='text',
+        help='Output format: text report, or one JSON record per missing model streamed as it is found (default: text)'
+    )
+    parser.add_argument(
+        '--fuzzy-threshold',
+        type=float,
+        default=0.9,
+        help='Minimum fuzzy name match score (0-1) to treat a model as already in MOT, 0 to disable (default: 0.9)'
+    )
+    parser.add_argument(
+        '--index',
+        help='Compiled model index to load MOT models from (built or refreshed from --models-dir as needed)'
+    )
+    parser.add_argument(
+        '--snapshot',
+        help='Snapshot file of previously seen HuggingFace models, updated after each run'
+    )
+    parser.add_argument(
+        '--changed-only',
+        action='store_true',
+        help='Only report models that are new or changed since the snapshot (requires --snapshot)'
+    )
+
+    add_cache_arguments(parser)
+    add_recorder_arguments(parser)
+    add_metrics_arguments(parser)
+    add_profile_arguments(parser, 'finder_profile')
     
     args = parser.parse_args()
+    if args.changed_only and not args.snapshot:
+        parser.error('--changed-only requires --snapshot')
+    recorder = recorder_from_args(args)
+    profiler = profiler_from_args(args, parser)
+    metrics = metrics_from_args(args, 'find_missing_models')
     
     # Initialize finder
-    finder = MissingModelsFinder(models_dir=args.models_dir)
+    finder = MissingModelsFinder(
+        models_dir=args.models_dir,
+        cache=cache_from_args(args),
+        fuzzy_threshold=args.fuzzy_threshold or None,
+        corpus_cache=None if args.no_cache else Path(args.cache_dir) / 'models_corpus.pickle',
+        model_index=args.index,
+        page_window=args.window,
+        pagination=args.pagination
+    )
+    finder.metrics = metrics
+    finder.session.recorder = combine_recorders(recorder, metrics)
+    if profiler is not None:
+        profiler.instrument(finder, FINDER_STAGES)
     
+    if args.format == 'ndjson':
+        status = stream_ndjson(finder, args)
+        # Keep the NDJSON stream on stdout clean
+        with contextlib.redirect_stdout(sys.stderr):
+            finish_recording(recorder, args.har)
+            finish_metrics(metrics)
+            finish_profile(profiler, args.profile)
+        sys.exit(status)
+
     print("=" * 80)
     print("MODEL OPENNESS TOOL - MISSING MODELS FINDER")
     print("=" * 80)
@@ -400,21 +1091,27 @@ def main():
     # Get MOT models
     mot_models = finder.get_mot_models()
     
-    # Get HuggingFace models
+    # Get HuggingFace models; with a snapshot at least the fields it tracks are needed
+    snapshot = ListingSnapshot(args.snapshot) if args.snapshot else None
     hf_models = finder.get_huggingface_models(
         min_downloads=args.min_downloads,
         limit=args.limit,
-        model_type=args.model_type
+        model_type=args.model_type,
+        fields=listing_fields(args.fields, snapshot)
     )
     
+    candidates = hf_models
+    if snapshot is not None:
+        new_models, changed_models = snapshot.diff(hf_models)
+        unchanged = len(hf_models) - len(new_models) - len(changed_models)
+        print(f"Since snapshot ({snapshot.updated_at or 'none'}): "
+              f"{len(new_models)} new, {len(changed_models)} changed, {unchanged} unchanged\n")
+        if args.changed_only:
+            candidates = new_models + changed_models
+    
     # Find missing models
     print("Comparing models...")
-    missing_models = []
-    
-    for hf_model in hf_models:
-        is_present, matched_file = finder.is_model_in_mot(hf_model, mot_models)
-        if not is_present:
-            missing_models.append(hf_model)
+    matches, missing_models, near_misses = finder.match_models(candidates, mot_models)
     
     print(f"Found {len(missing_models)} missing models\n")
     
@@ -422,12 +1119,18 @@ def main():
     report = finder.generate_report(
         missing_models,
         mot_models,
-        output_file=args.output
+        output_file=args.output,
+        candidates=near_misses
     )
     
     # Print report
     print(report)
     
+    if snapshot is not None:
+        snapshot.update(hf_models)
+        snapshot.save()
+        print(f"\nSnapshot saved to: {snapshot.path}")
+    
     # Summary
     print("\n" + "=" * 80)
     print("NEXT STEPS")
@@ -443,6 +1146,10 @@ def main():
     print("  php ../scripts/validate-model.php ../models/Llama-3-8B.yml")
     print("  # Submit PR")
     print()
+    
+    finish_recording(recorder, args.har)
+    finish_metrics(metrics)
+    finish_profile(profiler, args.profile)
 
 
 if __name__ == '__main__':
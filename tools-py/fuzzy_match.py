@@ -0,0 +1,172 @@
+"""
+Model Openness Tool - Fuzzy Model Name Matching
+
+Approximate matching of HuggingFace model IDs against MOT model names, used
+by the missing models finder after exact identifier lookup fails. Names are
+folded into keys that ignore case, punctuation and quantization/format
+suffixes (so 'Llama-3-8B-Instruct', 'llama3-8b-instruct' and
+'Llama-3-8B-Instruct-GGUF' share a key) but keep the token boundaries (so
+'Qwen2-7B' and 'Qwen-27B' do not), parameter sizes and version numbers are
+extracted so that '7B' never silently matches '70B', and candidates are
+found through a character trigram index so matching stays sub-quadratic.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Set, Tuple
+
+# Suffixes of quantized or converted forks, ignored when comparing names
+FORMAT_TOKENS = {
+    'gguf', 'ggml', 'gptq', 'awq', 'exl2', 'mlx', 'onnx', 'hf', 'bnb',
+    'int4', 'int8', 'fp8', 'fp16', 'bf16', '4bit', '8bit', 'quantized',
+    'q2', 'q3', 'q4', 'q5', 'q6', 'q8',
+}
+
+# Size tokens (7b, 1.5b, 350m), bit widths, quant levels, words and numbers
+_TOKEN_RE = re.compile(
+    r'\d+bit|q\d+(?![a-z])|\d+(?:\.\d+)?[bmkt](?![a-z])|[a-z]+|\d+(?:\.\d+)?'
+)
+_SIZE_RE = re.compile(r'^\d+(?:\.\d+)?[bmkt]$')
+_NUMBER_RE = re.compile(r'^\d+(?:\.\d+)?$')
+
+
+class NameFeatures(NamedTuple):
+    """Comparable features of a model name."""
+    key: str
+    sizes: Tuple[str, ...]
+    versions: Tuple[str, ...]
+    is_fork: bool
+    trigrams: Set[str]
+
+
+def extract_features(name: str) -> NameFeatures:
+    """Fold a model name into its comparable features.
+
+    Args:
+        name: Model name or HuggingFace model ID (the organization is ignored)
+
+    Returns:
+        NameFeatures for the name
+    """
+    name = name.split('/')[-1].lower()
+    tokens = _TOKEN_RE.findall(name)
+
+    kept = [t for t in tokens if t not in FORMAT_TOKENS and t != 'v']
+    # Separators keep 'qwen2-7b' apart from 'qwen-27b'
+    key = '-'.join(kept)
+    padded = f"^{key}$"
+
+    return NameFeatures(
+        key=key,
+        sizes=tuple(t for t in kept if _SIZE_RE.match(t)),
+        versions=tuple(t for t in kept if _NUMBER_RE.match(t)),
+        is_fork=any(t in FORMAT_TOKENS for t in tokens),
+        trigrams={padded[i:i + 3] for i in range(len(padded) - 2)},
+    )
+
+
+class FuzzyMatcher:
+    """Ranks MOT models by how closely their names match a HuggingFace model ID."""
+
+    def __init__(self, mot_models: Dict, max_postings: int = 500):
+        """Index the names of the MOT models.
+
+        Args:
+            mot_models: Dictionary of MOT models (see MissingModelsFinder.get_mot_models)
+            max_postings: Trigrams shared by more names than this are too common
+                to narrow down candidates and are skipped during blocking
+        """
+        self.max_postings = max_postings
+        self.entries: List[Tuple[str, NameFeatures]] = []
+        self.by_key: Dict[str, List[int]] = {}
+        self.by_trigram: Dict[str, List[int]] = {}
+
+        seen = set()
+        for mot_data in mot_models.values():
+            names = [
+                mot_data.get('name'),
+                mot_data.get('origin'),
+                mot_data.get('huggingface'),
+                mot_data['file'].rsplit('.', 1)[0],
+            ]
+            for name in names:
+                if not name or not isinstance(name, str):
+                    continue
+                features = extract_features(name.rstrip('/'))
+                if not features.key or (mot_data['file'], features.key) in seen:
+                    continue
+                seen.add((mot_data['file'], features.key))
+
+                entry_id = len(self.entries)
+                self.entries.append((mot_data['file'], features))
+                self.by_key.setdefault(features.key, []).append(entry_id)
+                for trigram in features.trigrams:
+                    self.by_trigram.setdefault(trigram, []).append(entry_id)
+
+    def candidates(
+        self,
+        model_id: str,
+        limit: int = 5,
+        min_score: float = 0.5
+    ) -> List[Tuple[str, float]]:
+        """Find the MOT models whose names best match a HuggingFace model ID.
+
+        Args:
+            model_id: HuggingFace model ID
+            limit: Maximum number of candidates to return
+            min_score: Minimum score for a candidate to be returned
+
+        Returns:
+            List of (mot_file, score) tuples, best match first, scores in [0, 1]
+        """
+        query = extract_features(model_id)
+        if not query.key:
+            return []
+
+        # Blocking: only score names sharing the folded key or enough trigrams
+        entry_ids = set(self.by_key.get(query.key, []))
+        overlaps = Counter()
+        for trigram in query.trigrams:
+            postings = self.by_trigram.get(trigram, [])
+            if len(postings) <= self.max_postings:
+                overlaps.update(postings)
+        needed = max(1, len(query.trigrams) // 3)
+        entry_ids.update(entry_id for entry_id, count in overlaps.items() if count >= needed)
+
+        best: Dict[str, float] = {}
+        for entry_id in entry_ids:
+            mot_file, features = self.entries[entry_id]
+            score = self._score(query, features)
+            if score >= min_score and score > best.get(mot_file, 0.0):
+                best[mot_file] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return [(mot_file, round(score, 3)) for mot_file, score in ranked[:limit]]
+
+    @staticmethod
+    def _score(query: NameFeatures, candidate: NameFeatures) -> float:
+        """Score the similarity of two names.
+
+        Args:
+            query: Features of the HuggingFace model name
+            candidate: Features of the MOT model name
+
+        Returns:
+            Score between 0 and 1
+        """
+        # A different parameter count or version is a different model, even
+        # if the names fold to the same key
+        penalty = 1.0
+        if query.sizes and candidate.sizes and query.sizes != candidate.sizes:
+            penalty *= 0.5
+        if query.versions and candidate.versions and query.versions != candidate.versions:
+            penalty *= 0.7
+
+        if query.key == candidate.key:
+            # Same model, possibly a quantized or converted fork of it
+            return (0.95 if query.is_fork != candidate.is_fork else 1.0) * penalty
+
+        union = len(query.trigrams | candidate.trigrams)
+        score = len(query.trigrams & candidate.trigrams) / union if union else 0.0
+        return score * penalty
+
@@ -0,0 +1,368 @@
+"""
+Model Openness Tool - Persistent HTTP Response Cache
+
+On-disk cache of HuggingFace and GitHub responses shared by the model scraper
+and the missing models finder. Entries are keyed by method, URL and a
+fingerprint of the Authorization header (so responses to a token's requests,
+such as gated model cards, are never served to other callers and vice
+versa), expire after a TTL that depends on the kind of endpoint, are
+revalidated with If-None-Match when the server sent an ETag, and are evicted
+least recently used first once the cache grows past its size limit. Triggers
+keep the total size of the stored bodies in a one-row table, so a put checks
+the limit without summing every entry.
+
+The cache is a single SQLite file, so several tools (or worker threads) can
+share it safely.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlparse
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'mot-tools'
+
+# Time to live in seconds per endpoint class (see classify_url)
+DEFAULT_TTLS = {
+    'hf_listing': 60 * 60,           # /api/models listing pages change hourly
+    'hf_model': 24 * 60 * 60,        # /api/models/{id}
+    'hf_tree': 24 * 60 * 60,         # /api/models/{id}/tree/...
+    'hf_file': 24 * 60 * 60,         # raw README.md and other repo files
+    'github': 7 * 24 * 60 * 60,      # repository existence probes
+    'other': 60 * 60,
+}
+
+# Only responses that are stable answers are worth caching; 404s are kept so
+# missing READMEs and non-existent GitHub repos are not probed again.
+CACHEABLE_STATUSES = {200, 203, 301, 308, 404, 410}
+
+# Eviction frees space down to this fraction of the size limit, so a full
+# cache does not evict on every put
+EVICT_TARGET = 0.9
+
+# Headers describing the wire encoding, which no longer apply to a decoded cached body
+WIRE_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+def classify_url(url: str) -> str:
+    """Classify a URL into the endpoint class used for TTLs and accounting.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        One of 'hf_listing', 'hf_model', 'hf_tree', 'hf_file', 'github' or 'other'
+    """
+    parsed = urlparse(url)
+    path = parsed.path.rstrip('/')
+
+    if parsed.netloc.lower().endswith('github.com'):
+        return 'github'
+    if path == '/api/models':
+        return 'hf_listing'
+    if path.startswith('/api/models/'):
+        return 'hf_tree' if '/tree/' in path else 'hf_model'
+    if '/raw/' in path or '/resolve/' in path:
+        return 'hf_file'
+    return 'other'
+
+
+class CachedResponse(NamedTuple):
+    """A response stored in the cache."""
+    key: str
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    etag: Optional[str]
+    stored_at: float
+
+
+class ResponseCache:
+    """SQLite-backed HTTP response cache with per-endpoint TTLs and LRU eviction."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        offline: bool = False,
+        refresh: bool = False
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache database (default: ~/.cache/mot-tools)
+            max_bytes: Size limit for stored response bodies
+            ttls: Overrides for the per-endpoint-class TTLs in seconds
+            offline: Serve only from the cache (regardless of age) and never hit the network
+            refresh: Treat every entry as stale so it is revalidated or refetched
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.offline = offline
+        self.refresh = refresh
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.cache_dir / 'http_cache.sqlite'),
+            timeout=30,
+            check_same_thread=False
+        )
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            '  key TEXT PRIMARY KEY,'
+            '  url TEXT NOT NULL,'
+            '  status INTEGER NOT NULL,'
+            '  headers TEXT NOT NULL,'
+            '  body BLOB NOT NULL,'
+            '  etag TEXT,'
+            '  stored_at REAL NOT NULL,'
+            '  accessed_at REAL NOT NULL,'
+            '  size INTEGER NOT NULL'
+            ')'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        # INSERT OR REPLACE fires the delete trigger for the replaced row only
+        # with recursive triggers enabled
+        self._db.execute('PRAGMA recursive_triggers = ON')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS cache_size ('
+            '  id INTEGER PRIMARY KEY CHECK (id = 0),'
+            '  total INTEGER NOT NULL'
+            ')'
+        )
+        self._db.execute(
+            'CREATE TRIGGER IF NOT EXISTS responses_size_insert AFTER INSERT ON responses '
+            'BEGIN UPDATE cache_size SET total = total + NEW.size; END'
+        )
+        self._db.execute(
+            'CREATE TRIGGER IF NOT EXISTS responses_size_delete AFTER DELETE ON responses '
+            'BEGIN UPDATE cache_size SET total = total - OLD.size; END'
+        )
+        # Seeded once, for caches created before the running total existed
+        self._db.execute(
+            'INSERT OR IGNORE INTO cache_size (id, total) '
+            'SELECT 0, COALESCE(SUM(size), 0) FROM responses'
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(method: str, url: str, authorization: Optional[str] = None) -> str:
+        """Build the cache key for a request.
+
+        Args:
+            method: HTTP method
+            url: Full request URL including the query string
+            authorization: Authorization header of the request, if any; only a
+                hash of it is part of the key
+
+        Returns:
+            Cache key
+        """
+        key = f"{method.upper()} {url}"
+        if authorization:
+            key += f" auth:{hashlib.sha256(authorization.encode('utf-8')).hexdigest()[:16]}"
+        return key
+
+    def get(self, method: str, url: str, authorization: Optional[str] = None) -> Optional[CachedResponse]:
+        """Look up a cached response, fresh or not.
+
+        Args:
+            method: HTTP method
+            url: Full request URL including the query string
+            authorization: Authorization header of the request, if any
+
+        Returns:
+            The cached response, or None if not cached
+        """
+        key = self.make_key(method, url, authorization)
+        with self._lock:
+            row = self._db.execute(
+                'SELECT url, status, headers, body, etag, stored_at FROM responses WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._db.commit()
+
+        url, status, headers, body, etag, stored_at = row
+        return CachedResponse(key, url, status, json.loads(headers), body, etag, stored_at)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Check whether a cached response can be used without revalidation.
+
+        Args:
+            entry: Cached response
+
+        Returns:
+            True if the entry is within its TTL (always True offline, never on refresh)
+        """
+        if self.offline:
+            return True
+        if self.refresh:
+            return False
+        ttl = self.ttls.get(classify_url(entry.url), self.ttls['other'])
+        return time.time() - entry.stored_at < ttl
+
+    def put(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes,
+        authorization: Optional[str] = None
+    ) -> bool:
+        """Store a response if it is cacheable.
+
+        Args:
+            method: HTTP method
+            url: Full request URL including the query string
+            status: HTTP status code
+            headers: Response headers
+            body: Response body
+            authorization: Authorization header of the request, if any
+
+        Returns:
+            True if the response was stored
+        """
+        if status not in CACHEABLE_STATUSES or len(body) > self.max_bytes:
+            return False
+
+        headers = {k: v for k, v in headers.items() if k.lower() not in WIRE_HEADERS}
+        lower_headers = {k.lower(): v for k, v in headers.items()}
+        if 'no-store' in lower_headers.get('cache-control', ''):
+            return False
+
+        etag = lower_headers.get('etag')
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, url, status, headers, body, etag, stored_at, accessed_at, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (self.make_key(method, url, authorization), url, status, json.dumps(headers),
+                 sqlite3.Binary(body), etag, now, now, len(body))
+            )
+            self._evict()
+            self._db.commit()
+        return True
+
+    def touch(self, entry: CachedResponse) -> None:
+        """Mark an entry as fresh again after a 304 Not Modified revalidation.
+
+        Args:
+            entry: Cached response that was revalidated
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?',
+                (now, now, entry.key)
+            )
+            self._db.commit()
+
+    def size(self) -> int:
+        """Total size in bytes of the stored response bodies."""
+        with self._lock:
+            return self._total()
+
+    def _total(self) -> int:
+        """Read the running total size. Must be called with the lock held."""
+        row = self._db.execute('SELECT total FROM cache_size WHERE id = 0').fetchone()
+        return row[0] if row else 0
+
+    def _evict(self) -> None:
+        """Drop least recently used entries once the cache exceeds its size limit.
+
+        Frees space down to EVICT_TARGET of the limit. Must be called with the
+        lock held.
+        """
+        total = self._total()
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * EVICT_TARGET)
+        while total > target:
+            rows = self._db.execute(
+                'SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64'
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                total -= size
+                if total <= target:
+                    break
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
+            self._db.commit()
+
+
+def add_cache_arguments(parser) -> None:
+    """Add the shared cache command-line options to an argument parser.
+
+    Args:
+        parser: argparse.ArgumentParser to extend
+    """
+    parser.add_argument(
+        '--cache-dir',
+        default=str(DEFAULT_CACHE_DIR),
+        help=f'Directory for the HTTP response cache (default: {DEFAULT_CACHE_DIR})'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=512,
+        help='Maximum size of the HTTP response cache in MB (default: 512)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the HTTP response cache'
+    )
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Serve HTTP responses only from the cache, never from the network'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Revalidate or refetch every cached HTTP response'
+    )
+
+
+def cache_from_args(args) -> Optional[ResponseCache]:
+    """Create the response cache selected by the shared command-line options.
+
+    Args:
+        args: Parsed arguments (see add_cache_arguments)
+
+    Returns:
+        ResponseCache, or None if caching is disabled
+    """
+    if args.no_cache:
+        if args.offline:
+            raise SystemExit('error: --offline requires the HTTP response cache')
+        return None
+    return ResponseCache(
+        cache_dir=args.cache_dir,
+        max_bytes=args.cache_size * 1024 * 1024,
+        offline=args.offline,
+        refresh=args.refresh
+    )
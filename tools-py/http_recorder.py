@@ -0,0 +1,315 @@
+"""
+Model Openness Tool - HTTP Request Recorder
+
+Transport-level log of the HTTP requests the scraper and the finder send,
+to budget rate limits and find the endpoints that dominate a crawl. Set a
+RequestRecorder as the recorder of a RateLimitedSession (the async engine
+records through its scraper's session as well) and every request is logged
+with its endpoint class (see http_cache.classify_url), status, latency,
+time spent waiting for the rate limiter or retry backoff, response size,
+cache status and number of retries.
+
+At the end of a run the log can be written as a HAR-like file (HTTP Archive
+1.2 layout, without headers and bodies, with the extra fields prefixed by
+an underscore) and summarized per host and endpoint class.
+
+Example:
+    recorder = RequestRecorder()
+    scraper.session.recorder = recorder
+    ...
+    recorder.print_summary()
+    recorder.write_har('scrape.har')
+"""
+
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from http_cache import classify_url
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty sorted list."""
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+class RequestRecorder:
+    """Thread-safe log of HTTP requests with per-host accounting."""
+
+    def __init__(self):
+        self.entries: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: Optional[int],
+        started: float,
+        elapsed: float,
+        size: Optional[int] = None,
+        cache_status: str = 'bypass',
+        retries: int = 0,
+        blocked: float = 0.0,
+        rate_limited: int = 0,
+        content_type: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> Dict:
+        """Log one request.
+
+        Args:
+            method: HTTP method
+            url: Request URL (before any endpoint override)
+            status: Final status code, None if the request failed without a response
+            started: Start time as a Unix timestamp
+            elapsed: Seconds from start until the response headers arrived
+                (or the request failed), including waits and retries
+            size: Response body size in bytes, None if not known (yet)
+            cache_status: 'hit', 'revalidated', 'miss' or 'bypass'
+            retries: Number of times the request was retried
+            blocked: Seconds spent waiting for the rate limiter and retry backoff
+            rate_limited: Number of 429 responses received, including retried ones
+            content_type: Content-Type of the response
+            error: Error message of a failed request
+
+        Returns:
+            The log entry; streamed responses update its size through set_size
+        """
+        entry = {
+            'method': method,
+            'url': url,
+            'host': urlparse(url).netloc,
+            'url_class': classify_url(url),
+            'status': status,
+            'started': started,
+            'elapsed': elapsed,
+            'blocked': blocked,
+            'size': size,
+            'cache_status': cache_status,
+            'retries': retries,
+            'rate_limited': rate_limited,
+            'content_type': content_type,
+            'error': error,
+        }
+        with self._lock:
+            self.entries.append(entry)
+        return entry
+
+    def set_size(self, entry: Dict, size: Optional[int]) -> None:
+        """Update the size of a logged response as its body is read.
+
+        Args:
+            entry: Entry returned by record
+            size: Body bytes read so far
+        """
+        entry['size'] = size
+
+    def summary(self) -> Dict[str, Dict]:
+        """Aggregate the log per host and endpoint class.
+
+        Returns:
+            Dictionary mapping each host to its requests, bytes, retries,
+            errors (no response, 429 or 5xx), latency (total, mean, p95, max,
+            and time blocked), counts per status and cache status, and per
+            endpoint class totals
+        """
+        with self._lock:
+            entries = list(self.entries)
+
+        hosts: Dict[str, Dict] = {}
+        latencies: Dict[str, List[float]] = {}
+        for entry in entries:
+            host = hosts.setdefault(entry['host'], {
+                'requests': 0, 'bytes': 0, 'retries': 0, 'errors': 0,
+                'seconds': 0.0, 'blocked_seconds': 0.0,
+                'statuses': {}, 'cache': {}, 'url_classes': {},
+            })
+            status = str(entry['status']) if entry['status'] is not None else 'error'
+            host['requests'] += 1
+            host['bytes'] += entry['size'] or 0
+            host['retries'] += entry['retries']
+            # 404s answer existence probes; only failures and throttling count as errors
+            host['errors'] += entry['status'] is None or entry['status'] == 429 or entry['status'] >= 500
+            host['seconds'] += entry['elapsed']
+            host['blocked_seconds'] += entry['blocked']
+            host['statuses'][status] = host['statuses'].get(status, 0) + 1
+            host['cache'][entry['cache_status']] = host['cache'].get(entry['cache_status'], 0) + 1
+
+            url_class = host['url_classes'].setdefault(
+                entry['url_class'], {'requests': 0, 'bytes': 0, 'retries': 0, 'seconds': 0.0, 'cache_hits': 0}
+            )
+            url_class['requests'] += 1
+            url_class['bytes'] += entry['size'] or 0
+            url_class['retries'] += entry['retries']
+            url_class['seconds'] += entry['elapsed']
+            url_class['cache_hits'] += entry['cache_status'] in ('hit', 'revalidated')
+            latencies.setdefault(entry['host'], []).append(entry['elapsed'])
+
+        for name, host in hosts.items():
+            ordered = sorted(latencies[name])
+            host['latency_mean'] = host['seconds'] / len(ordered)
+            host['latency_p95'] = _percentile(ordered, 0.95)
+            host['latency_max'] = ordered[-1]
+            host['url_classes'] = dict(sorted(host['url_classes'].items(), key=lambda item: -item[1]['seconds']))
+        return dict(sorted(hosts.items(), key=lambda item: -item[1]['requests']))
+
+    def print_summary(self) -> None:
+        """Print the per-host summary, endpoint classes by time spent."""
+        print("\nHTTP requests per host:")
+        for host, stats in self.summary().items():
+            hits = stats['cache'].get('hit', 0) + stats['cache'].get('revalidated', 0)
+            print(f"  {host}: {stats['requests']} requests ({hits} from cache), "
+                  f"{stats['bytes'] / (1024 * 1024):.1f} MB, {stats['retries']} retries, {stats['errors']} errors; "
+                  f"latency mean {stats['latency_mean'] * 1000:.0f} ms, p95 {stats['latency_p95'] * 1000:.0f} ms, "
+                  f"{stats['blocked_seconds']:.1f}s waiting for rate limits")
+            for name, url_class in stats['url_classes'].items():
+                print(f"    {name:<11} {url_class['requests']:>7} requests {url_class['bytes'] / (1024 * 1024):>9.1f} MB "
+                      f"{url_class['seconds']:>9.1f}s {url_class['retries']:>5} retries")
+
+    def har(self) -> Dict:
+        """The log as an HTTP Archive (HAR 1.2) style document.
+
+        Headers and bodies are not recorded, so those fields are empty; the
+        endpoint class, cache status, retries and errors are kept in
+        underscore-prefixed custom fields.
+
+        Returns:
+            HAR document
+        """
+        with self._lock:
+            entries = sorted(self.entries, key=lambda e: e['started'])
+
+        har_entries = []
+        for entry in entries:
+            size = entry['size'] if entry['size'] is not None else -1
+            blocked_ms = round(entry['blocked'] * 1000, 3)
+            har_entries.append({
+                'startedDateTime': datetime.fromtimestamp(entry['started'], timezone.utc).isoformat(),
+                'time': round(entry['elapsed'] * 1000, 3),
+                'request': {
+                    'method': entry['method'],
+                    'url': entry['url'],
+                    'httpVersion': 'HTTP/1.1',
+                    'cookies': [],
+                    'headers': [],
+                    'queryString': [],
+                    'headersSize': -1,
+                    'bodySize': 0,
+                },
+                'response': {
+                    'status': entry['status'] or 0,
+                    'statusText': entry['error'] or '',
+                    'httpVersion': 'HTTP/1.1',
+                    'cookies': [],
+                    'headers': [],
+                    'content': {'size': size, 'mimeType': entry['content_type'] or ''},
+                    'redirectURL': '',
+                    'headersSize': -1,
+                    'bodySize': size if entry['cache_status'] not in ('hit', 'revalidated') else 0,
+                },
+                'cache': {},
+                'timings': {
+                    'blocked': blocked_ms,
+                    'send': 0,
+                    'wait': round(max(0.0, entry['elapsed'] * 1000 - blocked_ms), 3),
+                    'receive': 0,
+                },
+                '_urlClass': entry['url_class'],
+                '_cacheStatus': entry['cache_status'],
+                '_retries': entry['retries'],
+                '_rateLimited': entry['rate_limited'],
+                '_error': entry['error'],
+            })
+
+        return {
+            'log': {
+                'version': '1.2',
+                'creator': {'name': 'mot-tools', 'version': '1.0'},
+                'entries': har_entries,
+            }
+        }
+
+    def write_har(self, path: str) -> None:
+        """Write the log as a HAR-like JSON file.
+
+        Args:
+            path: Output file path
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.har(), f)
+
+
+class RecorderGroup:
+    """Passes every request to several recorders, e.g. a RequestRecorder and metrics."""
+
+    def __init__(self, recorders: List):
+        self.recorders = list(recorders)
+
+    def record(self, *args, **kwargs) -> List:
+        """Log a request with every recorder (see RequestRecorder.record).
+
+        Returns:
+            The entries of the recorders
+        """
+        return [recorder.record(*args, **kwargs) for recorder in self.recorders]
+
+    def set_size(self, entries: List, size: Optional[int]) -> None:
+        """Update the response size with every recorder (see RequestRecorder.set_size)."""
+        for recorder, entry in zip(self.recorders, entries):
+            recorder.set_size(entry, size)
+
+
+def combine_recorders(*recorders):
+    """Combine the enabled recorders into one for a session.
+
+    Args:
+        recorders: Recorders, None for disabled ones
+
+    Returns:
+        None, the only enabled recorder, or a RecorderGroup of them
+    """
+    enabled = [recorder for recorder in recorders if recorder is not None]
+    if len(enabled) <= 1:
+        return enabled[0] if enabled else None
+    return RecorderGroup(enabled)
+
+
+def add_recorder_arguments(parser) -> None:
+    """Add the shared request recording option to an argument parser.
+
+    Args:
+        parser: argparse.ArgumentParser to extend
+    """
+    parser.add_argument(
+        '--har',
+        metavar='FILE',
+        help='Record every HTTP request, write them to FILE as a HAR-like log and print a per-host summary'
+    )
+
+
+def recorder_from_args(args) -> Optional[RequestRecorder]:
+    """Create the request recorder selected by the shared command-line option.
+
+    Args:
+        args: Parsed arguments (see add_recorder_arguments)
+
+    Returns:
+        RequestRecorder, or None if recording is disabled
+    """
+    return RequestRecorder() if args.har else None
+
+
+def finish_recording(recorder: Optional[RequestRecorder], path: Optional[str]) -> None:
+    """Print the per-host summary and write the HAR-like log, if recording.
+
+    Args:
+        recorder: Recorder, or None if recording is disabled
+        path: HAR output file path
+    """
+    if recorder is None:
+        return
+    recorder.print_summary()
+    recorder.write_har(path)
+    print(f"HTTP log written to: {path}")
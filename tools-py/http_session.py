@@ -0,0 +1,581 @@
+"""
+Model Openness Tool - Shared HTTP Session
+
+HTTP plumbing shared by the model scraper and the missing models finder.
+Both tools talk to the same hosts (huggingface.co, github.com), so request
+pacing, retries, connection pooling and response caching live here instead
+of being duplicated.
+"""
+
+import codecs
+import datetime
+import email.utils
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from http_cache import CachedResponse, ResponseCache
+
+
+# Statuses that are retried for idempotent requests; 429 and 503 also mean
+# the host wants fewer requests and slow its rate limit down
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+
+# Longest Retry-After honored, so a misbehaving server cannot stall a run
+MAX_RETRY_AFTER = 300.0
+
+# Read size for streamed response bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header into seconds.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+
+    Returns:
+        Seconds to wait (capped at MAX_RETRY_AFTER), or None if absent or invalid
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when is None:
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=datetime.timezone.utc)
+        seconds = (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Jittered exponential backoff delay.
+
+    Args:
+        attempt: Number of retries already made (0 for the first retry)
+        base: Delay before the first retry
+        cap: Maximum delay
+
+    Returns:
+        Seconds to wait, randomized between 50% and 150% of base * 2**attempt
+    """
+    return min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Incrementally parse a JSON array, yielding its items as they complete.
+
+    Only the item being parsed is buffered, so arrays of any length can be
+    consumed in constant memory. A stream that ends early (e.g. cut off by a
+    byte cap) simply yields the items that were complete. After the closing
+    bracket the remaining chunks are read, so a source that caches what it
+    streams (see RateLimitedSession.iter_capped) reaches its end.
+
+    Args:
+        chunks: UTF-8 encoded pieces of the JSON document
+
+    Yields:
+        Each item of the top-level array
+
+    Raises:
+        ValueError: If the document is not a JSON array
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    chunks = iter(chunks)
+    buffer = ''
+    started = False
+
+    for chunk in chunks:
+        buffer += text.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError('Expected a JSON array')
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                for _ in chunks:
+                    pass
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break  # Item continues in the next chunk
+            if buffer[pos] not in '[{"' and (end == len(buffer) or buffer[end] not in ' \t\r\n,]'):
+                break  # A number or literal may continue in the next chunk
+            yield item
+            pos = end
+        buffer = buffer[pos:]
+
+
+class RequestStats:
+    """Thread-safe counters of requests sent, throttled, retried and failed."""
+
+    NAMES = ('requests', 'throttled', 'retried', 'failed')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.NAMES, 0)
+
+    def increment(self, name: str) -> None:
+        """Add one to a counter."""
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Current value of every counter."""
+        with self._lock:
+            return dict(self._counts)
+
+    def summary(self) -> str:
+        """One-line human readable summary of the counters."""
+        counts = self.snapshot()
+        return (f"{counts['requests']} HTTP requests, {counts['throttled']} throttled, "
+                f"{counts['retried']} retried, {counts['failed']} failed")
+
+
+class HostRateLimiter:
+    """Per-host token bucket whose rate adapts to throttling by the host.
+
+    Each host starts at the configured rate. A 429 or 503 response halves the
+    host's rate (once per request interval, however many requests in flight
+    were throttled) and, if the server sent Retry-After, holds all requests to the
+    host until then. Every successful response raises the rate by 5% again, up
+    to the configured rate, so a crawl settles at the fastest rate the host
+    accepts.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 2.0,
+        burst: Optional[float] = None,
+        min_rate: float = 0.1,
+        throttled_rate: float = 2.0
+    ):
+        """Initialize the limiter.
+
+        Args:
+            requests_per_second: Maximum request rate per host (0 means
+                unlimited until the host throttles)
+            burst: Requests that may be sent back to back after an idle period
+                (default: 1)
+            min_rate: Lowest rate throttling can push a host down to
+            throttled_rate: Rate a host without a configured limit drops to
+                when it first throttles
+        """
+        self.max_rate = max(0.0, requests_per_second)
+        self.burst = max(1.0, burst or 1.0)
+        self.min_rate = min_rate
+        self.throttled_rate = throttled_rate
+        self._lock = threading.Lock()
+        # host -> [rate, tokens, last_refill, blocked_until, last_slowdown]
+        self._hosts: Dict[str, list] = {}
+
+    def _state(self, host: str, now: float) -> list:
+        """Get the bucket of a host, refilled up to now. Must be called with the lock held."""
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = [self.max_rate, self.burst, now, 0.0, None]
+        elif state[0]:
+            state[1] = min(self.burst, state[1] + (now - state[2]) * state[0])
+        state[2] = now
+        return state
+
+    def rate(self, host: str) -> float:
+        """Current request rate of a host (0 means unlimited)."""
+        with self._lock:
+            state = self._hosts.get(host)
+            return state[0] if state else self.max_rate
+
+    def reserve(self, host: str) -> float:
+        """Reserve the next request slot for a host.
+
+        Args:
+            host: Host name the request is going to
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(host, now)
+            delay = max(0.0, state[3] - now)
+            if state[0]:
+                state[1] -= 1
+                if state[1] < 0:
+                    delay = max(delay, -state[1] / state[0])
+        return delay
+
+    def wait(self, host: str) -> None:
+        """Block until a request to the given host is allowed.
+
+        Args:
+            host: Host name the request is going to
+        """
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttle(self, host: str, retry_after: Optional[float] = None) -> None:
+        """Slow a host down after it answered 429 Too Many Requests or 503.
+
+        Args:
+            host: Host name that throttled
+            retry_after: Seconds the host asked to wait (Retry-After), if any
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(host, now)
+            # Concurrent requests throttled together only slow the host down once
+            if state[4] is None or not state[0] or now - state[4] >= 1.0 / state[0]:
+                state[0] = max(self.min_rate, state[0] / 2 if state[0] else self.throttled_rate)
+                state[4] = now
+            state[1] = min(state[1], 0.0)
+            if retry_after:
+                state[3] = max(state[3], now + retry_after)
+
+    def succeed(self, host: str) -> None:
+        """Speed a throttled host back up after a successful response.
+
+        Args:
+            host: Host name that answered
+        """
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or not state[0]:
+                return
+            if self.max_rate and state[0] >= self.max_rate:
+                return
+            state[0] *= 1.05
+            if self.max_rate:
+                state[0] = min(state[0], self.max_rate)
+            elif state[0] >= self.throttled_rate * 8:
+                state[0] = 0.0  # Recovered, back to unlimited
+
+
+class RateLimitedSession(requests.Session):
+    """requests.Session that paces requests per host, optionally caches responses
+    on disk, and can be shared by worker threads."""
+
+    def __init__(
+        self,
+        rate_limit: Optional[float] = None,
+        pool_size: int = 10,
+        cache: Optional[ResponseCache] = None,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        stream_cache_bytes: int = 8 * 1024 * 1024,
+        endpoints: Optional[Dict[str, str]] = None
+    ):
+        """Initialize the session.
+
+        Args:
+            rate_limit: Maximum requests per second per host (None or 0 means
+                unlimited until a host throttles)
+            pool_size: Number of pooled connections kept per host
+            cache: Optional on-disk response cache for GET and HEAD requests
+            max_retries: Retries of idempotent requests that failed to connect,
+                timed out or got a retryable status (see RETRY_STATUSES)
+            backoff: Delay in seconds before the first retry when the server
+                sent no Retry-After, doubled (with jitter) for each further retry
+            stream_cache_bytes: Largest streamed (stream=True) body stored in the
+                response cache; larger ones are passed through uncached
+            endpoints: URL prefixes to send elsewhere, e.g. {'https://huggingface.co':
+                'http://127.0.0.1:8000'} to run against a local stand-in (see
+                mock_hf_server.py); rate limits and the cache keep the original URLs
+        """
+        super().__init__()
+        self.rate_limiter = HostRateLimiter(rate_limit or 0.0)
+        self.cache = cache
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.stream_cache_bytes = stream_cache_bytes
+        self.endpoints = dict(endpoints or {})
+        self.stats = RequestStats()
+        # Optional recorder of every request: an http_recorder.RequestRecorder,
+        # scrape_metrics.ScrapeMetrics or both (see http_recorder.combine_recorders)
+        self.recorder = None
+
+        # Size the connection pool for the number of threads sharing the session,
+        # otherwise urllib3 discards connections and re-does the TLS handshake.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def resolve(self, url: str) -> str:
+        """Map a URL to where it is actually sent (see the endpoints argument).
+
+        Args:
+            url: Request URL
+
+        Returns:
+            The URL with a matching endpoint prefix replaced, or unchanged
+        """
+        for prefix, target in self.endpoints.items():
+            if url.startswith(prefix):
+                return target + url[len(prefix):]
+        return url
+
+    def send(self, request, **kwargs):
+        """Send a prepared request, serving it from the response cache when possible.
+
+        Responses carry a cache_status attribute: 'hit', 'revalidated' (304 from
+        the server), 'miss' or 'bypass' (caching not applicable). With a
+        recorder set, the request is logged; a streamed response's size is
+        filled in by iter_capped once its body is read.
+        """
+        if self.recorder is None:
+            return self._send_cached(request, {}, **kwargs)
+
+        trace = {'retries': 0, 'blocked': 0.0, 'rate_limited': 0}
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            response = self._send_cached(request, trace, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self.recorder.record(
+                request.method, request.url, None, started, time.perf_counter() - start,
+                retries=trace['retries'], blocked=trace['blocked'], rate_limited=trace['rate_limited'],
+                error=str(e) or type(e).__name__
+            )
+            raise
+
+        # Redirect hops go through send themselves; log this request as the first hop
+        first = response.history[0] if response.history else response
+        # Only count bodies already read; streamed ones are counted by iter_capped
+        if first._content is not False:
+            size = len(first._content or b'')
+        else:
+            try:
+                size = int(first.headers['Content-Length'])
+            except (KeyError, ValueError):
+                size = None
+        record = self.recorder.record(
+            request.method, request.url, first.status_code, started, time.perf_counter() - start,
+            size=size,
+            cache_status=getattr(first, 'cache_status', response.cache_status),
+            retries=trace['retries'],
+            blocked=trace['blocked'],
+            rate_limited=trace['rate_limited'],
+            content_type=first.headers.get('Content-Type')
+        )
+        if first is response:
+            response.record = record
+        return response
+
+    def _send_cached(self, request, trace: Dict, **kwargs):
+        """Send a prepared request through the response cache (see send).
+
+        Args:
+            request: Prepared request
+            trace: Dictionary receiving the retries, blocked time and 429 count (see _send_paced)
+        """
+        cache = self.cache
+        if cache is None or request.method not in ('GET', 'HEAD'):
+            response = self._send_paced(request, trace, **kwargs)
+            response.cache_status = 'bypass'
+            return response
+
+        authorization = request.headers.get('Authorization')
+        entry = cache.get(request.method, request.url, authorization)
+        if entry is not None and cache.is_fresh(entry):
+            return self._cached_response(entry, request, 'hit')
+        if cache.offline:
+            raise requests.exceptions.ConnectionError(
+                f"Offline mode: {request.url} is not in the cache",
+                request=request
+            )
+
+        if entry is not None and entry.etag:
+            request.headers['If-None-Match'] = entry.etag
+
+        response = self._send_paced(request, trace, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            cache.touch(entry)
+            return self._cached_response(entry, request, 'revalidated')
+
+        response.cache_status = 'miss'
+        response.cache_pending = None
+        if not kwargs.get('stream'):
+            cache.put(request.method, request.url, response.status_code, response.headers, response.content,
+                      authorization)
+        elif response.status_code == 200:
+            # Streamed bodies are cached by iter_capped as the caller reads them,
+            # so nothing is read past the caller's byte cap
+            response.cache_pending = (request.method, request.url, authorization)
+        else:
+            # Callers do not read error bodies (e.g. the 404 of a missing model
+            # card), so small ones are read and cached right away
+            try:
+                length = int(response.headers.get('Content-Length', -1))
+            except ValueError:
+                length = -1
+            if 0 <= length <= self.stream_cache_bytes:
+                cache.put(request.method, request.url, response.status_code, response.headers, response.content,
+                          authorization)
+        return response
+
+    def iter_capped(
+        self,
+        response: requests.Response,
+        max_bytes: Optional[int],
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Iterate over the body of a streamed response, stopping after max_bytes.
+
+        Sets response.truncated to whether the body was cut off; a truncated
+        response is closed. A body read to the end that is no larger than
+        stream_cache_bytes is stored in the response cache.
+
+        Args:
+            response: Response of a request sent with stream=True
+            max_bytes: Maximum number of (decoded) body bytes to read, None for no limit
+            chunk_size: Read size
+
+        Yields:
+            Body chunks
+        """
+        response.truncated = False
+        cache_key = getattr(response, 'cache_pending', None)
+        record = getattr(response, 'record', None)
+        pending = [] if cache_key else None
+        total = 0
+
+        for chunk in response.iter_content(chunk_size):
+            if max_bytes is not None and total + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - total]
+                response.truncated = True
+            total += len(chunk)
+            if pending is not None:
+                if total <= self.stream_cache_bytes:
+                    pending.append(chunk)
+                else:
+                    pending = None  # Too large to cache, stop keeping it
+            if record is not None:
+                self.recorder.set_size(record, total)
+            if chunk:
+                yield chunk
+            if response.truncated:
+                response.close()
+                return
+
+        if pending is not None:
+            response.cache_pending = None
+            method, url, authorization = cache_key
+            self.cache.put(method, url, response.status_code, response.headers, b''.join(pending), authorization)
+
+    def _send_paced(self, request, trace: Dict, **kwargs):
+        """Send a prepared request over the network.
+
+        Waits for the host's rate limit first, slows the host down when it
+        throttles, and retries idempotent requests on connection errors,
+        timeouts and retryable statuses. The last response of a request that
+        kept failing is returned as is.
+
+        Args:
+            request: Prepared request
+            trace: Dictionary whose 'retries', 'blocked' (seconds waiting
+                for the rate limiter and retry backoff) and 'rate_limited'
+                (429 responses received) are set
+        """
+        host = urlparse(request.url).netloc
+        retries = self.max_retries if request.method in ('GET', 'HEAD', 'OPTIONS') else 0
+        attempt = 0
+
+        url = self.resolve(request.url)
+        if url != request.url:
+            # Leave the original request (and with it the cache key) untouched
+            request = request.copy()
+            request.url = url
+
+        blocked = 0.0
+        while True:
+            wait_start = time.perf_counter()
+            self.rate_limiter.wait(host)
+            blocked += time.perf_counter() - wait_start
+            trace['retries'] = attempt
+            trace['blocked'] = blocked
+            self.stats.increment('requests')
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= retries:
+                    self.stats.increment('failed')
+                    raise
+                delay = backoff_delay(attempt, self.backoff)
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.rate_limiter.succeed(host)
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                throttled = response.status_code in THROTTLE_STATUSES
+                if throttled:
+                    self.stats.increment('throttled')
+                    self.rate_limiter.throttle(host, retry_after)
+                if response.status_code == 429:
+                    trace['rate_limited'] = trace.get('rate_limited', 0) + 1
+                if attempt >= retries:
+                    self.stats.increment('failed')
+                    return response
+                response.close()
+                if retry_after is None:
+                    delay = backoff_delay(attempt, self.backoff)
+                else:
+                    # When throttled the limiter already holds the host until then
+                    delay = 0.0 if throttled else retry_after
+
+            attempt += 1
+            self.stats.increment('retried')
+            if delay > 0:
+                time.sleep(delay)
+                blocked += delay
+
+    @staticmethod
+    def _cached_response(entry: CachedResponse, request, cache_status: str) -> requests.Response:
+        """Build a requests.Response from a cached entry.
+
+        Args:
+            entry: Cached response
+            request: Prepared request being answered
+            cache_status: Value for the response's cache_status attribute
+
+        Returns:
+            Response object equivalent to the original one
+        """
+        response = requests.Response()
+        response.status_code = entry.status
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response._content = entry.body
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry.url
+        response.request = request
+        response.reason = 'OK' if entry.status < 400 else 'Cached Error'
+        response.elapsed = datetime.timedelta(0)
+        response.cache_status = cache_status
+        return response
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Model Openness Tool - Local HuggingFace Stand-in
+
+Local HTTP server that answers the HuggingFace and GitHub requests of the
+model scraper and the missing models finder, for benchmarks and offline
+experiments. It serves the downloads-sorted model listing (/api/models, with
+skip and cursor pagination), model info, raw README files, paginated repository
+trees and GitHub repository probes, with configurable latency, error rate and
+429 injection.
+
+Payloads are either generated (deterministic, of configurable size) or
+replayed from a directory recorded with --record:
+
+    payloads/
+        listing.json                  # optional, /api/models entries
+        models/<org>__<name>.json     # /api/models/{id}
+        readme/<org>__<name>.md       # /{id}/raw/main/README.md
+        tree/<org>__<name>.json       # /api/models/{id}/tree/main
+
+Point a session at the server with its endpoints, e.g.
+RateLimitedSession.endpoints = server.endpoints().
+
+Usage:
+    python mock_hf_server.py [--port PORT] [--latency SECONDS] [--payloads DIR]
+    python mock_hf_server.py --record DIR MODEL_ID [MODEL_ID ...]
+
+Example:
+    python mock_hf_server.py --port 8000 --latency 0.05 --throttle-rate 0.01
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlencode, urlparse
+
+import requests
+
+# Entries per page of the listing (when no limit is given) and of repository trees
+LISTING_PAGE_SIZE = 1000
+TREE_PAGE_SIZE = 1000
+
+CARD_TEMPLATE = """---
+license: apache-2.0
+tags:
+- text-generation
+---
+# Model Card for {name}
+
+{name} is a transformer decoder language model. See the
+[paper](https://arxiv.org/abs/2401.00001) and the code at
+https://github.com/{model_id}.
+
+## Training data
+
+Trained on a mixture of public web data; see the dataset card for details.
+
+## Evaluation
+
+Benchmark results and performance are reported in the technical report.
+
+## License
+
+License: [Apache 2.0](https://www.apache.org/licenses/LICENSE-2.0)
+"""
+
+
+def payload_name(model_id: str) -> str:
+    """File name stem of a model's recorded payloads."""
+    return model_id.replace('/', '__')
+
+
+class PayloadStore:
+    """Payloads served by the mock server, recorded or generated."""
+
+    def __init__(
+        self,
+        payload_dir: Optional[str] = None,
+        listing_size: int = 1000,
+        card_kb: int = 8,
+        tree_files: int = 20
+    ):
+        """Initialize the store.
+
+        Args:
+            payload_dir: Directory of recorded payloads (see the module docstring);
+                models without recorded payloads get generated ones
+            listing_size: Number of models in a generated listing
+            card_kb: Approximate size of generated model cards in KB
+            tree_files: Number of weight shards in generated repository trees
+        """
+        self.payload_dir = Path(payload_dir) if payload_dir else None
+        self.card_kb = card_kb
+        self.tree_files = tree_files
+        self.listing = self._load_listing() or [self.listing_entry(i) for i in range(listing_size)]
+
+    def _load(self, kind: str, model_id: str, suffix: str) -> Optional[str]:
+        """Read a recorded payload, None if not recorded."""
+        if self.payload_dir is None:
+            return None
+        path = self.payload_dir / kind / f"{payload_name(model_id)}{suffix}"
+        return path.read_text(encoding='utf-8') if path.exists() else None
+
+    def _load_listing(self) -> Optional[List[Dict]]:
+        """Read the recorded listing, None if not recorded."""
+        if self.payload_dir is None or not (self.payload_dir / 'listing.json').exists():
+            return None
+        with open(self.payload_dir / 'listing.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def listing_entry(i: int) -> Dict:
+        """Generated listing entry of the i-th most downloaded model."""
+        return {
+            'id': f"org{i % 97}/model-{i}-{(i % 7) + 1}b",
+            'downloads': 10_000_000 // (i + 1),
+            'likes': 1000 // (i + 1),
+            'tags': ['transformers', 'safetensors', 'text-generation' if i % 3 else 'image-to-text'],
+            'lastModified': '2024-05-01T00:00:00.000Z',
+        }
+
+    def model_info(self, model_id: str) -> str:
+        """Body of /api/models/{id}."""
+        recorded = self._load('models', model_id, '.json')
+        if recorded is not None:
+            return recorded
+        return json.dumps({
+            'id': model_id,
+            'modelId': model_id,
+            'tags': ['transformers', 'safetensors', 'text-generation'],
+            'lastModified': '2024-05-01T00:00:00.000Z',
+            'cardData': {'license': 'apache-2.0'},
+        })
+
+    def readme(self, model_id: str) -> str:
+        """Body of /{id}/raw/main/README.md."""
+        recorded = self._load('readme', model_id, '.md')
+        if recorded is not None:
+            return recorded
+        card = CARD_TEMPLATE.format(model_id=model_id, name=model_id.split('/')[-1])
+        filler = "Additional details about intended use, limitations and bias.\n"
+        return card + filler * max(0, (self.card_kb * 1024 - len(card)) // len(filler))
+
+    def tree(self, model_id: str, path: str) -> List[Dict]:
+        """Entries of /api/models/{id}/tree/main[/{path}]."""
+        recorded = self._load('tree', model_id, '.json')
+        if recorded is not None:
+            entries = json.loads(recorded)
+            prefix = f"{path}/" if path else ''
+            return [e for e in entries if e['path'].startswith(prefix) and '/' not in e['path'][len(prefix):]]
+
+        if path == '':
+            entries = [
+                {'type': 'file', 'path': name, 'size': 1024}
+                for name in ('README.md', 'LICENSE', 'config.json', 'generation_config.json', 'tokenizer.json')
+            ]
+            entries.append({'type': 'directory', 'path': 'scripts', 'size': 0})
+            entries += [
+                {'type': 'file', 'path': f"model-{i + 1:05d}-of-{self.tree_files:05d}.safetensors",
+                 'size': 4 * 1024 ** 3, 'lfs': {'size': 4 * 1024 ** 3}}
+                for i in range(self.tree_files)
+            ]
+            return entries
+        if path == 'scripts':
+            return [{'type': 'file', 'path': f"scripts/{name}", 'size': 2048}
+                    for name in ('train.py', 'evaluate.py', 'inference.py')]
+        return []
+
+
+class MockHuggingFaceServer(ThreadingHTTPServer):
+    """Threaded HTTP server standing in for huggingface.co and github.com."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        store: PayloadStore,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0
+    ):
+        """Initialize the server.
+
+        Args:
+            store: Payloads to serve
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            latency: Seconds each response is delayed
+            error_rate: Fraction of requests answered with 500
+            throttle_rate: Fraction of requests answered with 429
+            retry_after: Retry-After seconds sent with 429 responses
+            seed: Seed of the error and throttle injection
+        """
+        super().__init__((host, port), MockRequestHandler)
+        self.store = store
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def endpoints(self) -> Dict[str, str]:
+        """Endpoint overrides that send a session's requests to this server."""
+        return {
+            'https://huggingface.co': self.url,
+            'https://github.com': f"{self.url}/github",
+        }
+
+    def start(self) -> 'MockHuggingFaceServer':
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name='mock-hf', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def inject(self, route: str) -> Optional[int]:
+        """Count a request and decide whether to fail it.
+
+        Args:
+            route: Route name for the request counters
+
+        Returns:
+            Status to answer with instead of the payload (429 or 500), or None
+        """
+        with self._lock:
+            self.counts[route] = self.counts.get(route, 0) + 1
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Routes the HuggingFace and GitHub endpoints used by the tools."""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without TCP_NODELAY, Nagle's
+    # algorithm and delayed ACKs would add tens of milliseconds per response
+    disable_nagle_algorithm = True
+    server: MockHuggingFaceServer
+
+    def log_message(self, format, *args) -> None:
+        pass  # Keep benchmark output clean
+
+    def do_HEAD(self) -> None:
+        self.handle_request(head=True)
+
+    def do_GET(self) -> None:
+        self.handle_request(head=False)
+
+    def handle_request(self, head: bool) -> None:
+        """Answer a request from the payload store."""
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path)
+        query = parse_qs(parsed.query)
+
+        route, status, body, headers = self.route(path, query)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        injected = self.server.inject(route)
+        if injected == 429:
+            status, body, headers = 429, 'Too Many Requests', {'Retry-After': f"{self.server.retry_after:g}"}
+        elif injected == 500:
+            status, body, headers = 500, 'Internal Server Error', {}
+
+        data = body.encode('utf-8')
+        self.send_response(status)
+        content_type = 'application/json' if path.startswith('/api/') else 'text/plain; charset=utf-8'
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+    def route(self, path: str, query: Dict[str, List[str]]) -> Tuple[str, int, str, Dict[str, str]]:
+        """Map a request to (route, status, body, headers)."""
+        store = self.server.store
+
+        if path.startswith('/github/'):
+            parts = path[len('/github/'):].strip('/').split('/')
+            model_ids = {m['id'].lower() for m in store.listing}
+            exists = len(parts) == 2 and '/'.join(parts).lower() in model_ids
+            return 'github', 200 if exists else 404, '', {}
+
+        if path == '/api/models':
+            return ('listing',) + self.listing_page(store.listing, query)
+
+        if path.startswith('/api/models/'):
+            rest = path[len('/api/models/'):]
+            if '/tree/main' in rest:
+                model_id, sub = rest.split('/tree/main', 1)
+                entries = store.tree(model_id, sub.strip('/'))
+                return ('tree',) + self.page(entries, query, TREE_PAGE_SIZE)
+            return 'model', 200, store.model_info(rest), {}
+
+        if path.endswith('/raw/main/README.md'):
+            model_id = path[1:-len('/raw/main/README.md')]
+            return 'readme', 200, store.readme(model_id), {}
+
+        return 'other', 404, 'Not Found', {}
+
+    def listing_page(self, listing: List[Dict], query: Dict[str, List[str]]) -> Tuple[int, str, Dict[str, str]]:
+        """One page of the downloads-sorted listing, filtered by tag if requested."""
+        model_filter = query.get('filter', [None])[0]
+        if model_filter:
+            listing = [m for m in listing if model_filter in m.get('tags', [])]
+        limit = int(query.get('limit', [LISTING_PAGE_SIZE])[0])
+        return self.page(listing, query, limit)
+
+    def page(self, entries: List[Dict], query: Dict[str, List[str]], size: int) -> Tuple[int, str, Dict[str, str]]:
+        """Slice entries by skip or cursor, with a Link: rel="next" header if more remain."""
+        start = int(query.get('cursor', query.get('skip', ['0']))[0])
+        headers = {}
+        if start + size < len(entries):
+            next_query = {k: v for k, v in query.items() if k not in ('skip', 'cursor')}
+            next_query['cursor'] = [str(start + size)]
+            url = f"https://huggingface.co{urlparse(self.path).path}?{urlencode(next_query, doseq=True)}"
+            headers['Link'] = f'<{url}>; rel="next"'
+        return 200, json.dumps(entries[start:start + size]), headers
+
+
+def record_payloads(model_ids: List[str], payload_dir: str, hf_token: Optional[str] = None) -> None:
+    """Fetch the payloads of models from HuggingFace into a payload directory.
+
+    Args:
+        model_ids: HuggingFace model IDs
+        payload_dir: Directory to write the payloads to
+        hf_token: Optional HuggingFace API token for gated models
+    """
+    root = Path(payload_dir)
+    for kind in ('models', 'readme', 'tree'):
+        (root / kind).mkdir(parents=True, exist_ok=True)
+
+    session = requests.Session()
+    if hf_token:
+        session.headers.update({'Authorization': f'Bearer {hf_token}'})
+
+    listing = []
+    for model_id in model_ids:
+        print(f"Recording {model_id}")
+        info = session.get(f"https://huggingface.co/api/models/{model_id}", timeout=30)
+        info.raise_for_status()
+        (root / 'models' / f"{payload_name(model_id)}.json").write_text(info.text, encoding='utf-8')
+        data = info.json()
+        listing.append({key: data.get(key) for key in ('id', 'downloads', 'likes', 'tags', 'lastModified')})
+
+        card = session.get(f"https://huggingface.co/{model_id}/raw/main/README.md", timeout=30)
+        if card.status_code == 200:
+            (root / 'readme' / f"{payload_name(model_id)}.md").write_text(card.text, encoding='utf-8')
+
+        entries = []
+        url = f"https://huggingface.co/api/models/{model_id}/tree/main?recursive=true"
+        while url:
+            tree = session.get(url, timeout=60)
+            if tree.status_code != 200:
+                break
+            entries += tree.json()
+            url = tree.links.get('next', {}).get('url')
+        if entries:
+            with open(root / 'tree' / f"{payload_name(model_id)}.json", 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+
+    listing.sort(key=lambda m: m.get('downloads') or 0, reverse=True)
+    with open(root / 'listing.json', 'w', encoding='utf-8') as f:
+        json.dump(listing, f, indent=1)
+    print(f"Recorded {len(model_ids)} models to {root}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Local stand-in for the HuggingFace and GitHub endpoints')
+    parser.add_argument('model_id', nargs='*', help='Models to record (with --record)')
+    parser.add_argument('--record', metavar='DIR', help='Record payloads of the given models into DIR and exit')
+    parser.add_argument('--hf-token', help='HuggingFace API token for recording gated models')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on (default: 8000)')
+    parser.add_argument('--payloads', help='Directory of recorded payloads to replay')
+    parser.add_argument('--listing-size', type=int, default=1000,
+                        help='Number of models in the generated listing (default: 1000)')
+    parser.add_argument('--card-kb', type=int, default=8, help='Size of generated model cards in KB (default: 8)')
+    parser.add_argument('--tree-files', type=int, default=20,
+                        help='Weight shards in generated repository trees (default: 20)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds each response is delayed (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with 500 (default: 0)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with 429 (default: 0)')
+    parser.add_argument('--retry-after', type=float, default=1.0,
+                        help='Retry-After seconds sent with 429 responses (default: 1)')
+    args = parser.parse_args()
+
+    if args.record:
+        if not args.model_id:
+            parser.error('--record requires at least one model ID')
+        record_payloads(args.model_id, args.record, args.hf_token)
+        return
+
+    store = PayloadStore(args.payloads, args.listing_size, args.card_kb, args.tree_files)
+    server = MockHuggingFaceServer(
+        store,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after
+    )
+    print(f"Serving {len(store.listing)} models on {server.url} (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
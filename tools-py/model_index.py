@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Model Openness Tool - Compiled Model Index
+
+Compiles the MOT models/*.yml files into a single compact binary index
+(models.idx) holding the few fields most tools need per model: file, name,
+origin, HuggingFace URL, license names and component names. The index is
+memory-mapped and decoded lazily, so loading it takes milliseconds instead of
+parsing hundreds of YAML documents.
+
+File layout (little-endian):
+    header        magic, version, model/string/list counts, source file count,
+                  source fingerprint (hash of every file's name, size and mtime)
+    string table  (string_count + 1) uint32 offsets into the string data
+    list table    list_count uint32 string ids (license and component names)
+    records       model_count fixed-size records of string ids and list spans
+    string data   UTF-8 bytes of every distinct string
+
+Usage:
+    python model_index.py [--models-dir MODELS_DIR] [--output OUTPUT]
+
+Example:
+    python model_index.py --models-dir ../models --output models.idx
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from mot_corpus import load_corpus
+
+MAGIC = b'MOTIDX\x00\x00'
+FORMAT_VERSION = 2
+
+# magic, version, model_count, string_count, list_count, source_count, source_digest
+HEADER = struct.Struct('<8sIIIII16s')
+# file, name, origin, huggingface, license_start, license_count, component_start, component_count
+RECORD = struct.Struct('<8I')
+UINT32 = struct.Struct('<I')
+
+
+class IndexedModel(NamedTuple):
+    """The indexed fields of one MOT model."""
+    file: str
+    name: str
+    origin: str
+    huggingface: str
+    licenses: Tuple[str, ...]
+    components: Tuple[str, ...]
+
+
+def _license_names(release: Dict) -> List[str]:
+    """Collect the distinct license names of a release and its components.
+
+    Args:
+        release: The 'release' section of a MOT model document
+
+    Returns:
+        License names in order of first appearance
+    """
+    names = []
+    licenses = release.get('license')
+    if isinstance(licenses, dict):
+        for entry in licenses.values():
+            if isinstance(entry, dict) and entry.get('name'):
+                names.append(str(entry['name']))
+    for component in release.get('components') or []:
+        if isinstance(component, dict) and component.get('license'):
+            names.append(str(component['license']))
+    return list(dict.fromkeys(names))
+
+
+def _source_fingerprint(yaml_files: List[Path]) -> Tuple[int, bytes]:
+    """Fingerprint the source files so stale indexes can be detected.
+
+    Every file counts with its name, size and modification time, so renamed,
+    swapped or replaced files (even with an older mtime, as after a git
+    checkout or cp -p) change the fingerprint.
+
+    Args:
+        yaml_files: MOT model YAML files
+
+    Returns:
+        Tuple of (file_count, 16-byte digest)
+    """
+    digest = hashlib.sha256()
+    for yaml_file in sorted(yaml_files, key=lambda f: f.name):
+        stat = yaml_file.stat()
+        digest.update(f"{yaml_file.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return len(yaml_files), digest.digest()[:16]
+
+
+def build_index(models_dir: str, output_path: str, corpus_cache: Optional[Path] = None) -> int:
+    """Compile the MOT models directory into an index file.
+
+    Args:
+        models_dir: Path to MOT models directory
+        output_path: Path of the index file to write
+        corpus_cache: Optional parsed corpus cache (see mot_corpus.load_corpus)
+
+    Returns:
+        Number of models in the index
+    """
+    yaml_files = list(Path(models_dir).glob('*.yml'))
+    documents, _ = load_corpus(yaml_files, cache_file=corpus_cache)
+
+    strings: Dict[str, int] = {}
+
+    def intern(value) -> int:
+        value = '' if value is None else str(value)
+        if value not in strings:
+            strings[value] = len(strings)
+        return strings[value]
+
+    intern('')
+    list_items: List[int] = []
+    records = []
+
+    for yaml_file in yaml_files:
+        data = documents.get(str(yaml_file))
+        if not isinstance(data, dict) or not isinstance(data.get('release'), dict):
+            continue
+        release = data['release']
+
+        licenses = [intern(name) for name in _license_names(release)]
+        components = [
+            intern(c.get('name')) for c in release.get('components') or []
+            if isinstance(c, dict) and c.get('name')
+        ]
+
+        license_start = len(list_items)
+        list_items.extend(licenses)
+        component_start = len(list_items)
+        list_items.extend(components)
+
+        records.append(RECORD.pack(
+            intern(yaml_file.name),
+            intern(release.get('name')),
+            intern(release.get('origin')),
+            intern(release.get('huggingface')),
+            license_start, len(licenses),
+            component_start, len(components),
+        ))
+
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    source_count, source_digest = _source_fingerprint(yaml_files)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(records), len(encoded), len(list_items),
+        source_count, source_digest
+    )
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(struct.pack(f'<{len(list_items)}I', *list_items))
+        f.write(b''.join(records))
+        f.write(b''.join(encoded))
+    os.replace(tmp_path, output_path)
+
+    return len(records)
+
+
+class ModelIndex:
+    """Read-only, memory-mapped view of a compiled model index."""
+
+    def __init__(self, path: str):
+        """Open an index file.
+
+        Args:
+            path: Path to the index file
+
+        Raises:
+            ValueError: If the file is not a model index of a supported version
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._data) < HEADER.size:
+            self._data.close()
+            raise ValueError(f"{path} is too short to be a model index")
+        (magic, version, self.model_count, self.string_count, self.list_count,
+         self.source_count, self.source_digest) = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._data.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} model index")
+
+        self._offsets_at = HEADER.size
+        self._lists_at = self._offsets_at + (self.string_count + 1) * UINT32.size
+        self._records_at = self._lists_at + self.list_count * UINT32.size
+        self._strings_at = self._records_at + self.model_count * RECORD.size
+        self._string_cache: Dict[int, str] = {}
+
+        # A truncated file (e.g. an interrupted copy) must not fail on first read
+        if (len(self._data) < self._strings_at
+                or len(self._data) < self._strings_at + UINT32.unpack_from(
+                    self._data, self._offsets_at + self.string_count * UINT32.size)[0]):
+            self._data.close()
+            raise ValueError(f"{path} is a truncated model index")
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._data.close()
+
+    def __enter__(self) -> 'ModelIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.model_count
+
+    def __iter__(self) -> Iterator[IndexedModel]:
+        for position in range(self.model_count):
+            yield self[position]
+
+    def __getitem__(self, position: int) -> IndexedModel:
+        """Decode one model record.
+
+        Args:
+            position: Record number, 0 <= position < len(index)
+
+        Returns:
+            IndexedModel for the record
+        """
+        if not 0 <= position < self.model_count:
+            raise IndexError(position)
+
+        (file, name, origin, huggingface, license_start, license_count,
+         component_start, component_count) = RECORD.unpack_from(
+            self._data, self._records_at + position * RECORD.size)
+
+        return IndexedModel(
+            file=self.string(file),
+            name=self.string(name),
+            origin=self.string(origin),
+            huggingface=self.string(huggingface),
+            licenses=self._list(license_start, license_count),
+            components=self._list(component_start, component_count),
+        )
+
+    def string(self, string_id: int) -> str:
+        """Decode a string from the string table.
+
+        Args:
+            string_id: Index into the string table
+
+        Returns:
+            The decoded string
+        """
+        value = self._string_cache.get(string_id)
+        if value is None:
+            start, end = struct.unpack_from('<2I', self._data, self._offsets_at + string_id * UINT32.size)
+            value = self._data[self._strings_at + start:self._strings_at + end].decode('utf-8')
+            self._string_cache[string_id] = value
+        return value
+
+    def _list(self, start: int, count: int) -> Tuple[str, ...]:
+        """Decode a span of the list table into strings."""
+        ids = struct.unpack_from(f'<{count}I', self._data, self._lists_at + start * UINT32.size)
+        return tuple(self.string(string_id) for string_id in ids)
+
+    def is_stale(self, models_dir: str) -> bool:
+        """Check whether the models directory changed since the index was built.
+
+        Args:
+            models_dir: Path to MOT models directory
+
+        Returns:
+            True if files were added, removed, renamed or modified
+        """
+        yaml_files = list(Path(models_dir).glob('*.yml'))
+        return _source_fingerprint(yaml_files) != (self.source_count, self.source_digest)
+
+
+def load_index(models_dir: str, index_path: str, corpus_cache: Optional[Path] = None) -> ModelIndex:
+    """Open a model index, (re)building it first if missing or stale.
+
+    Args:
+        models_dir: Path to MOT models directory
+        index_path: Path to the index file
+        corpus_cache: Optional parsed corpus cache used when rebuilding
+
+    Returns:
+        Up-to-date ModelIndex
+    """
+    if os.path.exists(index_path):
+        try:
+            index = ModelIndex(index_path)
+            if not index.is_stale(models_dir):
+                return index
+            index.close()
+        except ValueError:
+            pass
+
+    build_index(models_dir, index_path, corpus_cache=corpus_cache)
+    return ModelIndex(index_path)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Compile MOT model YAML files into a compact model index'
+    )
+    parser.add_argument(
+        '--models-dir',
+        default='../models',
+        help='Path to MOT models directory (default: ../models)'
+    )
+    parser.add_argument(
+        '--output',
+        default='models.idx',
+        help='Index file to write (default: models.idx)'
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.models_dir).exists():
+        print(f"Error: Models directory not found: {args.models_dir}")
+        sys.exit(1)
+
+    count = build_index(args.models_dir, args.output)
+    size = os.path.getsize(args.output)
+    print(f"Indexed {count} models into {args.output} ({size:,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
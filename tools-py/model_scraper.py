@@ -6,34 +6,60 @@ This script scrapes model information from HuggingFace and other sources
 to generate draft YAML files for the Model Openness Framework (MOF).
 
 Usage:
-    python model_scraper.py <model_id> [--output-dir OUTPUT_DIR]
+    python model_scraper.py <model_id> [<model_id> ...] [--output-dir OUTPUT_DIR]
+    python model_scraper.py --input-file MODELS_FILE [--workers N]
 
 Example:
     python model_scraper.py meta-llama/Llama-3-8B --output-dir ../models
+    python model_scraper.py --input-file models.txt --workers 8 --rate-limit 4
 """
 
 import argparse
+import codecs
+import itertools
 import json
 import os
 import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
-import yaml
+
+from card_analyzer import ModelCardAnalyzer
+from http_cache import ResponseCache, add_cache_arguments, cache_from_args
+from http_recorder import add_recorder_arguments, combine_recorders, finish_recording, recorder_from_args
+from http_session import RateLimitedSession
+from repo_probe import RepoProber
+from repo_tree import CONFIG_FILES, DEFAULT_TREE_DEPTH, LICENSE_FILES, WEIGHT_EXTENSIONS, RepoFeatures, RepoTreeWalker
+from scrape_journal import ScrapeJournal
+from scrape_metrics import add_metrics_arguments, finish_metrics, metrics_from_args
+from scrape_result import ScrapeResult
+from stage_profiler import SCRAPER_STAGES, add_profile_arguments, finish_profile, profiler_from_args
+
+# Byte caps for streamed downloads, so huge model cards and file trees cannot
+# blow up the memory of a worker
+DEFAULT_MAX_CARD_BYTES = 2 * 1024 * 1024
+DEFAULT_MAX_TREE_BYTES = 16 * 1024 * 1024
 
 
 class ModelScraper:
     """Scrapes model information from various sources."""
 
+    # iter_scrape_many probes the repositories of workers * PROBE_CHUNK_FACTOR
+    # models together
+    PROBE_CHUNK_FACTOR = 4
+
     # MOF Component names as defined in the framework
     MOF_COMPONENTS = {
         'code': [
             'Training code',
             'Inference code',
+            'Evaluation code',
             'Model architecture',
             'Supporting libraries and tools',
         ],
@@ -65,16 +91,40 @@ class ModelScraper:
         'bigscience-bloom-rail-1.0', 'creativeml-openrail-m'
     }
 
-    def __init__(self, hf_token: Optional[str] = None):
+    def __init__(
+        self,
+        hf_token: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        pool_size: int = 10,
+        cache: Optional[ResponseCache] = None,
+        max_card_bytes: Optional[int] = DEFAULT_MAX_CARD_BYTES,
+        max_tree_bytes: Optional[int] = DEFAULT_MAX_TREE_BYTES,
+        tree_depth: int = DEFAULT_TREE_DEPTH
+    ):
         """Initialize the scraper.
 
         Args:
             hf_token: Optional HuggingFace API token for accessing gated models
+            rate_limit: Maximum requests per second per host (None means unlimited
+                until a host throttles)
+            pool_size: Number of pooled connections per host, should cover the worker count
+            cache: Optional on-disk HTTP response cache shared across runs
+            max_card_bytes: Bytes of the model card read at most (None for no limit)
+            max_tree_bytes: Bytes of each repository file listing page read at
+                most (None for no limit)
+            tree_depth: Subdirectory levels of the repository listed below the
+                top level (0 for the top level only)
         """
         self.hf_token = hf_token
-        self.session = requests.Session()
+        self.max_card_bytes = max_card_bytes
+        self.max_tree_bytes = max_tree_bytes
+        self.session = RateLimitedSession(rate_limit=rate_limit, pool_size=pool_size, cache=cache)
         if hf_token:
             self.session.headers.update({'Authorization': f'Bearer {hf_token}'})
+        self.repo_prober = RepoProber(self.session, workers=max(8, pool_size))
+        self.tree_walker = RepoTreeWalker(self.session, max_depth=tree_depth, max_bytes=max_tree_bytes)
+        # Optional scrape_metrics.ScrapeMetrics counting scraped models and written drafts
+        self.metrics = None
 
     def normalize_model_input(self, model_input: str) -> str:
         """Normalize model input to extract model ID.
@@ -101,59 +151,127 @@ class ModelScraper:
         # Otherwise, assume it's already a model ID
         return model_input.strip()
 
-    def scrape_huggingface_model(self, model_id: str) -> Dict:
+    def scrape_huggingface_model(
+        self,
+        model_id: str,
+        fetch_card: bool = True,
+        fetch_tree: bool = True
+    ) -> Dict:
         """Scrape model information from HuggingFace.
 
+        The model info, model card and repository file list are fetched
+        concurrently, so the wall time is roughly that of the slowest request.
+        The result memoizes its metadata, components, license and repository
+        (see ScrapeResult), so they are detected once however often they are used.
+
         Args:
             model_id: HuggingFace model ID (e.g., 'meta-llama/Llama-3-8B')
+            fetch_card: Whether to download the model card (README.md)
+            fetch_tree: Whether to list the repository files
 
         Returns:
-            Dictionary containing scraped model information
+            ScrapeResult containing scraped model information, or {} on failure
         """
         print(f"Scraping HuggingFace model: {model_id}")
 
-        # Get model info from HuggingFace API
-        api_url = f"https://huggingface.co/api/models/{model_id}"
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            info_future = executor.submit(self._fetch_model_info, model_id)
+            card_future = executor.submit(self._fetch_model_card, model_id) if fetch_card else None
+            files_future = executor.submit(self._fetch_repo_features, model_id) if fetch_tree else None
 
-        try:
-            response = self.session.get(api_url, timeout=30)
-            response.raise_for_status()
-            model_info = response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching model info: {e}")
-            return {}
-
-        # Get model card content
-        card_url = f"https://huggingface.co/{model_id}/raw/main/README.md"
-        model_card_content = ""
-        try:
-            card_response = self.session.get(card_url, timeout=30)
-            if card_response.status_code == 200:
-                model_card_content = card_response.text
-        except requests.exceptions.RequestException:
-            pass
+            try:
+                model_info = info_future.result()
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching model info: {e}")
+                return {}
 
-        # Get repository files list
-        files_url = f"https://huggingface.co/api/models/{model_id}/tree/main"
-        repo_files = []
-        try:
-            files_response = self.session.get(files_url, timeout=30)
-            if files_response.status_code == 200:
-                repo_files = [f['path'] for f in files_response.json()]
-        except requests.exceptions.RequestException:
-            pass
+            model_card_content = card_future.result() if card_future else ""
+            repo_features = files_future.result() if files_future else None
 
         # Extract information
-        scraped_data = {
+        scraped_data = ScrapeResult(self, {
             'model_id': model_id,
             'model_info': model_info,
             'model_card': model_card_content,
-            'repo_files': repo_files,
+            'repo_files': repo_features.paths if repo_features else [],
+            'repo_feature_files': repo_features.feature_paths if repo_features else [],
             'confidence': {}
-        }
+        }, repo_features=repo_features or RepoFeatures())
 
         return scraped_data
 
+    def _fetch_model_info(self, model_id: str) -> Dict:
+        """Fetch model info from the HuggingFace API.
+
+        Args:
+            model_id: HuggingFace model ID
+
+        Returns:
+            Model info dictionary
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        api_url = f"https://huggingface.co/api/models/{model_id}"
+        response = self.session.get(api_url, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_model_card(self, model_id: str) -> str:
+        """Fetch the raw model card (README.md).
+
+        The card is streamed and cut off after max_card_bytes.
+
+        Args:
+            model_id: HuggingFace model ID
+
+        Returns:
+            Model card text, or an empty string if unavailable
+        """
+        card_url = f"https://huggingface.co/{model_id}/raw/main/README.md"
+        try:
+            with self.session.get(card_url, timeout=30, stream=True) as card_response:
+                if card_response.status_code == 200:
+                    decoder = codecs.getincrementaldecoder(card_response.encoding or 'utf-8')(errors='replace')
+                    chunks = self.session.iter_capped(card_response, self.max_card_bytes)
+                    text = ''.join(decoder.decode(chunk) for chunk in chunks)
+                    if card_response.truncated:
+                        print(f"Model card of {model_id} truncated at {self.max_card_bytes} bytes")
+                    else:
+                        text += decoder.decode(b'', final=True)
+                    return text
+        except requests.exceptions.RequestException:
+            pass
+        return ""
+
+    def _fetch_repo_features(self, model_id: str) -> Optional[RepoFeatures]:
+        """List the repository files, including subdirectories, and index them.
+
+        Args:
+            model_id: HuggingFace model ID
+
+        Returns:
+            RepoFeatures of the repository, or None if unavailable
+        """
+        features = self.tree_walker.walk(model_id)
+        if features is not None and features.truncated:
+            print(f"File listing of {model_id} truncated after {features.files} files")
+        return features
+
+    def repo_features(self, scraped_data: Dict) -> RepoFeatures:
+        """Get the file feature index of the repository.
+
+        Scraped data without an index (e.g. built by hand from a file list)
+        gets one built from its repo_files, memoized for a ScrapeResult.
+
+        Args:
+            scraped_data: Dictionary containing scraped model information
+
+        Returns:
+            RepoFeatures of the repository
+        """
+        return self.as_result(scraped_data).repo_features
+
     def detect_components(self, scraped_data: Dict) -> List[Dict]:
         """Detect which MOF components are available.
 
@@ -165,8 +283,8 @@ class ModelScraper:
             Note: license field is omitted unless a component-specific license is detected
         """
         components = []
-        repo_files = scraped_data.get('repo_files', [])
-        model_card = scraped_data.get('model_card', '').lower()
+        files = self.repo_features(scraped_data)
+        card = self.analyze_card(scraped_data)
         model_info = scraped_data.get('model_info', {})
 
         # Note: Components inherit the global license by default
@@ -175,7 +293,7 @@ class ModelScraper:
         # so we omit the license field to allow inheritance from global license
 
         # Detect Model parameters (Final)
-        if any(f.endswith(('.bin', '.safetensors', '.pt', '.pth', '.ckpt')) for f in repo_files):
+        if files.has_extension(*WEIGHT_EXTENSIONS):
             components.append({
                 'name': 'Model parameters (Final)',
                 'description': 'Trained model parameters, weights and biases',
@@ -184,7 +302,7 @@ class ModelScraper:
             })
 
         # Detect Model metadata
-        if any(f in repo_files for f in ['config.json', 'model_config.json', 'configuration.json']):
+        if files.has_name(*CONFIG_FILES):
             components.append({
                 'name': 'Model metadata',
                 'description': 'Any model metadata including training configuration and optimizer states',
@@ -193,7 +311,7 @@ class ModelScraper:
             })
 
         # Detect Model architecture
-        if any(f.endswith('.py') for f in repo_files) or 'modeling' in ' '.join(repo_files):
+        if files.has_extension('.py') or files.has_keyword('modeling'):
             components.append({
                 'name': 'Model architecture',
                 'description': "Well commented code for the model's architecture",
@@ -202,7 +320,7 @@ class ModelScraper:
             })
 
         # Detect Inference code
-        if any('inference' in f.lower() or 'generate' in f.lower() for f in repo_files):
+        if files.has_keyword('inference', 'generate'):
             components.append({
                 'name': 'Inference code',
                 'description': 'Code used for running the model to make predictions',
@@ -210,8 +328,26 @@ class ModelScraper:
                 'location': 'HuggingFace repository'
             })
 
+        # Detect Training code (training scripts or code in training directories)
+        if files.has_code('training'):
+            components.append({
+                'name': 'Training code',
+                'description': 'Code used for training the model',
+                'confidence': 0.70,
+                'location': 'HuggingFace repository'
+            })
+
+        # Detect Evaluation code (evaluation scripts or code in evaluation directories)
+        if files.has_code('evaluation'):
+            components.append({
+                'name': 'Evaluation code',
+                'description': 'Code used for evaluating the model',
+                'confidence': 0.65,
+                'location': 'HuggingFace repository'
+            })
+
         # Detect Model card
-        if 'README.md' in repo_files or model_card:
+        if files.root_file('README.md') or card:
             components.append({
                 'name': 'Model card',
                 'description': 'Model details including performance metrics, intended use, and limitations',
@@ -220,7 +356,7 @@ class ModelScraper:
             })
 
         # Detect Technical report (check model card for links)
-        if any(keyword in model_card for keyword in ['technical report', 'tech report', 'documentation']):
+        if card.has('technical_report'):
             components.append({
                 'name': 'Technical report',
                 'description': 'Technical report detailing capabilities and usage instructions for the model',
@@ -229,7 +365,7 @@ class ModelScraper:
             })
 
         # Detect Research paper
-        if any(keyword in model_card for keyword in ['paper', 'arxiv', 'publication']):
+        if card.has('paper'):
             components.append({
                 'name': 'Research paper',
                 'description': 'Research paper detailing the development and capabilities of the model',
@@ -238,7 +374,7 @@ class ModelScraper:
             })
 
         # Detect Evaluation results
-        if any(keyword in model_card for keyword in ['evaluation', 'benchmark', 'performance', 'results']):
+        if card.has('evaluation'):
             components.append({
                 'name': 'Evaluation results',
                 'description': 'The results from evaluating the model',
@@ -247,7 +383,7 @@ class ModelScraper:
             })
 
         # Detect Training dataset (check for dataset references)
-        if any(keyword in model_card for keyword in ['training data', 'trained on', 'dataset']):
+        if card.has('training_data'):
             components.append({
                 'name': 'Training dataset',
                 'description': 'The dataset used to train the model',
@@ -270,7 +406,7 @@ class ModelScraper:
         """
         model_info = scraped_data.get('model_info', {})
         model_id = scraped_data.get('model_id', '')
-        model_card = scraped_data.get('model_card', '')
+        card = self.analyze_card(scraped_data)
         license_url = None
 
         # Check for license in model info
@@ -280,9 +416,7 @@ class ModelScraper:
                 # First, try to find license URL in model card
                 # Look for markdown links with "license" in the text or nearby
                 # Pattern matches: [text](url) where text or surrounding context mentions license
-                license_link_pattern = r'\[([^\]]+)\]\(([^)]+)\)'
-                matches = re.findall(license_link_pattern, model_card)
-                for link_text, url in matches:
+                for link_text, url in card.links:
                     # Check if this is a license link by examining the link text or URL
                     if ('license' in link_text.lower() or
                         'license' in url.lower() or
@@ -292,28 +426,22 @@ class ModelScraper:
 
                 # If still not found, look for lines containing "License:" followed by a link
                 if not license_url:
-                    license_line_pattern = r'[*\-\s]*\*?\*?[Ll]icense\*?\*?:\s*\[([^\]]+)\]\(([^)]+)\)'
-                    match = re.search(license_line_pattern, model_card)
-                    if match:
-                        license_url = match.group(2)
+                    license_url = card.license_line_url
 
                 # If no URL found in model card, check if LICENSE file exists in repo
                 if not license_url:
-                    repo_files = scraped_data.get('repo_files', [])
-                    for filename in repo_files:
-                        if filename.upper() in ['LICENSE', 'LICENSE.MD', 'LICENSE.TXT']:
-                            license_url = f"https://huggingface.co/{model_id}/blob/main/{filename}"
-                            break
+                    filename = self.repo_features(scraped_data).root_file(*LICENSE_FILES)
+                    if filename:
+                        license_url = f"https://huggingface.co/{model_id}/blob/main/{filename}"
 
                 return license_name, license_url
 
         # Check for LICENSE file in repo
-        repo_files = scraped_data.get('repo_files', [])
-        for filename in repo_files:
-            if filename.upper() in ['LICENSE', 'LICENSE.MD', 'LICENSE.TXT']:
-                license_url = f"https://huggingface.co/{model_id}/blob/main/{filename}"
-                # Return unlicensed with URL - needs manual review to determine actual license
-                return 'unlicensed', license_url
+        filename = self.repo_features(scraped_data).root_file(*LICENSE_FILES)
+        if filename:
+            license_url = f"https://huggingface.co/{model_id}/blob/main/{filename}"
+            # Return unlicensed with URL - needs manual review to determine actual license
+            return 'unlicensed', license_url
 
         return 'unlicensed', None
 
@@ -327,11 +455,9 @@ class ModelScraper:
             Tuple of (repository_url, confidence_score)
         """
         model_id = scraped_data.get('model_id', '')
-        model_card = scraped_data.get('model_card', '')
 
         # Method 1: Parse model card for GitHub links
-        github_pattern = r'https://github\.com/[^/\s"<>]+/[^/\s"<>]+'
-        github_urls = re.findall(github_pattern, model_card)
+        github_urls = self.analyze_card(scraped_data).github_urls
 
         if github_urls:
             # Filter for most relevant (matching model name)
@@ -344,10 +470,53 @@ class ModelScraper:
             # Return first GitHub URL found
             return github_urls[0].rstrip(')'), 0.70
 
+        # Methods 2 and 3: Try pattern-based inference and name variations
+        for inferred_repo, confidence in self._repository_candidates(model_id):
+            if self._check_repo_exists(inferred_repo):
+                return inferred_repo, confidence
+
+        return '', 0.0
+
+    def as_result(self, scraped_data: Dict) -> ScrapeResult:
+        """Wrap scraped data in a ScrapeResult, unless it already is one.
+
+        Args:
+            scraped_data: Dictionary containing scraped model information
+
+        Returns:
+            ScrapeResult for the data (the data itself if already a ScrapeResult)
+        """
+        if isinstance(scraped_data, ScrapeResult):
+            return scraped_data
+        return ScrapeResult(self, scraped_data)
+
+    def analyze_card(self, scraped_data: Dict) -> ModelCardAnalyzer:
+        """Analyze the model card once for all detectors.
+
+        The analysis of a ScrapeResult is memoized (see
+        ScrapeResult.card_analysis), so component, license, repository and
+        metadata detection share the lowercased card and the keyword and
+        pattern matches.
+
+        Args:
+            scraped_data: Dictionary containing scraped model information
+
+        Returns:
+            ModelCardAnalyzer for the model card
+        """
+        return self.as_result(scraped_data).card_analysis
+
+    def _repository_candidates(self, model_id: str) -> List[Tuple[str, float]]:
+        """List inferred GitHub repository URLs to probe, in priority order.
+
+        Args:
+            model_id: HuggingFace model ID
+
+        Returns:
+            List of (repository_url, confidence_score) tuples
+        """
         # Method 2: Try pattern-based inference
-        inferred_repo = f"https://github.com/{model_id}"
-        if self._check_repo_exists(inferred_repo):
-            return inferred_repo, 0.65
+        candidates = [(f"https://github.com/{model_id}", 0.65)]
 
         # Method 3: Try organization/model-base-name
         if '/' in model_id:
@@ -359,11 +528,9 @@ class ModelScraper:
                 name,
             ]
             for base_name in base_names:
-                inferred_repo = f"https://github.com/{org}/{base_name}"
-                if self._check_repo_exists(inferred_repo):
-                    return inferred_repo, 0.60
+                candidates.append((f"https://github.com/{org}/{base_name}", 0.60))
 
-        return '', 0.0
+        return candidates
 
     def _check_repo_exists(self, repo_url: str) -> bool:
         """Check if GitHub repo exists.
@@ -374,11 +541,34 @@ class ModelScraper:
         Returns:
             True if repo exists, False otherwise
         """
-        try:
-            response = self.session.head(repo_url, timeout=5, allow_redirects=True)
-            return response.status_code == 200
-        except:
-            return False
+        # Results of probe_repositories are reused, not counted as memo hits again
+        known = self.repo_prober.cached(repo_url)
+        if known is not None:
+            return known
+        return self.repo_prober.exists(repo_url)
+
+    def probe_repositories(self, scraped_batch: List[Dict]) -> None:
+        """Probe the inferred GitHub repositories of a batch of models.
+
+        The candidates of every model are probed together, one priority level
+        at a time (see RepoProber.probe_batch), so _detect_repository can
+        answer from the prober's memo instead of waiting on each probe in turn,
+        without probing candidates below a model's first existing one.
+
+        Args:
+            scraped_batch: Dictionaries containing scraped model information
+        """
+        candidate_lists = []
+        for scraped_data in scraped_batch:
+            # Repositories linked from the model card take precedence, no probing needed
+            if self.analyze_card(scraped_data).github_urls:
+                continue
+            # 'org/Mistral' and 'org/mistral' are the same repository, probe it once
+            urls = {}
+            for url, _ in self._repository_candidates(scraped_data.get('model_id', '')):
+                urls.setdefault(self.repo_prober.key(url), url)
+            candidate_lists.append(list(urls.values()))
+        self.repo_prober.probe_batch(candidate_lists)
 
     def _extract_model_name_from_card(self, scraped_data: Dict) -> Optional[str]:
         """Extract model name from model card metadata.
@@ -402,29 +592,19 @@ class ModelScraper:
                 return card_data['title']
 
         # Try to extract from model card YAML frontmatter
-        model_card = scraped_data.get('model_card', '')
-        if model_card:
+        card = self.analyze_card(scraped_data)
+        if card:
             # Look for YAML frontmatter (between --- markers)
-            yaml_match = re.search(r'^---\s*\n(.*?)\n---', model_card, re.DOTALL | re.MULTILINE)
-            if yaml_match:
-                try:
-                    frontmatter = yaml.safe_load(yaml_match.group(1))
-                    if isinstance(frontmatter, dict):
-                        if 'model_name' in frontmatter:
-                            return frontmatter['model_name']
-                        if 'title' in frontmatter:
-                            return frontmatter['title']
-                except:
-                    pass
-
-            # Try to extract from first heading
-            heading_match = re.search(r'^#\s+(.+)$', model_card, re.MULTILINE)
-            if heading_match:
-                heading = heading_match.group(1).strip()
-                # Clean up common prefixes
-                heading = re.sub(r'^(Model Card for|Model:|Model\s+)', '', heading, flags=re.IGNORECASE).strip()
-                if heading and len(heading) < 100:  # Reasonable length for a model name
-                    return heading
+            frontmatter = card.frontmatter
+            if 'model_name' in frontmatter:
+                return frontmatter['model_name']
+            if 'title' in frontmatter:
+                return frontmatter['title']
+
+            # Try to extract from first heading, with common prefixes removed
+            heading = card.heading
+            if heading and len(heading) < 100:  # Reasonable length for a model name
+                return heading
 
         return None
 
@@ -471,15 +651,15 @@ class ModelScraper:
 
         # Detect architecture
         architecture = ''
-        model_card = scraped_data.get('model_card', '').lower()
-        if 'transformer' in model_card or 'transformer' in str(tags).lower():
-            if 'decoder' in model_card:
+        card = self.analyze_card(scraped_data)
+        if card.has('transformer') or 'transformer' in str(tags).lower():
+            if card.has('decoder'):
                 architecture = 'transformer decoder'
-            elif 'encoder' in model_card:
+            elif card.has('encoder'):
                 architecture = 'transformer encoder-decoder'
             else:
                 architecture = 'transformer'
-        elif 'diffusion' in model_card or 'diffusion' in str(tags).lower():
+        elif card.has('diffusion') or 'diffusion' in str(tags).lower():
             architecture = 'diffusion'
 
         # Extract version (often in model name)
@@ -493,11 +673,12 @@ class ModelScraper:
         else:
             date = datetime.now().strftime('%Y-%m-%d')
 
-        # Detect repository
-        repository, repo_confidence = self._detect_repository(scraped_data)
+        # Detect repository and global license (memoized for other consumers)
+        result = self.as_result(scraped_data)
+        repository, repo_confidence = result.repository
 
         # Detect global license and license URL
-        global_license, license_url = self._detect_license(scraped_data)
+        global_license, license_url = result.license
 
         metadata = {
             'name': model_name,
@@ -604,11 +785,10 @@ class ModelScraper:
         Returns:
             YAML string
         """
-        # Extract metadata
-        metadata = self._extract_model_metadata(scraped_data)
-
-        # Detect components
-        components = self.detect_components(scraped_data)
+        # Extract metadata and detect components, reusing earlier results
+        result = self.as_result(scraped_data)
+        metadata = result.metadata
+        components = result.components
 
         # Format in MOT style
         yaml_output = self._format_yaml_mot_style(metadata, components)
@@ -618,9 +798,409 @@ class ModelScraper:
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(yaml_output)
             print(f"YAML saved to: {output_path}")
+            if self.metrics is not None:
+                self.metrics.draft_written(components, yaml_output)
 
         return yaml_output
 
+    def write_draft(self, scraped_data: Dict, output_dir: str) -> str:
+        """Write the draft YAML file for scraped data, named after the model.
+
+        Args:
+            scraped_data: Dictionary containing scraped model information
+            output_dir: Directory to write the YAML file to
+
+        Returns:
+            Path of the written YAML file
+        """
+        model_id = scraped_data.get('model_id', '')
+        result = self.as_result(scraped_data)
+
+        # Extract metadata to get the proper model name
+        model_name = result.metadata.get('name', model_id.split('/')[-1])
+
+        output_path = Path(output_dir) / f"{model_name}.yml"
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.generate_yaml(result, str(output_path))
+
+        return str(output_path)
+
+    def scrape_to_file(self, model_id: str, output_dir: str) -> Dict:
+        """Scrape a single model and write its draft YAML file.
+
+        Args:
+            model_id: HuggingFace model ID or URL
+            output_dir: Directory to write the YAML file to
+
+        Returns:
+            Result dictionary with model_id, status ('success' or 'failed'),
+            output path, error message and elapsed seconds
+        """
+        result, scraped_data = self._scrape_step(model_id)
+        if scraped_data is not None:
+            self.probe_repositories([scraped_data])
+        return self._draft_step(result, scraped_data, output_dir)
+
+    def _scrape_step(self, model_id: str) -> Tuple[Dict, Optional[Dict]]:
+        """Scrape a model's HuggingFace data, the first step of scrape_to_file.
+
+        Args:
+            model_id: HuggingFace model ID or URL
+
+        Returns:
+            Tuple of (result dictionary, scraped data or None on failure)
+        """
+        start = time.monotonic()
+        model_id = self.normalize_model_input(model_id)
+        result = {'model_id': model_id, 'status': 'failed', 'output': None, 'error': None}
+        scraped_data = None
+
+        try:
+            scraped_data = self.scrape_huggingface_model(model_id) or None
+            if scraped_data is None:
+                result['error'] = 'Failed to scrape model data'
+        except Exception as e:
+            result['error'] = str(e)
+
+        result['elapsed'] = time.monotonic() - start
+        return result, scraped_data
+
+    def _draft_step(self, result: Dict, scraped_data: Optional[Dict], output_dir: str) -> Dict:
+        """Write the draft of a scraped model, the last step of scrape_to_file.
+
+        Args:
+            result: Result dictionary from _scrape_step
+            scraped_data: Scraped data from _scrape_step (None if it failed)
+            output_dir: Directory to write the YAML file to
+
+        Returns:
+            The completed result dictionary
+        """
+        start = time.monotonic()
+        if scraped_data is not None:
+            try:
+                result['output'] = self.write_draft(scraped_data, output_dir)
+                result['status'] = 'success'
+            except Exception as e:
+                result['error'] = str(e)
+
+        result['elapsed'] += time.monotonic() - start
+        if self.metrics is not None:
+            self.metrics.model_scraped(result)
+        return result
+
+    def iter_scrape_many(
+        self,
+        model_ids: Iterable[str],
+        output_dir: str,
+        workers: int = 4
+    ) -> Iterator[Dict]:
+        """Scrape many models on a bounded worker pool sharing this scraper's session.
+
+        Models are handled in chunks: the chunk is scraped concurrently, the
+        GitHub repositories of all its models are probed together (see
+        probe_repositories), then the drafts are written concurrently.
+
+        Args:
+            model_ids: HuggingFace model IDs or URLs
+            output_dir: Directory to write the YAML files to
+            workers: Maximum number of models scraped concurrently
+
+        Yields:
+            Result dictionaries (see scrape_to_file) in completion order within
+            each chunk; 'elapsed' excludes the time spent waiting on the chunk
+        """
+        workers = max(1, workers)
+        model_ids = iter(model_ids)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                chunk = list(itertools.islice(model_ids, workers * self.PROBE_CHUNK_FACTOR))
+                if not chunk:
+                    return
+                yield from self.iter_scrape_chunk(chunk, output_dir, executor)
+
+    def iter_scrape_chunk(
+        self,
+        chunk: List[str],
+        output_dir: str,
+        executor: ThreadPoolExecutor
+    ) -> Iterator[Dict]:
+        """Scrape one chunk of models, probing their repositories together.
+
+        The models are scraped concurrently, the GitHub repositories of all of
+        them are probed in one batch (see probe_repositories), then the drafts
+        are written concurrently.
+
+        Args:
+            chunk: HuggingFace model IDs or URLs
+            output_dir: Directory to write the YAML files to
+            executor: Worker pool the models are scraped on
+
+        Yields:
+            Result dictionaries (see scrape_to_file) in completion order
+        """
+        scraped = list(executor.map(self._scrape_step, chunk))
+        self.probe_repositories([data for _, data in scraped if data is not None])
+        futures = [
+            executor.submit(self._draft_step, result, data, output_dir)
+            for result, data in scraped
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def scrape_many(
+        self,
+        model_ids: Iterable[str],
+        output_dir: str,
+        workers: int = 4
+    ) -> List[Dict]:
+        """Scrape many models concurrently and collect the per-model results.
+
+        Args:
+            model_ids: HuggingFace model IDs or URLs
+            output_dir: Directory to write the YAML files to
+            workers: Maximum number of models scraped concurrently
+
+        Returns:
+            List of result dictionaries (see scrape_to_file) in completion order
+        """
+        return list(self.iter_scrape_many(model_ids, output_dir, workers))
+
+
+def read_model_ids(values: List[str], input_file: Optional[str] = None) -> List[str]:
+    """Collect model IDs from command-line values and an optional file.
+
+    Blank lines and lines starting with '#' are ignored in the file, and
+    duplicates are dropped while keeping the first occurrence order.
+
+    Args:
+        values: Model IDs or URLs given on the command line
+        input_file: Path to a file with one model ID per line, or '-' for stdin
+
+    Returns:
+        List of model IDs or URLs
+    """
+    model_ids = list(values)
+
+    if input_file:
+        if input_file == '-':
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(input_file, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                model_ids.append(line)
+
+    seen = set()
+    unique_ids = []
+    for model_id in model_ids:
+        if model_id not in seen:
+            seen.add(model_id)
+            unique_ids.append(model_id)
+    return unique_ids
+
+
+def print_result(prefix: str, result: Dict) -> None:
+    """Print the one-line outcome of a scrape attempt.
+
+    Args:
+        prefix: Progress prefix, e.g. '[3/20]'
+        result: Result dictionary (see ModelScraper.scrape_to_file)
+    """
+    if result['status'] == 'success':
+        print(f"{prefix} ✓ {result['model_id']} -> {result['output']} ({result['elapsed']:.1f}s)")
+    else:
+        print(f"{prefix} ✗ {result['model_id']}: {result['error']} ({result['elapsed']:.1f}s)")
+
+
+def retry_failed(
+    scraper: ModelScraper,
+    failed: List[Dict],
+    output_dir: str,
+    workers: int,
+    journal: Optional[ScrapeJournal] = None,
+    retries: int = 0,
+    retry_backoff: float = 5.0
+) -> List[Dict]:
+    """Retry failed models with exponential backoff, printing each attempt.
+
+    Args:
+        scraper: Scraper whose session is shared by all workers
+        failed: Result dictionaries of the failed attempts
+        output_dir: Directory to write the YAML files to
+        workers: Maximum number of models scraped concurrently
+        journal: Optional checkpoint journal every attempt is appended to
+        retries: Number of times failed models are retried
+        retry_backoff: Delay in seconds before the first retry, doubled for
+            each further retry
+
+    Returns:
+        The latest result of each model in failed
+    """
+    latest = {result['model_id']: result for result in failed}
+    for attempt in range(1, retries + 1):
+        if not failed:
+            break
+        delay = retry_backoff * 2 ** (attempt - 1)
+        print(f"\nRetrying {len(failed)} failed models in {delay:.0f}s "
+              f"(retry {attempt}/{retries})\n")
+        time.sleep(delay)
+
+        model_ids = [result['model_id'] for result in failed]
+        failed = []
+        for done, result in enumerate(scraper.iter_scrape_many(model_ids, output_dir, workers), 1):
+            if journal is not None:
+                journal.record(result)
+            print_result(f"[{done}/{len(model_ids)}]", result)
+            latest[result['model_id']] = result
+            if result['status'] != 'success':
+                failed.append(result)
+
+    return list(latest.values())
+
+
+def run_batch(
+    scraper: ModelScraper,
+    model_ids: List[str],
+    output_dir: str,
+    workers: int,
+    journal: Optional[ScrapeJournal] = None,
+    retries: int = 0,
+    retry_backoff: float = 5.0
+) -> int:
+    """Scrape a batch of models and print per-model results and a summary.
+
+    Args:
+        scraper: Scraper whose session is shared by all workers
+        model_ids: HuggingFace model IDs or URLs
+        output_dir: Directory to write the YAML files to
+        workers: Maximum number of models scraped concurrently
+        journal: Optional checkpoint journal; models it records as done are
+            skipped and every attempt is appended to it
+        retries: Number of times failed models are retried
+        retry_backoff: Delay in seconds before the first retry, doubled for
+            each further retry
+
+    Returns:
+        Process exit code (0 if every model succeeded, 1 otherwise)
+    """
+    skipped = 0
+    if journal is not None:
+        pending = [m for m in model_ids if not journal.is_complete(scraper.normalize_model_input(m))]
+        skipped = len(model_ids) - len(pending)
+        model_ids = pending
+
+    print(f"\n{'='*60}")
+    print(f"Batch scraping {len(model_ids)} models ({workers} workers)")
+    if skipped:
+        print(f"Skipping {skipped} models already completed in {journal.path}")
+    print(f"{'='*60}\n")
+
+    failed = []
+    success_count = 0
+    for done, result in enumerate(scraper.iter_scrape_many(model_ids, output_dir, workers), 1):
+        if journal is not None:
+            journal.record(result)
+        print_result(f"[{done}/{len(model_ids)}]", result)
+        if result['status'] == 'success':
+            success_count += 1
+        else:
+            failed.append(result)
+
+    retried = retry_failed(scraper, failed, output_dir, workers, journal, retries, retry_backoff)
+    failed = [result for result in retried if result['status'] != 'success']
+    success_count += len(retried) - len(failed)
+
+    print(f"\n{'='*60}")
+    print("BATCH SUMMARY")
+    print(f"{'='*60}\n")
+    if skipped:
+        print(f"Skipped (already done): {skipped}")
+    print(f"Successful: {success_count}")
+    print(f"Failed: {len(failed)}")
+    if failed:
+        print("\nFailed models:")
+        for result in failed:
+            print(f"  - {result['model_id']}: {result['error']}")
+    print(f"\nHTTP: {scraper.session.stats.summary()}")
+    print(f"GitHub: {scraper.repo_prober.probes} repository probes, "
+          f"{scraper.repo_prober.memo_hits} checks answered from memo")
+    print("\n⚠️  IMPORTANT: Generated files are DRAFTS that require manual review!")
+
+    return 1 if failed else 0
+
+
+def run_single(scraper: ModelScraper, model_input: str, output_dir: str) -> int:
+    """Scrape one model, write its draft and print the next steps.
+
+    The result is counted in the scraper's metrics like a batch model.
+
+    Args:
+        scraper: Scraper to use
+        model_input: HuggingFace model ID or URL
+        output_dir: Directory to write the YAML file to
+
+    Returns:
+        Process exit code (0 on success, 1 otherwise)
+    """
+    # Normalize model input (handle URLs)
+    model_id = scraper.normalize_model_input(model_input)
+
+    # Scrape model data
+    print(f"\n{'='*60}")
+    print(f"Scraping model: {model_id}")
+    print(f"{'='*60}\n")
+
+    start = time.monotonic()
+    result = {'model_id': model_id, 'status': 'failed', 'output': None, 'error': None}
+    try:
+        scraped_data = scraper.scrape_huggingface_model(model_id)
+
+        if not scraped_data:
+            print("Failed to scrape model data")
+            result['error'] = 'Failed to scrape model data'
+            return 1
+
+        # Extract metadata to get the proper model name (memoized for generate_yaml)
+        model_name = scraped_data.metadata.get('name', model_id.split('/')[-1])
+
+        # Generate output filename using the extracted model name
+        output_path = Path(output_dir) / f"{model_name}.yml"
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Generate YAML
+        print(f"\n{'='*60}")
+        print("Generating YAML...")
+        print(f"{'='*60}\n")
+
+        scraper.generate_yaml(scraped_data, str(output_path))
+        result['output'] = str(output_path)
+        result['status'] = 'success'
+
+        print(f"\n{'='*60}")
+        print("DRAFT YAML GENERATED")
+        print(f"{'='*60}\n")
+        print("⚠️  IMPORTANT: This is a DRAFT that requires manual review!")
+        print("    - Verify all component availability")
+        print("    - Confirm license information")
+        print("    - Add missing components")
+        print("    - Update confidence scores")
+        print(f"\nOutput saved to: {output_path}")
+        print(f"\nNext steps:")
+        print(f"  1. Review and edit: {output_path}")
+        print(f"  2. Validate: php scripts/validate-model.php {output_path}")
+        print(f"  3. Submit PR to add to MOT database")
+        return 0
+    except Exception as e:
+        result['error'] = str(e)
+        raise
+    finally:
+        result['elapsed'] = time.monotonic() - start
+        if scraper.metrics is not None:
+            scraper.metrics.model_scraped(result)
+
 
 def main():
     """Main entry point for the scraper."""
@@ -629,7 +1209,46 @@ def main():
     )
     parser.add_argument(
         'model_id',
-        help='HuggingFace model ID or URL (e.g., meta-llama/Llama-3-8B or https://huggingface.co/meta-llama/Llama-3-8B)'
+        nargs='*',
+        help='HuggingFace model ID(s) or URL(s) (e.g., meta-llama/Llama-3-8B or https://huggingface.co/meta-llama/Llama-3-8B)'
+    )
+    parser.add_argument(
+        '--input-file',
+        help="File with one model ID or URL per line, or '-' to read from stdin"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Number of models scraped concurrently in batch mode (default: 4)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=['threads', 'async'],
+        default='threads',
+        help='Batch engine: thread pool or asyncio event loop (async requires aiohttp) (default: threads)'
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=2.0,
+        help='Maximum requests per second per host, 0 for no fixed limit (default: 2.0)'
+    )
+    parser.add_argument(
+        '--journal',
+        help='Checkpoint journal for batch mode; completed models are skipped when a batch is restarted'
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=2,
+        help='Number of times failed models are retried in batch mode (default: 2)'
+    )
+    parser.add_argument(
+        '--retry-backoff',
+        type=float,
+        default=5.0,
+        help='Seconds before the first retry, doubled for each further retry (default: 5)'
     )
     parser.add_argument(
         '--output-dir',
@@ -640,54 +1259,95 @@ def main():
         '--hf-token',
         help='HuggingFace API token for accessing gated models'
     )
+    parser.add_argument(
+        '--max-card-kb',
+        type=int,
+        default=DEFAULT_MAX_CARD_BYTES // 1024,
+        help=f'Maximum size of a model card read, in KB, 0 for no limit (default: {DEFAULT_MAX_CARD_BYTES // 1024})'
+    )
+    parser.add_argument(
+        '--max-tree-kb',
+        type=int,
+        default=DEFAULT_MAX_TREE_BYTES // 1024,
+        help=f'Maximum size of a repository file listing page read, in KB, 0 for no limit (default: {DEFAULT_MAX_TREE_BYTES // 1024})'
+    )
+    parser.add_argument(
+        '--tree-depth',
+        type=int,
+        default=DEFAULT_TREE_DEPTH,
+        help=f'Subdirectory levels of the repository listed below the top level, 0 for the top level only (default: {DEFAULT_TREE_DEPTH})'
+    )
 
-    args = parser.parse_args()
-
-    # Initialize scraper
-    scraper = ModelScraper(hf_token=args.hf_token)
-
-    # Normalize model input (handle URLs)
-    model_id = scraper.normalize_model_input(args.model_id)
-
-    # Scrape model data
-    print(f"\n{'='*60}")
-    print(f"Scraping model: {model_id}")
-    print(f"{'='*60}\n")
-
-    scraped_data = scraper.scrape_huggingface_model(model_id)
-
-    if not scraped_data:
-        print("Failed to scrape model data")
-        sys.exit(1)
-
-    # Extract metadata to get the proper model name
-    metadata = scraper._extract_model_metadata(scraped_data)
-    model_name = metadata.get('name', model_id.split('/')[-1])
+    add_cache_arguments(parser)
+    add_recorder_arguments(parser)
+    add_metrics_arguments(parser)
+    add_profile_arguments(parser, 'scrape_profile')
 
-    # Generate output filename using the extracted model name
-    output_path = Path(args.output_dir) / f"{model_name}.yml"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    args = parser.parse_args()
+    cache = cache_from_args(args)
+    recorder = recorder_from_args(args)
+    profiler = profiler_from_args(args, parser)
 
-    # Generate YAML
-    print(f"\n{'='*60}")
-    print("Generating YAML...")
-    print(f"{'='*60}\n")
+    model_ids = read_model_ids(args.model_id, args.input_file)
+    if not model_ids:
+        parser.error('at least one model ID or --input-file is required')
 
-    yaml_output = scraper.generate_yaml(scraped_data, str(output_path))
+    metrics = metrics_from_args(args, 'model_scraper')
+    max_card_bytes = args.max_card_kb * 1024 or None
+    max_tree_bytes = args.max_tree_kb * 1024 or None
 
-    print(f"\n{'='*60}")
-    print("DRAFT YAML GENERATED")
-    print(f"{'='*60}\n")
-    print("⚠️  IMPORTANT: This is a DRAFT that requires manual review!")
-    print("    - Verify all component availability")
-    print("    - Confirm license information")
-    print("    - Add missing components")
-    print("    - Update confidence scores")
-    print(f"\nOutput saved to: {output_path}")
-    print(f"\nNext steps:")
-    print(f"  1. Review and edit: {output_path}")
-    print(f"  2. Validate: php scripts/validate-model.php {output_path}")
-    print(f"  3. Submit PR to add to MOT database")
+    # Initialize scraper
+    if args.engine == 'async':
+        from async_scraper import AsyncModelScraper
+        scraper = AsyncModelScraper(
+            hf_token=args.hf_token,
+            concurrency=args.workers,
+            rate_limit=args.rate_limit,
+            cache=cache,
+            max_card_bytes=max_card_bytes,
+            max_tree_bytes=max_tree_bytes,
+            tree_depth=args.tree_depth
+        )
+    else:
+        scraper = ModelScraper(
+            hf_token=args.hf_token,
+            rate_limit=args.rate_limit,
+            pool_size=max(10, args.workers),
+            cache=cache,
+            max_card_bytes=max_card_bytes,
+            max_tree_bytes=max_tree_bytes,
+            tree_depth=args.tree_depth
+        )
+
+    scraper.metrics = metrics
+    scraper.session.recorder = combine_recorders(recorder, metrics)
+    if profiler is not None:
+        profiler.instrument(scraper, SCRAPER_STAGES)
+
+    try:
+        # Batch mode: many models on a shared session and worker pool
+        if len(model_ids) > 1 or args.input_file or args.journal:
+            journal = ScrapeJournal(args.journal) if args.journal else None
+            try:
+                status = run_batch(
+                    scraper,
+                    model_ids,
+                    args.output_dir,
+                    args.workers,
+                    journal=journal,
+                    retries=args.retries,
+                    retry_backoff=args.retry_backoff
+                )
+            finally:
+                if journal is not None:
+                    journal.close()
+        else:
+            status = run_single(scraper, model_ids[0], args.output_dir)
+    finally:
+        finish_recording(recorder, args.har)
+        finish_metrics(metrics)
+        finish_profile(profiler, args.profile)
+    sys.exit(status)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,159 @@
+"""
+Model Openness Tool - MOT Model Corpus Loader
+
+Loads the YAML files in the MOT models/ directory for the Python tools. Files
+are parsed with the libyaml C loader when PyYAML was built with it, changed
+files are parsed in a process pool when there are enough of them to pay for
+the pool, and parsed documents are kept in a cache keyed by file path, mtime
+and size so later runs only reparse files that changed.
+
+Example:
+    documents, errors = load_corpus(Path('../models').glob('*.yml'),
+                                    cache_file=DEFAULT_CORPUS_CACHE)
+"""
+
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML without libyaml
+    from yaml import SafeLoader
+
+from http_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_CORPUS_CACHE = DEFAULT_CACHE_DIR / 'models_corpus.pickle'
+
+# Bump when the cached document format changes
+CACHE_VERSION = 1
+
+# Below this many changed files a process pool costs more than it saves
+PARALLEL_THRESHOLD = 32
+
+
+def parse_model_file(path: str) -> Tuple[str, Any, Optional[str]]:
+    """Parse one MOT model YAML file.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Tuple of (path, document, error); document is None and error holds
+        the message if the file could not be read or parsed
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return path, yaml.load(f, Loader=SafeLoader), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def _read_cache(cache_file: Path) -> Dict[str, Tuple[int, int, Any]]:
+    """Read the parsed corpus cache, ignoring it if missing, stale or corrupt.
+
+    Args:
+        cache_file: Path to the cache file
+
+    Returns:
+        Dictionary mapping file path to (mtime_ns, size, document)
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('version') == CACHE_VERSION:
+            return data['entries']
+    except Exception:
+        pass
+    return {}
+
+
+def _write_cache(cache_file: Path, entries: Dict[str, Tuple[int, int, Any]]) -> None:
+    """Write the parsed corpus cache atomically.
+
+    Args:
+        cache_file: Path to the cache file
+        entries: Dictionary mapping file path to (mtime_ns, size, document)
+    """
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, 'wb') as f:
+        pickle.dump({'version': CACHE_VERSION, 'entries': entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
+
+
+def load_corpus(
+    paths: Iterable[Path],
+    cache_file: Optional[Path] = None,
+    workers: Optional[int] = None
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Load and parse MOT model YAML files, reusing cached parses of unchanged files.
+
+    Args:
+        paths: YAML files to load
+        cache_file: Optional parsed corpus cache (None disables caching)
+        workers: Size of the process pool for parsing changed files
+            (default: number of CPUs; 1 parses in this process)
+
+    Returns:
+        Tuple of (documents, errors): documents maps each path (as given, in
+        order) to its parsed document, errors maps paths that failed to parse
+        to the error message
+    """
+    paths = [str(p) for p in paths]
+    cached = _read_cache(cache_file) if cache_file else {}
+
+    # Keep cached files from other directories; files of the directories being
+    # loaded are re-added below, so deleted files drop out of the cache
+    directories = {os.path.dirname(os.path.abspath(path)) for path in paths}
+    entries = {key: entry for key, entry in cached.items() if os.path.dirname(key) not in directories}
+
+    documents: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    stats: Dict[str, Tuple[int, int]] = {}
+    changed = []
+
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            errors[path] = str(e)
+            continue
+        stats[path] = (st.st_mtime_ns, st.st_size)
+
+        key = os.path.abspath(path)
+        entry = cached.get(key)
+        if entry is not None and entry[:2] == stats[path]:
+            documents[path] = entry[2]
+            entries[key] = entry
+        else:
+            changed.append(path)
+
+    if changed:
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(changed) >= PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(parse_model_file, changed, chunksize=16))
+        else:
+            results = [parse_model_file(path) for path in changed]
+
+        for path, document, error in results:
+            if error is not None:
+                errors[path] = error
+                continue
+            documents[path] = document
+            entries[os.path.abspath(path)] = stats[path] + (document,)
+
+    if cache_file and (changed or entries.keys() != cached.keys()):
+        try:
+            _write_cache(cache_file, entries)
+        except OSError:
+            pass
+
+    # Keep the caller's file order
+    documents = {path: documents[path] for path in paths if path in documents}
+    return documents, errors
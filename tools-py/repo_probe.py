@@ -0,0 +1,165 @@
+"""
+Model Openness Tool - GitHub Repository Prober
+
+Checks whether inferred GitHub repositories exist for the model scraper.
+The candidates of a whole batch of models are probed together, one priority
+level at a time, so a model stops probing at its first existing repository
+while the probes of different models run concurrently. Probes shared by
+several models (e.g. from the same organization) are sent once, and results,
+negative ones included, are memoized for a TTL. GitHub repository names are
+case insensitive, so 'org/Mistral' and 'org/mistral' cost a single probe.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from http_cache import DEFAULT_TTLS
+
+
+class RepoProber:
+    """Memoizing, deduplicating GitHub repository existence checker."""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        ttl: float = DEFAULT_TTLS['github'],
+        workers: int = 8,
+        timeout: float = 5.0
+    ):
+        """Initialize the prober.
+
+        Args:
+            session: HTTP session used for the HEAD requests
+            ttl: Seconds a probe result is reused
+            workers: Maximum number of probes in flight from probe_batch
+            timeout: Timeout in seconds of each probe
+        """
+        self.session = session
+        self.ttl = ttl
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='repo-probe')
+        self._lock = threading.Lock()
+        # key -> (exists, expires_at)
+        self._memo: Dict[str, Tuple[bool, float]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self.probes = 0
+        self.memo_hits = 0
+
+    @staticmethod
+    def key(repo_url: str) -> str:
+        """Normalize a repository URL for deduplication."""
+        return repo_url.rstrip('/').lower()
+
+    def cached(self, repo_url: str, count_hit: bool = False) -> Optional[bool]:
+        """Look up a memoized probe result.
+
+        Args:
+            repo_url: GitHub repository URL
+            count_hit: Count a known result in memo_hits, i.e. as a probe saved
+
+        Returns:
+            True or False if known and not expired, None otherwise
+        """
+        with self._lock:
+            entry = self._memo.get(self.key(repo_url))
+            if entry is None or entry[1] < time.monotonic():
+                return None
+            if count_hit:
+                self.memo_hits += 1
+            return entry[0]
+
+    def record(self, repo_url: str, exists: bool) -> None:
+        """Memoize the result of a probe sent for a repository.
+
+        Args:
+            repo_url: GitHub repository URL
+            exists: Whether the repository exists
+        """
+        with self._lock:
+            self._memo[self.key(repo_url)] = (exists, time.monotonic() + self.ttl)
+            self.probes += 1
+
+    def exists(self, repo_url: str) -> bool:
+        """Check if a GitHub repository exists, reusing memoized and in-flight probes.
+
+        Args:
+            repo_url: GitHub repository URL
+
+        Returns:
+            True if repo exists, False otherwise
+        """
+        known = self.cached(repo_url, count_hit=True)
+        if known is not None:
+            return known
+
+        key = self.key(repo_url)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            response = self.session.head(repo_url, timeout=self.timeout, allow_redirects=True)
+            exists = response.status_code == 200
+        except requests.exceptions.RequestException:
+            exists = False
+        except BaseException as e:
+            # Never leave threads waiting on this probe hanging
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        self.record(repo_url, exists)
+        with self._lock:
+            del self._inflight[key]
+        future.set_result(exists)
+        return exists
+
+    def probe_batch(self, candidate_lists: Iterable[List[str]]) -> List[Optional[str]]:
+        """Find the first existing repository of each of several candidate lists.
+
+        The lists are walked one priority level at a time: the candidates at
+        the current level of every list still searching are probed
+        concurrently (each distinct repository once), and a list stops at its
+        first existing candidate, so lower-priority candidates are only probed
+        when every higher one is missing.
+
+        Args:
+            candidate_lists: GitHub repository URLs per model, in priority order
+
+        Returns:
+            The first existing URL of each list, or None if none exists
+        """
+        candidate_lists = [list(candidates) for candidates in candidate_lists]
+        found: List[Optional[str]] = [None] * len(candidate_lists)
+        searching = list(range(len(candidate_lists)))
+        level = 0
+
+        while searching:
+            searching = [i for i in searching if level < len(candidate_lists[i])]
+            probes = {}
+            for i in searching:
+                url = candidate_lists[i][level]
+                if self.key(url) not in probes:
+                    probes[self.key(url)] = self._executor.submit(self.exists, url)
+
+            still_searching = []
+            for i in searching:
+                url = candidate_lists[i][level]
+                if probes[self.key(url)].result():
+                    found[i] = url
+                else:
+                    still_searching.append(i)
+            searching = still_searching
+            level += 1
+
+        return found
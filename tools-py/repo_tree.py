@@ -0,0 +1,364 @@
+"""
+Model Openness Tool - Repository Tree Walker
+
+Lists the files of a HuggingFace model repository for component detection.
+The /api/models/{id}/tree/main endpoint only returns one directory level, so
+weights, training scripts and evaluation code in subfolders used to go
+unnoticed. RepoTreeWalker follows the listing's pagination and descends into
+subdirectories concurrently, within a depth, directory and file budget.
+
+The walk keeps the listed paths and feeds a RepoFeatures index (file
+extension counts, well-known file names, path keyword hits and directory
+roles) that the detectors query in constant time. The default budget lists
+the top level and at most a few of its subdirectories, so a model costs a
+handful of listing requests.
+"""
+
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+
+from http_session import RateLimitedSession, iter_json_array
+
+WEIGHT_EXTENSIONS = ('.bin', '.safetensors', '.pt', '.pth', '.ckpt')
+CODE_EXTENSIONS = ('.py', '.sh', '.ipynb')
+CONFIG_FILES = ('config.json', 'model_config.json', 'configuration.json')
+LICENSE_FILES = ('LICENSE', 'LICENSE.MD', 'LICENSE.TXT')
+WELL_KNOWN_FILES = ('README.md',) + CONFIG_FILES
+
+# Default walk budget: one level below the top level, at most four directories
+DEFAULT_TREE_DEPTH = 1
+DEFAULT_MAX_DIRECTORIES = 4
+
+# Substrings looked up in lowercased paths
+PATH_KEYWORDS = ('modeling', 'inference', 'generate', 'train', 'finetun', 'eval', 'benchmark')
+
+# Role of a directory by its (lowercased) name
+DIRECTORY_ROLES = {
+    'train': 'training', 'training': 'training', 'finetune': 'training',
+    'finetuning': 'training', 'fine-tuning': 'training', 'pretrain': 'training',
+    'pretraining': 'training', 'sft': 'training',
+    'eval': 'evaluation', 'evals': 'evaluation', 'evaluation': 'evaluation',
+    'benchmark': 'evaluation', 'benchmarks': 'evaluation',
+    'inference': 'inference', 'serving': 'inference', 'deploy': 'inference',
+    'examples': 'examples', 'notebooks': 'examples', 'demo': 'examples',
+    'data': 'data', 'dataset': 'data', 'datasets': 'data',
+}
+
+# Role of a code file by the tokens of its own name (split on '_', '-' and
+# '.'); a trailing '*' matches any token starting with the keyword, so
+# train_lora.py is training code but load_pretrained.py is not
+CODE_NAME_ROLES = (
+    ('train*', 'training'),
+    ('pretrain', 'training'),
+    ('pretraining', 'training'),
+    ('finetun*', 'training'),
+    ('eval*', 'evaluation'),
+    ('benchmark*', 'evaluation'),
+)
+NAME_TOKEN_SEPARATORS = re.compile(r'[_\-.]')
+
+
+def code_name_role(name: str) -> Optional[str]:
+    """Look up the role of a code file by its name (see CODE_NAME_ROLES).
+
+    Args:
+        name: File name, without directories
+
+    Returns:
+        Role such as 'training' or 'evaluation', or None if no keyword matches
+    """
+    tokens = NAME_TOKEN_SEPARATORS.split(name.lower())
+    for keyword, role in CODE_NAME_ROLES:
+        if keyword.endswith('*'):
+            if any(token.startswith(keyword[:-1]) for token in tokens):
+                return role
+        elif keyword in tokens:
+            return role
+    return None
+
+
+def tree_url(model_id: str, path: str = '') -> str:
+    """Build the HuggingFace tree listing URL of a repository directory.
+
+    Args:
+        model_id: HuggingFace model ID
+        path: Directory path inside the repository ('' for the top level)
+
+    Returns:
+        Listing URL
+    """
+    url = f"https://huggingface.co/api/models/{model_id}/tree/main"
+    return f"{url}/{quote(path)}" if path else url
+
+
+class RepoFeatures:
+    """Index of the repository file features the component detectors use."""
+
+    def __init__(self):
+        self.files = 0
+        self.directories = 0
+        self.truncated = False
+        # Extension (lowercased, with dot) -> number of files
+        self.extensions: Dict[str, int] = {}
+        # Well-known file name -> first path with that name, at any depth
+        self.names: Dict[str, str] = {}
+        # Well-known files and license files in the top-level directory
+        self.root_files: List[str] = []
+        # PATH_KEYWORDS entry -> first path containing it
+        self.keywords: Dict[str, str] = {}
+        # Directory role -> directories with that role
+        self.roles: Dict[str, List[str]] = {}
+        # Directory role -> first code file belonging to it
+        self.code_roles: Dict[str, str] = {}
+        # Every listed path, files and directories, in listing order
+        self.paths: List[str] = []
+        # Paths worth showing or linking: well-known files, code and one
+        # weight file per extension, in listing order
+        self.feature_paths: List[str] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str]) -> 'RepoFeatures':
+        """Build the index from a flat list of file paths.
+
+        Args:
+            paths: Repository file paths
+
+        Returns:
+            RepoFeatures for the paths
+        """
+        features = cls()
+        for path in paths:
+            features.add(path)
+        return features
+
+    def add(self, path: str, is_directory: bool = False, role: Optional[str] = None) -> None:
+        """Add a listing entry to the index.
+
+        Args:
+            path: Path inside the repository
+            is_directory: Whether the entry is a directory
+            role: Role of the directory containing the entry, if any
+        """
+        lower = path.lower()
+        name = path.rsplit('/', 1)[-1]
+
+        with self._lock:
+            self.paths.append(path)
+            for keyword in PATH_KEYWORDS:
+                if keyword in lower and keyword not in self.keywords:
+                    self.keywords[keyword] = path
+
+            if is_directory:
+                self.directories += 1
+                dir_role = DIRECTORY_ROLES.get(name.lower())
+                if dir_role:
+                    self.roles.setdefault(dir_role, []).append(path)
+                return
+
+            self.files += 1
+            dot = name.rfind('.')
+            extension = name[dot:].lower() if dot > 0 else ''
+            seen_extension = extension in self.extensions
+            self.extensions[extension] = self.extensions.get(extension, 0) + 1
+
+            well_known = name in WELL_KNOWN_FILES or name.upper() in LICENSE_FILES
+            if well_known:
+                self.names.setdefault(name, path)
+                if '/' not in path:
+                    self.root_files.append(path)
+
+            is_code = extension in CODE_EXTENSIONS
+            if is_code:
+                code_role = code_name_role(name) or role
+                if code_role:
+                    self.code_roles.setdefault(code_role, path)
+
+            if (well_known or is_code or any(k in lower for k in ('modeling', 'inference', 'generate'))
+                    or (extension in WEIGHT_EXTENSIONS and not seen_extension)):
+                self.feature_paths.append(path)
+
+    def has_extension(self, *extensions: str) -> bool:
+        """Check whether any file has one of the extensions (e.g. '.py')."""
+        return any(extension in self.extensions for extension in extensions)
+
+    def has_name(self, *names: str) -> bool:
+        """Check whether a well-known file with one of the names exists at any depth."""
+        return any(name in self.names for name in names)
+
+    def has_keyword(self, *keywords: str) -> bool:
+        """Check whether any path contains one of the PATH_KEYWORDS."""
+        return any(keyword in self.keywords for keyword in keywords)
+
+    def has_code(self, role: str) -> bool:
+        """Check whether there is code for a role ('training', 'evaluation', ...)."""
+        return role in self.code_roles
+
+    def root_file(self, *names: str) -> Optional[str]:
+        """First top-level well-known file matching one of the names.
+
+        Args:
+            names: File names, compared case-insensitively
+
+        Returns:
+            Path of the file, or None
+        """
+        wanted = {name.upper() for name in names}
+        for path in self.root_files:
+            if path.upper() in wanted:
+                return path
+        return None
+
+
+class RepoTreeWalker:
+    """Walks HuggingFace repository trees concurrently within a budget."""
+
+    def __init__(
+        self,
+        session: RateLimitedSession,
+        max_depth: int = DEFAULT_TREE_DEPTH,
+        max_directories: int = DEFAULT_MAX_DIRECTORIES,
+        max_files: int = 20000,
+        workers: int = 4,
+        max_bytes: Optional[int] = None,
+        timeout: float = 30.0
+    ):
+        """Initialize the walker.
+
+        Args:
+            session: HTTP session used for the listing requests
+            max_depth: Directory levels descended below the top level (0 lists
+                only the top level)
+            max_directories: Subdirectories listed at most per repository
+            max_files: Files indexed at most per repository
+            workers: Directories listed concurrently
+            max_bytes: Bytes read at most per listing page (None for no limit)
+            timeout: Timeout in seconds of each listing request
+        """
+        self.session = session
+        self.max_depth = max_depth
+        self.max_directories = max_directories
+        self.max_files = max_files
+        self.workers = max(1, workers)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+
+    def walk(self, model_id: str) -> Optional[RepoFeatures]:
+        """List a repository and index its files.
+
+        Args:
+            model_id: HuggingFace model ID
+
+        Returns:
+            RepoFeatures of the repository, or None if the top level could not be listed
+        """
+        features = RepoFeatures()
+        try:
+            subdirs = self.list_directory(model_id, '', None, features)
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+
+        listed = 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='repo-tree') as executor:
+            pending = {}
+            queue = self.prioritize(subdirs, 1)
+            while queue or pending:
+                while queue and len(pending) < self.workers:
+                    if listed >= self.max_directories or features.files >= self.max_files:
+                        features.truncated = True
+                        queue = []
+                        break
+                    path, role, depth = queue.pop(0)
+                    listed += 1
+                    future = executor.submit(self.list_directory, model_id, path, role, features)
+                    pending[future] = depth
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    depth = pending.pop(future)
+                    try:
+                        queue += self.prioritize(future.result(), depth + 1)
+                    except (requests.exceptions.RequestException, ValueError):
+                        features.truncated = True
+        return features
+
+    def prioritize(self, subdirs: List[Tuple[str, Optional[str]]], depth: int) -> List[Tuple[str, Optional[str], int]]:
+        """Order subdirectories for listing, directories with a known role first.
+
+        Args:
+            subdirs: (path, role) tuples of directories found at depth - 1
+            depth: Depth of the subdirectories
+
+        Returns:
+            (path, role, depth) tuples, empty beyond max_depth
+        """
+        if depth > self.max_depth:
+            return []
+        return [(path, role, depth) for path, role in sorted(subdirs, key=lambda d: d[1] is None)]
+
+    def list_directory(
+        self,
+        model_id: str,
+        path: str,
+        role: Optional[str],
+        features: RepoFeatures
+    ) -> List[Tuple[str, Optional[str]]]:
+        """List one directory, following pagination, and index its entries.
+
+        Args:
+            model_id: HuggingFace model ID
+            path: Directory path ('' for the top level)
+            role: Role of the directory or of one of its parents, if any
+            features: Index to add the entries to
+
+        Returns:
+            (path, role) tuples of the subdirectories found
+
+        Raises:
+            requests.exceptions.RequestException: If a listing request fails
+            ValueError: If a listing is not valid JSON
+        """
+        subdirs = []
+        url = tree_url(model_id, path)
+        while url and features.files < self.max_files:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                url = response.links.get('next', {}).get('url')
+                entries = iter_json_array(self.session.iter_capped(response, self.max_bytes))
+                self.index_entries(entries, role, features, subdirs)
+                if response.truncated:
+                    features.truncated = True
+        return subdirs
+
+    def index_entries(
+        self,
+        entries: Iterable[Dict],
+        role: Optional[str],
+        features: RepoFeatures,
+        subdirs: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        """Index the entries of one listing page, stopping at max_files.
+
+        Args:
+            entries: Listing entries ({'type': ..., 'path': ...})
+            role: Role of the directory listed, if any
+            features: Index to add the entries to
+            subdirs: List the (path, role) tuples of subdirectories are appended to
+        """
+        for entry in entries:
+            path = entry['path']
+            if entry.get('type') == 'directory':
+                features.add(path, is_directory=True, role=role)
+                name = path.rsplit('/', 1)[-1].lower()
+                subdirs.append((path, DIRECTORY_ROLES.get(name, role)))
+            else:
+                features.add(path, role=role)
+                if features.files >= self.max_files:
+                    features.truncated = True
+                    return
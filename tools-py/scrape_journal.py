@@ -0,0 +1,110 @@
+"""
+Model Openness Tool - Scrape Checkpoint Journal
+
+Append-only record of batch scrape results, one JSON line per finished
+attempt with the model ID, status, output path, error, attempt number and
+timestamp. A batch that is interrupted (rate limit, network failure, Ctrl-C)
+can be restarted with the same journal: models that already succeeded are
+skipped and only the remaining and failed ones are scraped again.
+
+Lines are flushed as soon as each model finishes. A torn last line from a
+crash (one without its newline) is dropped from the file on load, so the
+journal never loses more than the models that were in flight and the next
+entry does not run into the torn one.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class ScrapeJournal:
+    """Append-only checkpoint journal of per-model scrape results."""
+
+    def __init__(self, path: str):
+        """Open a journal, loading the entries of previous runs.
+
+        Args:
+            path: Path to the journal file (created if missing)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        # Latest entry per model ID
+        self.entries: Dict[str, Dict] = {}
+
+        if self.path.exists():
+            with open(self.path, 'rb+') as f:
+                data = f.read()
+                # A last line without its newline was cut off by a crash, even if
+                # it happens to parse; drop it so the next entry starts a new line
+                complete = data.rfind(b'\n') + 1
+                if complete < len(data):
+                    f.truncate(complete)
+            for line in data[:complete].decode('utf-8', errors='replace').splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Corrupt line, e.g. from a disk error
+                if isinstance(entry, dict) and entry.get('model_id'):
+                    self.entries[entry['model_id']] = entry
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self) -> None:
+        """Close the journal file."""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> 'ScrapeJournal':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def is_complete(self, model_id: str) -> bool:
+        """Check whether a model was scraped successfully by an earlier attempt.
+
+        Args:
+            model_id: Normalized HuggingFace model ID
+
+        Returns:
+            True if the latest entry for the model is a success
+        """
+        entry = self.entries.get(model_id)
+        return entry is not None and entry.get('status') == 'success'
+
+    def attempts(self, model_id: str) -> int:
+        """Number of attempts recorded for a model so far."""
+        entry = self.entries.get(model_id)
+        return entry.get('attempt', 0) if entry else 0
+
+    def record(self, result: Dict, attempt: Optional[int] = None) -> Dict:
+        """Append the result of one scrape attempt.
+
+        Args:
+            result: Result dictionary (see ModelScraper.scrape_to_file)
+            attempt: Attempt number (default: one more than previously recorded)
+
+        Returns:
+            The journal entry written
+        """
+        model_id = result['model_id']
+        with self._lock:
+            entry = {
+                'model_id': model_id,
+                'status': result['status'],
+                'output': result.get('output'),
+                'error': result.get('error'),
+                'attempt': attempt if attempt is not None else self.attempts(model_id) + 1,
+                'elapsed': round(result.get('elapsed', 0.0), 3),
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+            }
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.entries[model_id] = entry
+        return entry
@@ -0,0 +1,550 @@
+"""
+Model Openness Tool - Scrape Metrics
+
+Live counters and histograms of scraping and finder runs in the Prometheus
+text exposition format, so long batch runs can be watched on the same
+dashboards as other services instead of waiting for the final summary.
+
+ScrapeMetrics counts the models scraped (by status, with a duration
+histogram), the MOF components detected, the YAML files written, and the
+HuggingFace models listed and matched by the finder. Set it as the metrics
+of a ModelScraper or MissingModelsFinder for those, and as the recorder of
+their session (see http_recorder.combine_recorders to keep a HAR log as
+well) for the HTTP requests: requests per host, endpoint class (see
+http_cache.classify_url) and status, latency histograms per endpoint class,
+429 responses, response bytes, retries, cache hits and time spent waiting
+for the rate limiter.
+
+The metrics are exposed on a local /metrics endpoint (start_http_server),
+or written periodically and at the end of the run to a file for the
+node_exporter textfile collector (start_textfile), which keeps the final
+values of runs that have already exited. Every sample carries a tool label
+naming the process, so the files of several tools collected together do not
+repeat the same series.
+
+Example:
+    metrics = ScrapeMetrics(tool='model_scraper')
+    scraper.metrics = metrics
+    scraper.session.recorder = metrics
+    metrics.start_http_server(9464)
+    ...
+    metrics.close()
+"""
+
+import math
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from http_cache import classify_url
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Histogram buckets in seconds
+REQUEST_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+MODEL_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value as the exposition format expects."""
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    """Format a label set, escaping backslashes, quotes and newlines."""
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class Metric:
+    """Base of the metric types: a named family of samples keyed by label values."""
+
+    TYPE = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        """Initialize the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._values[()] = self._initial()
+
+    def _initial(self):
+        return 0.0
+
+    def _key(self, labels: Tuple) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return tuple(str(label) for label in labels)
+
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], Tuple[str, ...], float]]:
+        """Current samples as (name, label names, label values, value)."""
+        with self._lock:
+            return [(self.name, self.labelnames, key, value) for key, value in sorted(self._values.items())]
+
+    def render(self, const_labels: Optional[Dict[str, str]] = None) -> List[str]:
+        """Lines of the metric in the text exposition format.
+
+        Args:
+            const_labels: Labels added to every sample, before its own
+        """
+        const_names = tuple(const_labels or ())
+        const_values = tuple((const_labels or {}).values())
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.TYPE}",
+        ]
+        for name, labelnames, labels, value in self.samples():
+            labels = _format_labels(const_names + labelnames, const_values + labels)
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    TYPE = 'counter'
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        """Add to the count of a label set.
+
+        Args:
+            labels: Label values, in the order of labelnames
+            amount: Non-negative amount to add
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    TYPE = 'gauge'
+
+    def set(self, value: float, *labels) -> None:
+        """Set the value of a label set.
+
+        Args:
+            value: New value
+            labels: Label values, in the order of labelnames
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets, with their sum and count."""
+
+    TYPE = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = REQUEST_BUCKETS
+    ):
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels every sample carries
+            buckets: Upper bounds of the buckets (+Inf is added)
+        """
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        super().__init__(name, documentation, labelnames)
+
+    def _initial(self):
+        # Per-bucket (non-cumulative) counts, then the sum
+        return [0] * len(self.buckets) + [0.0]
+
+    def observe(self, value: float, *labels) -> None:
+        """Record an observation.
+
+        Args:
+            value: Observed value
+            labels: Label values, in the order of labelnames
+        """
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = self._initial()
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], Tuple[str, ...], float]]:
+        with self._lock:
+            values = sorted((key, list(counts)) for key, counts in self._values.items())
+
+        samples = []
+        bucket_labels = self.labelnames + ('le',)
+        for key, counts in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((self.name + '_bucket', bucket_labels, key + (_format_value(bound),), cumulative))
+            samples.append((self.name + '_sum', self.labelnames, key, counts[-1]))
+            samples.append((self.name + '_count', self.labelnames, key, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self, const_labels: Optional[Dict[str, str]] = None):
+        """Initialize the registry.
+
+        Args:
+            const_labels: Labels added to every sample, e.g. {'tool': 'model_scraper'}
+        """
+        self.metrics: List[Metric] = []
+        self.const_labels = dict(const_labels or {})
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric to the registry and return it."""
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render(self.const_labels))
+        return '\n'.join(lines) + '\n'
+
+
+class ScrapeMetrics:
+    """Metrics of the scraper, the finder and their HTTP requests.
+
+    Implements the recorder interface of RateLimitedSession (record and
+    set_size), so it can be set as a session's recorder directly.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, tool: Optional[str] = None):
+        """Initialize the metrics.
+
+        Args:
+            registry: Registry to add the metrics to (default: a new one)
+            tool: Value of the tool label of a new registry's samples, naming the
+                process (e.g. 'model_scraper')
+        """
+        self.registry = registry or MetricsRegistry({'tool': tool} if tool else None)
+        register = self.registry.register
+
+        self.start_time = register(Gauge(
+            'mot_start_time_seconds', 'Start time of the run since the Unix epoch in seconds.'))
+        self.start_time.set(time.time())
+
+        # Scraper
+        self.models_scraped = register(Counter(
+            'mot_models_scraped_total', 'Models scraped, by result.', ['status']))
+        self.model_duration = register(Histogram(
+            'mot_model_scrape_duration_seconds', 'Time to scrape a model and write its draft.',
+            buckets=MODEL_BUCKETS))
+        self.components_detected = register(Counter(
+            'mot_components_detected_total', 'MOF components detected in written drafts, by component.',
+            ['component']))
+        self.yaml_written = register(Counter(
+            'mot_yaml_files_written_total', 'Draft YAML files written.'))
+        self.yaml_bytes = register(Counter(
+            'mot_yaml_bytes_written_total', 'Bytes of draft YAML written.'))
+
+        # Finder
+        self.listing_pages = register(Counter(
+            'mot_hf_listing_pages_total', 'HuggingFace model listing pages fetched.'))
+        self.models_listed = register(Counter(
+            'mot_hf_models_listed_total', 'HuggingFace models received from the listing.'))
+        self.models_matched = register(Counter(
+            'mot_hf_models_matched_total', 'HuggingFace models matched against MOT, by result.', ['result']))
+        self.missing_models = register(Counter(
+            'mot_missing_models_total', 'HuggingFace models missing from MOT, by priority.', ['priority']))
+
+        # HTTP requests
+        self.requests = register(Counter(
+            'mot_http_requests_total', 'HTTP requests, by host, endpoint class and status code.',
+            ['host', 'endpoint', 'status']))
+        self.request_duration = register(Histogram(
+            'mot_http_request_duration_seconds',
+            'Time until the response headers arrived, including rate limit waits and retries.',
+            ['endpoint']))
+        self.rate_limited = register(Counter(
+            'mot_http_rate_limited_total', 'HTTP 429 (Too Many Requests) responses, including retried ones, by host.',
+            ['host']))
+        self.response_bytes = register(Counter(
+            'mot_http_response_bytes_total', 'Response body bytes read, by endpoint class.', ['endpoint']))
+        self.retries = register(Counter(
+            'mot_http_retries_total', 'HTTP request retries, by endpoint class.', ['endpoint']))
+        self.cache_hits = register(Counter(
+            'mot_http_cache_hits_total',
+            'Responses served from the response cache (fresh or revalidated), by endpoint class.',
+            ['endpoint']))
+        self.blocked = register(Counter(
+            'mot_http_blocked_seconds_total',
+            'Time requests waited for the rate limiter and retry backoff, by host.', ['host']))
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._textfile: Optional[str] = None
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        return self.registry.render()
+
+    def model_scraped(self, result: Dict) -> None:
+        """Count a scraped model.
+
+        Args:
+            result: Result dictionary (see ModelScraper.scrape_to_file)
+        """
+        self.models_scraped.inc(result['status'])
+        self.model_duration.observe(result['elapsed'])
+
+    def draft_written(self, components: List[Dict], yaml_output: str) -> None:
+        """Count a written draft YAML file and its detected components.
+
+        Args:
+            components: Detected components (see ModelScraper.detect_components)
+            yaml_output: YAML written
+        """
+        self.yaml_written.inc()
+        self.yaml_bytes.inc(amount=len(yaml_output.encode('utf-8')))
+        for component in components:
+            self.components_detected.inc(component['name'])
+
+    def listing_page(self, models: List[Dict]) -> None:
+        """Count a fetched listing page and its models."""
+        self.listing_pages.inc()
+        self.models_listed.inc(amount=len(models))
+
+    def model_matched(self, in_mot: bool, priority: Optional[str] = None) -> None:
+        """Count a HuggingFace model matched against MOT.
+
+        Args:
+            in_mot: Whether the model is already in MOT
+            priority: Priority bucket of a missing model (see priority_for_downloads)
+        """
+        self.models_matched.inc('in_mot' if in_mot else 'missing')
+        if not in_mot:
+            self.missing_models.inc(priority or 'unknown')
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: Optional[int],
+        started: float,
+        elapsed: float,
+        size: Optional[int] = None,
+        cache_status: str = 'bypass',
+        retries: int = 0,
+        blocked: float = 0.0,
+        rate_limited: int = 0,
+        content_type: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> Dict:
+        """Count an HTTP request (see http_recorder.RequestRecorder.record).
+
+        Returns:
+            Entry to pass to set_size once a streamed body has been read
+        """
+        host = urlparse(url).netloc
+        endpoint = classify_url(url)
+        self.requests.inc(host, endpoint, status if status is not None else 'error')
+        self.request_duration.observe(elapsed, endpoint)
+        if rate_limited:
+            self.rate_limited.inc(host, amount=rate_limited)
+        if retries:
+            self.retries.inc(endpoint, amount=retries)
+        if blocked:
+            self.blocked.inc(host, amount=blocked)
+        if cache_status in ('hit', 'revalidated'):
+            self.cache_hits.inc(endpoint)
+        entry = {'endpoint': endpoint, 'size': None}
+        self.set_size(entry, size)
+        return entry
+
+    def set_size(self, entry: Dict, size: Optional[int]) -> None:
+        """Count the bytes of a response read so far.
+
+        Args:
+            entry: Entry returned by record
+            size: Body bytes read so far, None if not known
+        """
+        if size is None:
+            return
+        added = size - (entry['size'] or 0)
+        entry['size'] = size
+        if added > 0:
+            self.response_bytes.inc(entry['endpoint'], amount=added)
+
+    def start_http_server(self, port: int, host: str = '127.0.0.1') -> int:
+        """Serve the metrics on http://host:port/metrics from a background thread.
+
+        Args:
+            port: Port to listen on (0 picks a free port)
+            host: Interface to listen on
+
+        Returns:
+            Port the server listens on
+        """
+        self._server = MetricsHTTPServer((host, port), self)
+        threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True).start()
+        return self._server.server_address[1]
+
+    def start_textfile(self, path: str, interval: float = 15.0) -> None:
+        """Write the metrics to a file every interval seconds from a background thread.
+
+        The file is replaced atomically, as the node_exporter textfile
+        collector requires, and written a last time by close.
+
+        Args:
+            path: Output file path (the textfile collector reads *.prom files)
+            interval: Seconds between writes
+        """
+        self._textfile = path
+        self.write_textfile(path)
+
+        def write_periodically():
+            while not self._stop.wait(interval):
+                self.write_textfile(path)
+
+        self._writer = threading.Thread(target=write_periodically, name='metrics-textfile', daemon=True)
+        self._writer.start()
+
+    def write_textfile(self, path: str) -> None:
+        """Write the metrics to a file, replacing it atomically.
+
+        Args:
+            path: Output file path
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+    def close(self) -> None:
+        """Stop the metrics server and write the textfile a last time."""
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        if self._textfile:
+            self.write_textfile(self._textfile)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics."""
+
+    def log_message(self, format, *args) -> None:
+        pass  # Scraped every few seconds; keep the run's output clean
+
+    def do_GET(self) -> None:
+        if urlparse(self.path).path != '/metrics':
+            self.send_error(404)
+            return
+        data = self.server.metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MetricsHTTPServer(ThreadingHTTPServer):
+    """HTTP server exposing ScrapeMetrics."""
+
+    daemon_threads = True
+
+    def __init__(self, address, metrics: ScrapeMetrics):
+        super().__init__(address, MetricsRequestHandler)
+        self.metrics = metrics
+
+
+def add_metrics_arguments(parser) -> None:
+    """Add the shared metrics export options to an argument parser.
+
+    Args:
+        parser: argparse.ArgumentParser to extend
+    """
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        metavar='PORT',
+        help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running'
+    )
+    parser.add_argument(
+        '--metrics-textfile',
+        metavar='FILE',
+        help='Write Prometheus metrics to FILE (e.g. for the node_exporter textfile collector) '
+             'while running and at the end'
+    )
+    parser.add_argument(
+        '--metrics-interval',
+        type=float,
+        default=15.0,
+        help='Seconds between --metrics-textfile writes (default: 15)'
+    )
+
+
+def metrics_from_args(args, tool: str) -> Optional[ScrapeMetrics]:
+    """Create and start the metrics export selected by the shared command-line options.
+
+    Args:
+        args: Parsed arguments (see add_metrics_arguments)
+        tool: Name of the tool, the value of the tool label (see ScrapeMetrics)
+
+    Returns:
+        ScrapeMetrics, or None if no export is enabled
+    """
+    if args.metrics_port is None and not args.metrics_textfile:
+        return None
+    metrics = ScrapeMetrics(tool=tool)
+    if args.metrics_port is not None:
+        port = metrics.start_http_server(args.metrics_port)
+        # On stderr, as stdout may carry an NDJSON stream
+        print(f"Serving metrics on http://127.0.0.1:{port}/metrics", file=sys.stderr)
+    if args.metrics_textfile:
+        metrics.start_textfile(args.metrics_textfile, args.metrics_interval)
+    return metrics
+
+
+def finish_metrics(metrics: Optional[ScrapeMetrics]) -> None:
+    """Stop the metrics export, writing the final textfile, if exporting.
+
+    Args:
+        metrics: Metrics, or None if no export is enabled
+    """
+    if metrics is not None:
+        metrics.close()
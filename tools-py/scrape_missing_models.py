@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Model Openness Tool - Missing Models Pipeline
+
+Finds HuggingFace models that are missing from MOT and scrapes draft YAML
+files for them in a single process. The finder pages through HuggingFace and
+puts each missing model on a bounded queue as soon as it is matched, while a
+pool of scraper workers consumes the queue, so scraping starts with the first
+missing model instead of after the whole listing. The workers take whatever
+models are waiting, up to a chunk, and probe the GitHub repositories of the
+chunk together like batch mode. When the workers fall behind, the full queue
+pauses discovery (and with it further listing pages). Discovery and scraping
+share one per-host rate limit.
+
+Usage:
+    python scrape_missing_models.py [--min-downloads MIN] [--max-models N] [--workers N]
+
+Example:
+    python scrape_missing_models.py --min-downloads 50000 --max-models 20 --workers 4
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from find_missing_models import MissingModelsFinder, parse_fields
+from http_cache import add_cache_arguments, cache_from_args
+from model_scraper import ModelScraper, print_result, retry_failed
+from scrape_journal import ScrapeJournal
+from scrape_metrics import add_metrics_arguments, finish_metrics, metrics_from_args
+
+
+class MissingModelsPipeline:
+    """Chains missing model discovery into a pool of scraper workers."""
+
+    def __init__(
+        self,
+        finder: MissingModelsFinder,
+        scraper: ModelScraper,
+        output_dir: str,
+        workers: int = 4,
+        queue_size: Optional[int] = None,
+        journal: Optional[ScrapeJournal] = None,
+        retries: int = 0,
+        retry_backoff: float = 5.0
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            finder: Finder producing the missing models; its session is paced
+                by the scraper's rate limiter
+            scraper: Scraper whose session is shared by all workers
+            output_dir: Directory to write the YAML files to
+            workers: Number of models scraped concurrently
+            queue_size: Maximum number of discovered models waiting to be
+                scraped before discovery pauses (default: one chunk, see
+                ModelScraper.PROBE_CHUNK_FACTOR)
+            journal: Optional checkpoint journal; models it records as done are
+                skipped and every result is appended to it
+            retries: Number of times models that failed are retried once
+                discovery and the first attempts are done
+            retry_backoff: Delay in seconds before the first retry, doubled for
+                each further retry
+        """
+        self.finder = finder
+        self.scraper = scraper
+        self.output_dir = output_dir
+        self.workers = max(1, workers)
+        self.journal = journal
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.chunk_size = self.workers * scraper.PROBE_CHUNK_FACTOR
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size or self.chunk_size)
+        # Listing pages count against the same per-host limit as the scrapes
+        finder.session.rate_limiter = scraper.session.rate_limiter
+        self.stop = threading.Event()
+
+        self.results: List[Dict] = []
+        self.discovered = 0
+        self.skipped = 0
+        self.discovery_error: Optional[str] = None
+        self.discovery_seconds = 0.0
+
+    def _put(self, item) -> bool:
+        """Put an item on the queue, blocking while it is full unless stopped.
+
+        Returns:
+            True if the item was queued
+        """
+        while not self.stop.is_set():
+            try:
+                self.queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _discover(
+        self,
+        min_downloads: int,
+        limit: int,
+        model_type: Optional[str],
+        max_models: Optional[int],
+        fields: Optional[List[str]]
+    ) -> None:
+        """Producer: queue missing model IDs as they are found."""
+        start = time.monotonic()
+        try:
+            mot_models = self.finder.get_mot_models()
+            hf_models = self.finder.iter_huggingface_models(
+                min_downloads=min_downloads,
+                limit=limit,
+                model_type=model_type,
+                fields=fields
+            )
+            # Stopping early closes the listing, so pages fetched ahead are cancelled
+            with closing(hf_models), closing(self.finder.iter_missing_models(hf_models, mot_models)) as missing:
+                for record in missing:
+                    if self.journal is not None and self.journal.is_complete(record['id']):
+                        self.skipped += 1
+                        continue
+                    if self.stop.is_set() or not self._put(record['id']):
+                        break
+                    self.discovered += 1
+                    if max_models and self.discovered >= max_models:
+                        break
+        except Exception as e:
+            self.discovery_error = str(e)
+            print(f"Error discovering missing models: {e}")
+        finally:
+            self.discovery_seconds = time.monotonic() - start
+            self._put(None)
+
+    def _next_chunk(self) -> Optional[List[str]]:
+        """Wait for a queued model, then take the ones already waiting, up to a chunk.
+
+        Returns:
+            Model IDs, possibly fewer than a chunk; None once the end marker was
+            reached with nothing left or the pipeline was stopped
+        """
+        chunk: List[str] = []
+        while not chunk and not self.stop.is_set():
+            try:
+                model_id = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            while model_id is not None:
+                chunk.append(model_id)
+                if len(chunk) >= self.chunk_size:
+                    return chunk
+                try:
+                    model_id = self.queue.get_nowait()
+                except queue.Empty:
+                    return chunk
+            # End marker: scrape what was taken, then stop
+            self.queue.put(None)
+            return chunk or None
+        return None
+
+    def _scrape(self) -> None:
+        """Consumer: scrape queued models chunk by chunk until the end marker."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scrape') as executor:
+            while True:
+                chunk = self._next_chunk()
+                if chunk is None:
+                    break
+                for result in self.scraper.iter_scrape_chunk(chunk, self.output_dir, executor):
+                    if self.journal is not None:
+                        self.journal.record(result)
+                    self.results.append(result)
+                    print_result(f"[{len(self.results)}]", result)
+
+    def run(
+        self,
+        min_downloads: int = 50000,
+        limit: int = 1000,
+        model_type: Optional[str] = None,
+        max_models: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """Run discovery and scraping concurrently until both finish, then retry failures.
+
+        Failed models are retried like in model_scraper.py batch mode (see
+        retry_failed); results are replaced by the latest attempt of each model.
+
+        Args:
+            min_downloads: Minimum number of downloads to consider
+            limit: Maximum number of models to fetch from HuggingFace
+            model_type: Filter by model type (e.g., 'text-generation')
+            max_models: Maximum number of missing models to scrape (None for all)
+            fields: Listing fields to request instead of full records
+
+        Returns:
+            List of result dictionaries (see ModelScraper.scrape_to_file) in completion order
+        """
+        threads = [
+            threading.Thread(
+                target=self._discover,
+                args=(min_downloads, limit, model_type, max_models, fields),
+                name='discover'
+            ),
+            threading.Thread(target=self._scrape, name='scrape')
+        ]
+
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            print("\nInterrupted, waiting for models in progress to finish...")
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+
+        failed = [result for result in self.results if result['status'] != 'success']
+        if failed and self.retries and not self.stop.is_set():
+            latest = {
+                result['model_id']: result
+                for result in retry_failed(
+                    self.scraper, failed, self.output_dir, self.workers,
+                    self.journal, self.retries, self.retry_backoff
+                )
+            }
+            self.results = [latest.get(result['model_id'], result) for result in self.results]
+
+        return self.results
+
+
+def print_summary(pipeline: MissingModelsPipeline, elapsed: float) -> int:
+    """Print the pipeline summary.
+
+    Args:
+        pipeline: Finished pipeline
+        elapsed: Total wall-clock seconds
+
+    Returns:
+        Process exit code (0 if every model succeeded, 1 otherwise)
+    """
+    failed = [r for r in pipeline.results if r['status'] != 'success']
+    success_count = len(pipeline.results) - len(failed)
+    scrape_seconds = sum(r['elapsed'] for r in pipeline.results)
+
+    print(f"\n{'='*60}")
+    print("PIPELINE SUMMARY")
+    print(f"{'='*60}\n")
+    print(f"Missing models queued: {pipeline.discovered}")
+    if pipeline.skipped:
+        print(f"Skipped (already done): {pipeline.skipped}")
+    print(f"Successful: {success_count}")
+    print(f"Failed: {len(failed)}")
+    if failed:
+        print("\nFailed models:")
+        for result in failed:
+            print(f"  - {result['model_id']}: {result['error']}")
+    if pipeline.discovery_error:
+        print(f"\nDiscovery stopped early: {pipeline.discovery_error}")
+    print(f"\nHTTP (discovery): {pipeline.finder.session.stats.summary()}")
+    print(f"HTTP (scraping): {pipeline.scraper.session.stats.summary()}")
+    print(f"\nDiscovery: {pipeline.discovery_seconds:.1f}s, "
+          f"scraping: {scrape_seconds:.1f}s of worker time, "
+          f"total: {elapsed:.1f}s")
+    print("\n⚠️  IMPORTANT: Generated files are DRAFTS that require manual review!")
+
+    return 1 if failed or pipeline.discovery_error else 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Find models missing from MOT and scrape draft YAML files for them'
+    )
+    parser.add_argument(
+        '--min-downloads',
+        type=int,
+        default=50000,
+        help='Minimum number of downloads to consider (default: 50000)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=1000,
+        help='Maximum number of models to fetch from HuggingFace (default: 1000)'
+    )
+    parser.add_argument(
+        '--max-models',
+        type=int,
+        default=20,
+        help='Maximum number of missing models to scrape, 0 for no limit (default: 20)'
+    )
+    parser.add_argument(
+        '--model-type',
+        help='Filter by model type (e.g., text-generation, image-to-text)'
+    )
+    parser.add_argument(
+        '--fields',
+        type=parse_fields,
+        default=['downloads', 'tags'],
+        help='Comma-separated listing fields to request (default: downloads,tags)'
+    )
+    parser.add_argument(
+        '--window',
+        type=int,
+        default=4,
+        help='Number of listing pages fetched concurrently (default: 4)'
+    )
+    parser.add_argument(
+        '--models-dir',
+        default='../models',
+        help='Path to MOT models directory (default: ../models)'
+    )
+    parser.add_argument(
+        '--index',
+        help='Compiled model index to load MOT models from (built or refreshed from --models-dir as needed)'
+    )
+    parser.add_argument(
+        '--fuzzy-threshold',
+        type=float,
+        default=0.9,
+        help='Minimum fuzzy name match score (0-1) to treat a model as already in MOT, 0 to disable (default: 0.9)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default='../models',
+        help='Output directory for YAML files (default: ../models)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Number of models scraped concurrently (default: 4)'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        help=f'Discovered models waiting to be scraped before discovery pauses (default: {ModelScraper.PROBE_CHUNK_FACTOR} times --workers)'
+    )
+    parser.add_argument(
+        '--journal',
+        help='Checkpoint journal; models completed by earlier runs are skipped'
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=2,
+        help='Number of times failed models are retried (default: 2)'
+    )
+    parser.add_argument(
+        '--retry-backoff',
+        type=float,
+        default=5.0,
+        help='Seconds before the first retry, doubled for each further retry (default: 5)'
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=2.0,
+        help='Maximum requests per second per host, 0 for no fixed limit (default: 2.0)'
+    )
+    parser.add_argument(
+        '--hf-token',
+        help='HuggingFace API token for accessing gated models'
+    )
+
+    add_cache_arguments(parser)
+    add_metrics_arguments(parser)
+
+    args = parser.parse_args()
+    cache = cache_from_args(args)
+    metrics = metrics_from_args(args, 'scrape_missing_models')
+
+    finder = MissingModelsFinder(
+        models_dir=args.models_dir,
+        cache=cache,
+        fuzzy_threshold=args.fuzzy_threshold or None,
+        corpus_cache=None if args.no_cache else Path(args.cache_dir) / 'models_corpus.pickle',
+        model_index=args.index,
+        page_window=args.window
+    )
+    scraper = ModelScraper(
+        hf_token=args.hf_token,
+        rate_limit=args.rate_limit,
+        pool_size=max(10, args.workers),
+        cache=cache
+    )
+    # Discovery and scraping report into the same metrics
+    for tool in (finder, scraper):
+        tool.metrics = metrics
+        tool.session.recorder = metrics
+    journal = ScrapeJournal(args.journal) if args.journal else None
+    pipeline = MissingModelsPipeline(
+        finder,
+        scraper,
+        args.output_dir,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        journal=journal,
+        retries=args.retries,
+        retry_backoff=args.retry_backoff
+    )
+
+    print(f"\n{'='*60}")
+    print(f"Finding and scraping missing models ({args.workers} workers)")
+    print(f"{'='*60}\n")
+
+    start = time.monotonic()
+    try:
+        pipeline.run(
+            min_downloads=args.min_downloads,
+            limit=args.limit,
+            model_type=args.model_type,
+            max_models=args.max_models or None,
+            fields=args.fields
+        )
+    finally:
+        if journal is not None:
+            journal.close()
+        finish_metrics(metrics)
+    sys.exit(print_summary(pipeline, time.monotonic() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Model Openness Tool - Scrape Result
+
+Scraped model data with its derived values computed once. The single model
+mode of the scraper used to extract the metadata to pick the output file
+name and then again to write the YAML, repeating the repository detection
+(with its GitHub probes), the license detection and the card parsing.
+ScrapeResult computes each derived value on first access and keeps it, so
+file naming, YAML generation and reports share one computation per model.
+
+ScrapeResult is a dict, so code reading the raw fields ('model_id',
+'model_info', 'model_card', ...) works unchanged. Derived values reflect
+the raw fields as of their first access.
+
+Example:
+    result = scraper.scrape_huggingface_model('meta-llama/Llama-3-8B')
+    path = Path(output_dir) / f"{result.metadata['name']}.yml"
+    scraper.generate_yaml(result, str(path))
+"""
+
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+from card_analyzer import ModelCardAnalyzer
+from repo_tree import RepoFeatures
+
+
+class ScrapeResult(dict):
+    """Scraped model information with lazily computed, memoized derived values."""
+
+    def __init__(self, scraper, data: Optional[Dict] = None, repo_features: Optional[RepoFeatures] = None):
+        """Initialize the result.
+
+        Args:
+            scraper: ModelScraper whose detectors compute the derived values
+            data: Scraped model information (see ModelScraper.scrape_huggingface_model)
+            repo_features: File feature index of the listed repository, kept
+                off the raw fields; built from data['repo_files'] if omitted
+        """
+        super().__init__(data or {})
+        self.scraper = scraper
+        if repo_features is not None:
+            self.repo_features = repo_features
+
+    @cached_property
+    def repo_features(self) -> RepoFeatures:
+        """File feature index of the repository (see ModelScraper.repo_features)."""
+        return RepoFeatures.from_paths(self.get('repo_files', []))
+
+    @cached_property
+    def card_analysis(self) -> ModelCardAnalyzer:
+        """Parsed model card shared by the detectors (see ModelScraper.analyze_card)."""
+        return ModelCardAnalyzer(self.get('model_card', ''))
+
+    @cached_property
+    def metadata(self) -> Dict:
+        """Model metadata (see ModelScraper._extract_model_metadata)."""
+        return self.scraper._extract_model_metadata(self)
+
+    @cached_property
+    def components(self) -> List[Dict]:
+        """Detected MOF components (see ModelScraper.detect_components)."""
+        return self.scraper.detect_components(self)
+
+    @cached_property
+    def license(self) -> Tuple[str, Optional[str]]:
+        """Tuple of (license_name, license_url) (see ModelScraper._detect_license)."""
+        return self.scraper._detect_license(self)
+
+    @cached_property
+    def repository(self) -> Tuple[str, float]:
+        """Tuple of (repository_url, confidence_score) (see ModelScraper._detect_repository)."""
+        return self.scraper._detect_repository(self)
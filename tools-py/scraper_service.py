@@ -0,0 +1,752 @@
+#!/usr/bin/env python3
+"""
+Model Openness Tool - Scraper Service
+
+Resident service that keeps one warm ModelScraper (connection pool, response
+cache, GitHub probe memo) and MissingModelsFinder (parsed MOT corpus) and
+runs scrape and find-missing jobs submitted over a local HTTP API, so tools
+can submit hundreds of models without paying interpreter startup, imports,
+TLS handshakes and cold caches per model.
+
+Jobs wait on a priority queue (higher priority first, then submission
+order); the models of a scrape job are queued individually, so a pool of
+workers scrapes them concurrently and a later urgent job overtakes the rest
+of a large one. Find-missing jobs have a queue and thread of their own, as
+the finder runs one job at a time and would otherwise hold a scrape worker
+idle while waiting. Results are streamed back as NDJSON while the job runs.
+
+API (JSON bodies; the service listens on 127.0.0.1 or a Unix socket). POST
+bodies must be sent as Content-Type: application/json, so a web page cannot
+submit jobs without a CORS preflight, and with --token every request but
+/health needs an Authorization: Bearer header:
+
+    POST   /jobs                 Submit a job, e.g. {"type": "scrape", "models": [...],
+                                 "priority": 10} or {"type": "find-missing",
+                                 "min_downloads": 50000}; ?stream=1 streams its results
+    GET    /jobs                 List jobs
+    GET    /jobs/<id>            Job status and results so far
+    GET    /jobs/<id>/results    Stream the job's results as NDJSON until it finishes
+    DELETE /jobs/<id>            Cancel the job's models that have not started yet
+    GET    /metrics              Queue depth, in-flight work, latency percentiles, HTTP counters;
+                                 Prometheus text format when requested (Accept: text/plain
+                                 or ?format=prometheus)
+    GET    /health               Liveness check
+
+Usage:
+    python scraper_service.py [--port PORT | --socket PATH] [--workers N] [--output-dir DIR] [--token TOKEN]
+
+Example:
+    python scraper_service.py --port 8765 --workers 8
+    curl -N -H 'Content-Type: application/json' -d '{"type": "scrape", "models": ["google/gemma-2b"]}' \
+        'http://127.0.0.1:8765/jobs?stream=1'
+"""
+
+import argparse
+import hmac
+import itertools
+import json
+import os
+import queue
+import signal
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from find_missing_models import MissingModelsFinder, parse_fields
+from http_cache import add_cache_arguments, cache_from_args
+from http_recorder import combine_recorders
+from model_scraper import DEFAULT_MAX_CARD_BYTES, DEFAULT_MAX_TREE_BYTES, ModelScraper
+from repo_tree import DEFAULT_TREE_DEPTH
+from scrape_metrics import CONTENT_TYPE, Gauge, ScrapeMetrics
+
+JOB_TYPES = ('scrape', 'find-missing')
+
+# Finished jobs kept for status queries; older ones are forgotten
+MAX_FINISHED_JOBS = 1000
+
+# Recent timings the latency percentiles are computed over
+LATENCY_WINDOW = 1000
+
+
+def percentiles(values: Iterator[float]) -> Dict[str, float]:
+    """Summarize timings as count, p50, p90, p99 and max (nearest rank)."""
+    ordered = sorted(values)
+    if not ordered:
+        return {'count': 0}
+
+    def rank(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    return {'count': len(ordered), 'p50': rank(0.5), 'p90': rank(0.9), 'p99': rank(0.99), 'max': ordered[-1]}
+
+
+class Job:
+    """A submitted job, its results and its progress."""
+
+    def __init__(self, job_id: str, job_type: str, params: Dict, priority: int):
+        """Initialize the job.
+
+        Args:
+            job_id: Job ID
+            job_type: 'scrape' or 'find-missing'
+            params: Validated job parameters
+            priority: Queue priority, higher runs first
+        """
+        self.id = job_id
+        self.type = job_type
+        self.params = params
+        self.priority = priority
+        self.status = 'queued'
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.error: Optional[str] = None
+        self.cancelled = False
+        # Queued work items not finished yet (models of a scrape job, or the finder run)
+        self.pending = 0
+        self.results: List[Dict] = []
+        self.changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished (successfully or not)."""
+        return self.status in ('done', 'failed', 'cancelled')
+
+    def describe(self, results: bool = False) -> Dict:
+        """JSON-serializable status of the job.
+
+        Args:
+            results: Whether to include the results so far
+
+        Returns:
+            Job status dictionary
+        """
+        with self.changed:
+            description = {
+                'id': self.id,
+                'type': self.type,
+                'status': self.status,
+                'priority': self.priority,
+                'params': self.params,
+                'submitted': self.submitted,
+                'started': self.started,
+                'finished': self.finished,
+                'pending': self.pending,
+                'result_count': len(self.results),
+                'error': self.error,
+            }
+            if self.type == 'scrape':
+                description['failed'] = sum(1 for r in self.results if r.get('status') != 'success')
+            if results:
+                description['results'] = list(self.results)
+        return description
+
+    def iter_results(self, poll: float = 1.0) -> Iterator[Dict]:
+        """Yield the job's results as they arrive, until the job is done.
+
+        Args:
+            poll: Seconds between checks while no result arrives
+        """
+        sent = 0
+        while True:
+            with self.changed:
+                while sent >= len(self.results) and not self.done:
+                    self.changed.wait(poll)
+                batch = self.results[sent:]
+                finished = self.done
+            for result in batch:
+                yield result
+            sent += len(batch)
+            if finished and sent >= len(self.results):
+                return
+
+
+class ScraperService:
+    """Runs scrape and find-missing jobs from a priority queue on warm tools."""
+
+    def __init__(
+        self,
+        scraper: ModelScraper,
+        finder: MissingModelsFinder,
+        output_dir: str,
+        workers: int = 4
+    ):
+        """Initialize the service.
+
+        Args:
+            scraper: Scraper shared by all workers
+            finder: Finder used by find-missing jobs (one at a time)
+            output_dir: Default directory for the YAML files of scrape jobs; a
+                job's own output_dir must lie inside it
+            workers: Number of models scraped concurrently (find-missing jobs run
+                on a thread of their own)
+        """
+        self.scraper = scraper
+        self.finder = finder
+        self.output_dir = output_dir
+        self.workers = max(1, workers)
+        self.started = time.time()
+
+        # Items are (-priority, sequence, job, model_id, enqueued); the sequence
+        # keeps equal priorities first in, first out. Find-missing jobs queue
+        # separately for the single finder thread.
+        self.queue: queue.PriorityQueue = queue.PriorityQueue()
+        self.finder_queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._job_ids = itertools.count(1)
+        self.jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self.in_flight = 0
+        self.counts = {'scraped': 0, 'failed': 0, 'cancelled': 0, 'found_missing': 0}
+        self.scrape_latency: deque = deque(maxlen=LATENCY_WINDOW)
+        self.queue_wait: deque = deque(maxlen=LATENCY_WINDOW)
+        self.job_latency: deque = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        # (thread, queue it serves)
+        self._threads: List[Tuple[threading.Thread, queue.PriorityQueue]] = []
+
+        # Prometheus metrics of the tools, plus the queue state set when rendered
+        self.prometheus = ScrapeMetrics(tool='scraper_service')
+        for tool in (scraper, finder):
+            tool.metrics = self.prometheus
+            tool.session.recorder = combine_recorders(tool.session.recorder, self.prometheus)
+        register = self.prometheus.registry.register
+        self._queue_depth = register(Gauge('mot_service_queue_depth', 'Work items waiting in the queue.'))
+        self._in_flight = register(Gauge('mot_service_in_flight', 'Work items being processed.'))
+        self._jobs_gauge = register(Gauge('mot_service_jobs', 'Known jobs, by status.', ['status']))
+
+    def start(self) -> None:
+        """Start the scrape worker threads and the finder thread."""
+        threads = [(f'service-worker-{i}', self.queue) for i in range(self.workers)]
+        threads.append(('service-finder', self.finder_queue))
+        for name, work_queue in threads:
+            thread = threading.Thread(target=self._work, args=(work_queue,), name=name, daemon=True)
+            thread.start()
+            self._threads.append((thread, work_queue))
+
+    def stop(self) -> None:
+        """Stop the workers once the items in progress finish."""
+        for _, work_queue in self._threads:
+            # Sentinels sort before any job
+            work_queue.put((float('-inf'), next(self._sequence), None, None, 0.0))
+        for thread, _ in self._threads:
+            thread.join()
+
+    def submit(self, spec: Dict) -> Job:
+        """Validate a job specification and queue the job.
+
+        Args:
+            spec: Job specification ({'type': ..., 'priority': ..., ...})
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If the specification is invalid
+        """
+        if not isinstance(spec, dict):
+            raise ValueError('job must be a JSON object')
+        job_type = spec.get('type')
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"type must be one of: {', '.join(JOB_TYPES)}")
+        priority = spec.get('priority', 0)
+        if not isinstance(priority, int):
+            raise ValueError('priority must be an integer')
+
+        if job_type == 'scrape':
+            models = spec.get('models')
+            if isinstance(models, str):
+                models = [models]
+            if not models or not all(isinstance(m, str) and m.strip() for m in models):
+                raise ValueError('models must be a non-empty list of model IDs or URLs')
+            params = {
+                'models': list(dict.fromkeys(self.scraper.normalize_model_input(m) for m in models)),
+                'output_dir': self._job_output_dir(spec.get('output_dir')),
+            }
+        else:
+            fields = spec.get('fields')
+            if isinstance(fields, list):
+                fields = ','.join(fields)
+            try:
+                params = {
+                    'min_downloads': int(spec.get('min_downloads', 1000)),
+                    'limit': int(spec.get('limit', 1000)),
+                    'model_type': spec.get('model_type'),
+                    'fields': parse_fields(fields) if fields else None,
+                }
+            except (AttributeError, TypeError, ValueError) as e:
+                raise ValueError(f"invalid find-missing parameters: {e}")
+
+        with self._lock:
+            job = Job(f"job-{next(self._job_ids)}", job_type, params, priority)
+            self.jobs[job.id] = job
+            items = params['models'] if job_type == 'scrape' else [None]
+            job.pending = len(items)
+            enqueued = time.monotonic()
+            work_queue = self.queue if job_type == 'scrape' else self.finder_queue
+            for model_id in items:
+                work_queue.put((-priority, next(self._sequence), job, model_id, enqueued))
+            self._forget_finished_jobs()
+
+        print(f"Queued {job.id} ({job_type}, priority {priority}, {len(items)} items)")
+        return job
+
+    def _job_output_dir(self, output_dir) -> str:
+        """Resolve the output directory of a scrape job.
+
+        Args:
+            output_dir: Directory requested by the job, relative to the service's
+                output directory or absolute (None for the output directory itself)
+
+        Returns:
+            The directory path
+
+        Raises:
+            ValueError: If the directory lies outside the service's output directory
+        """
+        if output_dir is None:
+            return self.output_dir
+        if not isinstance(output_dir, str):
+            raise ValueError('output_dir must be a string')
+        base = Path(self.output_dir).resolve()
+        path = (base / output_dir).resolve()
+        if path != base and base not in path.parents:
+            raise ValueError(f"output_dir must be inside {self.output_dir}")
+        return str(path)
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """Look up a job by ID, None if unknown or forgotten."""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        """All known jobs in submission order."""
+        with self._lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job: Job) -> None:
+        """Cancel the work items of a job that have not started yet."""
+        with job.changed:
+            if not job.done:
+                job.cancelled = True
+                if job.status == 'queued':
+                    job.status = 'cancelled'
+                    job.finished = time.time()
+                job.changed.notify_all()
+
+    def _forget_finished_jobs(self) -> None:
+        """Drop the oldest finished jobs beyond MAX_FINISHED_JOBS (lock held)."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def _work(self, work_queue: queue.PriorityQueue) -> None:
+        """Worker: process items of a queue until a stop sentinel."""
+        while True:
+            _, _, job, model_id, enqueued = work_queue.get()
+            if job is None:
+                return
+
+            with job.changed:
+                skip = job.cancelled
+                if skip:
+                    job.pending -= 1
+                    if job.pending == 0 and not job.done:
+                        self._finish(job, 'cancelled')
+                elif job.status == 'queued':
+                    job.status = 'running'
+                    job.started = time.time()
+            if skip:
+                with self._lock:
+                    self.counts['cancelled'] += 1
+                continue
+
+            with self._lock:
+                self.in_flight += 1
+                self.queue_wait.append(time.monotonic() - enqueued)
+            try:
+                if job.type == 'scrape':
+                    self._scrape(job, model_id)
+                else:
+                    self._find_missing(job)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                with job.changed:
+                    job.pending -= 1
+                    if job.pending == 0 and not job.done:
+                        self._finish(job, 'failed' if job.error else ('cancelled' if job.cancelled else 'done'))
+
+    def _finish(self, job: Job, status: str) -> None:
+        """Mark a job finished and wake its result streams (job.changed held)."""
+        job.status = status
+        job.finished = time.time()
+        job.changed.notify_all()
+        with self._lock:
+            self.job_latency.append(job.finished - job.submitted)
+        print(f"Finished {job.id}: {status}, {len(job.results)} results")
+
+    def _add_result(self, job: Job, result: Dict) -> None:
+        """Append a result to a job and wake its result streams."""
+        with job.changed:
+            job.results.append(result)
+            job.changed.notify_all()
+
+    def _scrape(self, job: Job, model_id: str) -> None:
+        """Scrape one model of a scrape job."""
+        result = self.scraper.scrape_to_file(model_id, job.params['output_dir'])
+        with self._lock:
+            self.counts['scraped' if result['status'] == 'success' else 'failed'] += 1
+            self.scrape_latency.append(result['elapsed'])
+        self._add_result(job, result)
+
+    def _find_missing(self, job: Job) -> None:
+        """Run a find-missing job, adding a record per missing model as it is found."""
+        params = job.params
+        # Runs only on the finder thread: the finder keeps per-run indexes
+        try:
+            mot_models = self.finder.get_mot_models()
+            hf_models = self.finder.iter_huggingface_models(
+                min_downloads=params['min_downloads'],
+                limit=params['limit'],
+                model_type=params['model_type'],
+                fields=params['fields']
+            )
+            for record in self.finder.iter_missing_models(hf_models, mot_models):
+                if job.cancelled:
+                    break
+                self._add_result(job, record)
+                with self._lock:
+                    self.counts['found_missing'] += 1
+        except Exception as e:
+            job.error = str(e)
+            print(f"Error in {job.id}: {e}")
+
+    def metrics(self) -> Dict:
+        """Service metrics: queue, jobs, throughput, latency percentiles and HTTP counters."""
+        with self._lock:
+            jobs: Dict[str, int] = {}
+            for job in self.jobs.values():
+                jobs[job.status] = jobs.get(job.status, 0) + 1
+            return {
+                'uptime_seconds': time.time() - self.started,
+                'workers': self.workers,
+                'queue_depth': self.queue.qsize() + self.finder_queue.qsize(),
+                'in_flight': self.in_flight,
+                'jobs': jobs,
+                'models': dict(self.counts),
+                'latency_seconds': {
+                    'scrape': percentiles(self.scrape_latency),
+                    'queue_wait': percentiles(self.queue_wait),
+                    'job': percentiles(self.job_latency),
+                },
+                'http': {
+                    'scraper': self.scraper.session.stats.snapshot(),
+                    'finder': self.finder.session.stats.snapshot(),
+                },
+                'github': {
+                    'probes': self.scraper.repo_prober.probes,
+                    'memo_hits': self.scraper.repo_prober.memo_hits,
+                },
+            }
+
+    def prometheus_metrics(self) -> str:
+        """Service and tool metrics in the Prometheus text exposition format."""
+        with self._lock:
+            self._queue_depth.set(self.queue.qsize() + self.finder_queue.qsize())
+            self._in_flight.set(self.in_flight)
+            jobs = dict.fromkeys(('queued', 'running', 'done', 'failed', 'cancelled'), 0)
+            for job in self.jobs.values():
+                jobs[job.status] = jobs.get(job.status, 0) + 1
+            for status, count in jobs.items():
+                self._jobs_gauge.set(count, status)
+        return self.prometheus.render()
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """Routes the job API to the service."""
+
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def service(self) -> ScraperService:
+        return self.server.service
+
+    def setup(self) -> None:
+        # Stream results line by line without Nagle delays (TCP only)
+        self.disable_nagle_algorithm = isinstance(self.client_address, tuple)
+        super().setup()
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args) -> None:
+        pass  # Jobs are logged by the service instead of every request
+
+    def send_json(self, status: int, body: Dict) -> None:
+        """Send a JSON response."""
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_error_json(self, status: int, message: str) -> None:
+        """Send a JSON error response."""
+        self.send_json(status, {'error': message})
+
+    def send_metrics(self, query: str) -> None:
+        """Send the metrics as JSON, or in the Prometheus text format if asked for."""
+        accept = self.headers.get('Accept', '')
+        if (parse_qs(query).get('format', [''])[0] == 'prometheus'
+                or 'text/plain' in accept or 'application/openmetrics-text' in accept):
+            data = self.service.prometheus_metrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self.send_json(200, self.service.metrics())
+
+    def stream_results(self, job: Job) -> None:
+        """Stream a job's results as NDJSON until it finishes, then close the connection.
+
+        Each line is {"type": "result", "job": ID, "result": {...}}; the last
+        one is {"type": "end", "job": {...status...}}.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for result in job.iter_results():
+                self.wfile.write((json.dumps({'type': 'result', 'job': job.id, 'result': result}) + '\n').encode('utf-8'))
+                self.wfile.flush()
+            self.wfile.write((json.dumps({'type': 'end', 'job': job.describe()}) + '\n').encode('utf-8'))
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client went away; the job keeps running
+
+    def authorized(self) -> bool:
+        """Check the request's bearer token, answering 401 if it is required and wrong."""
+        token = self.server.token
+        if not token:
+            return True
+        header = self.headers.get('Authorization', '')
+        if header.startswith('Bearer ') and hmac.compare_digest(header[7:].encode('utf-8'), token.encode('utf-8')):
+            return True
+        data = json.dumps({'error': 'missing or invalid bearer token'}).encode('utf-8')
+        self.send_response(401)
+        self.send_header('WWW-Authenticate', 'Bearer')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        return False
+
+    def find_job(self, job_id: str) -> Optional[Job]:
+        """Look up a job, answering 404 if unknown."""
+        job = self.service.get_job(job_id)
+        if job is None:
+            self.send_error_json(404, f"unknown job: {job_id}")
+        return job
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        parts = [part for part in parsed.path.split('/') if part]
+
+        if parts == ['health']:
+            self.send_json(200, {'status': 'ok'})
+        elif not self.authorized():
+            return
+        elif parts == ['metrics']:
+            self.send_metrics(parsed.query)
+        elif parts == ['jobs']:
+            self.send_json(200, {'jobs': [job.describe() for job in self.service.list_jobs()]})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self.find_job(parts[1])
+            if job is not None:
+                self.send_json(200, job.describe(results=True))
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'results':
+            job = self.find_job(parts[1])
+            if job is not None:
+                self.stream_results(job)
+        else:
+            self.send_error_json(404, f"no route for GET {parsed.path}")
+
+    def do_POST(self) -> None:
+        parsed = urlparse(self.path)
+        if not self.authorized():
+            return
+        if parsed.path.rstrip('/') != '/jobs':
+            self.send_error_json(404, f"no route for POST {parsed.path}")
+            return
+        # Cross-origin pages can only send this content type after a CORS preflight,
+        # which the service never answers
+        if self.headers.get('Content-Type', '').split(';')[0].strip().lower() != 'application/json':
+            self.send_error_json(415, 'jobs must be submitted as Content-Type: application/json')
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            spec = json.loads(self.rfile.read(length) or b'{}')
+            job = self.service.submit(spec)
+        except ValueError as e:
+            self.send_error_json(400, str(e))
+            return
+
+        if parse_qs(parsed.query).get('stream', ['0'])[0] not in ('0', 'false', ''):
+            self.stream_results(job)
+        else:
+            self.send_json(202, job.describe())
+
+    def do_DELETE(self) -> None:
+        if not self.authorized():
+            return
+        parts = [part for part in urlparse(self.path).path.split('/') if part]
+        if len(parts) != 2 or parts[0] != 'jobs':
+            self.send_error_json(404, f"no route for DELETE {self.path}")
+            return
+        job = self.find_job(parts[1])
+        if job is not None:
+            self.service.cancel(job)
+            self.send_json(200, job.describe())
+
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    """Job API over TCP."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service: ScraperService, token: Optional[str] = None):
+        super().__init__(address, ServiceRequestHandler)
+        self.service = service
+        self.token = token
+
+
+class ServiceUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Job API over a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, service: ScraperService, token: Optional[str] = None):
+        if os.path.exists(path):
+            os.unlink(path)  # Left over from a previous run
+        super().__init__(path, ServiceRequestHandler)
+        self.service = service
+        self.token = token
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Run a resident scraper service accepting scrape and find-missing jobs over a local API'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    parser.add_argument('--socket', help='Listen on this Unix socket path instead of TCP')
+    parser.add_argument(
+        '--token',
+        default=os.environ.get('MOT_SERVICE_TOKEN'),
+        help='Bearer token every request but /health must send (default: $MOT_SERVICE_TOKEN, none)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Number of models scraped concurrently (default: 4)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default='../models',
+        help='Default output directory for YAML files (default: ../models)'
+    )
+    parser.add_argument(
+        '--models-dir',
+        default='../models',
+        help='Path to MOT models directory for find-missing jobs (default: ../models)'
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=2.0,
+        help='Maximum requests per second per host, 0 for no fixed limit (default: 2.0)'
+    )
+    parser.add_argument(
+        '--hf-token',
+        help='HuggingFace API token for accessing gated models'
+    )
+    parser.add_argument(
+        '--max-card-kb',
+        type=int,
+        default=DEFAULT_MAX_CARD_BYTES // 1024,
+        help=f'Maximum size of a model card read, in KB, 0 for no limit (default: {DEFAULT_MAX_CARD_BYTES // 1024})'
+    )
+    parser.add_argument(
+        '--max-tree-kb',
+        type=int,
+        default=DEFAULT_MAX_TREE_BYTES // 1024,
+        help=f'Maximum size of a repository file listing page read, in KB, 0 for no limit (default: {DEFAULT_MAX_TREE_BYTES // 1024})'
+    )
+    parser.add_argument(
+        '--tree-depth',
+        type=int,
+        default=DEFAULT_TREE_DEPTH,
+        help=f'Subdirectory levels of the repository listed below the top level, 0 for the top level only (default: {DEFAULT_TREE_DEPTH})'
+    )
+
+    add_cache_arguments(parser)
+
+    args = parser.parse_args()
+    cache = cache_from_args(args)
+
+    scraper = ModelScraper(
+        hf_token=args.hf_token,
+        rate_limit=args.rate_limit,
+        pool_size=max(10, args.workers),
+        cache=cache,
+        max_card_bytes=args.max_card_kb * 1024 or None,
+        max_tree_bytes=args.max_tree_kb * 1024 or None,
+        tree_depth=args.tree_depth
+    )
+    finder = MissingModelsFinder(
+        models_dir=args.models_dir,
+        cache=cache,
+        corpus_cache=None if args.no_cache else Path(args.cache_dir) / 'models_corpus.pickle'
+    )
+    service = ScraperService(scraper, finder, args.output_dir, workers=args.workers)
+
+    if args.socket:
+        server = ServiceUnixServer(args.socket, service, token=args.token)
+        where = f"unix socket {args.socket}"
+    else:
+        server = ServiceHTTPServer((args.host, args.port), service, token=args.token)
+        where = f"http://{args.host}:{server.server_address[1]}"
+
+    # Stop gracefully on SIGTERM (e.g. from a process supervisor) as on Ctrl-C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    service.start()
+    print(f"Scraper service listening on {where} with {service.workers} workers (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping, waiting for models in progress to finish...")
+    finally:
+        server.server_close()
+        service.stop()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
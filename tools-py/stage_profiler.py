@@ -0,0 +1,417 @@
+"""
+Model Openness Tool - Stage Profiler
+
+Per-stage timing of the scraping pipeline and the missing models finder, to
+tell whether a slow batch spends its time on the HuggingFace API, README
+downloads, tree listings, GitHub probes, card detection or YAML formatting.
+
+StageProfiler wraps selected methods of a scraper or finder instance and
+records the wall and CPU time of every call, attributed to the model being
+processed. Stages nest (scrape_huggingface_model contains the fetches,
+_extract_model_metadata contains _detect_repository), so stage times are
+inclusive. CPU time is per thread (time.thread_time); coroutine stages of
+the async engine share one thread and only get wall time. With cprofile
+enabled, each thread running a stage also runs a cProfile profiler while
+it is inside one, and the profiles are merged at the end.
+
+Results are written as a JSON summary (per stage and per model totals,
+plus the hottest functions when profiling) and as Chrome trace events,
+viewable in chrome://tracing or https://ui.perfetto.dev.
+
+Example:
+    profiler = StageProfiler(cprofile=True)
+    profiler.instrument(scraper, SCRAPER_STAGES)
+    ...
+    profiler.write('scrape_profile')
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import inspect
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Stages of ModelScraper and AsyncModelScraper; methods an instance lacks are skipped
+SCRAPER_STAGES = (
+    'scrape_to_file',
+    'scrape_to_file_async',
+    'scrape_huggingface_model',
+    '_fetch_model_info',
+    '_fetch_model_card',
+    '_fetch_repo_features',
+    'scrape_huggingface_model_async',
+    '_fetch_model_info_async',
+    '_fetch_model_card_async',
+    '_fetch_repo_features_async',
+    'probe_repositories',
+    '_probe_repositories_async',
+    'detect_components',
+    '_extract_model_metadata',
+    '_detect_repository',
+    '_detect_license',
+    'generate_yaml',
+    '_format_yaml_mot_style',
+)
+
+# Stages of MissingModelsFinder
+FINDER_STAGES = (
+    'get_mot_models',
+    '_fetch_listing_page',
+    'match_models',
+    '_match_model',
+    'generate_report',
+)
+
+# Functions listed in the summary when cProfile is enabled
+TOP_FUNCTIONS = 30
+
+# Model being processed by the current thread or task, for stages that do
+# not take the model as an argument (e.g. _format_yaml_mot_style)
+_current_model: contextvars.ContextVar = contextvars.ContextVar('current_model', default=None)
+
+
+def _model_id_getter(method: Callable) -> Callable:
+    """Build a function finding the model ID in the arguments of a stage method.
+
+    Args:
+        method: Bound method of the stage
+
+    Returns:
+        Function of (args, kwargs) returning the model ID, or None
+    """
+    try:
+        params = list(inspect.signature(method).parameters)
+    except (TypeError, ValueError):
+        params = []
+
+    if 'model_id' in params:
+        index = params.index('model_id')
+        return lambda args, kwargs: kwargs.get('model_id', args[index] if len(args) > index else None)
+
+    for name in ('scraped_data', 'hf_model'):
+        if name in params:
+            index = params.index(name)
+
+            def getter(args, kwargs, name=name, index=index):
+                data = kwargs.get(name, args[index] if len(args) > index else None)
+                if isinstance(data, dict):
+                    return data.get('model_id') or data.get('id')
+                return None
+            return getter
+
+    return lambda args, kwargs: None
+
+
+class StageProfiler:
+    """Records the wall and CPU time of pipeline stages per model."""
+
+    def __init__(self, cprofile: bool = False):
+        """Initialize the profiler.
+
+        Args:
+            cprofile: Whether to run cProfile while inside a stage
+        """
+        self.cprofile = cprofile
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+        # (stage, model_id, thread id, thread name, start, wall seconds, CPU seconds or None)
+        self.events: List[tuple] = []
+        self._profiles: List[cProfile.Profile] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def instrument(self, obj, stages: Iterable[str]) -> None:
+        """Wrap the stage methods of an instance so each call is recorded.
+
+        Args:
+            obj: Scraper or finder instance
+            stages: Names of the methods to wrap; missing ones are skipped
+        """
+        for name in stages:
+            method = getattr(obj, name, None)
+            if method is None:
+                continue
+            model_id = _model_id_getter(method)
+            if asyncio.iscoroutinefunction(method):
+                wrapper = self._wrap_coroutine(name, method, model_id)
+            else:
+                wrapper = self._wrap(name, method, model_id)
+            setattr(obj, name, functools.wraps(method)(wrapper))
+
+    def _wrap(self, name: str, method: Callable, model_id: Callable) -> Callable:
+        """Wrap a synchronous stage method."""
+        def wrapper(*args, **kwargs):
+            with self.stage(name, model_id(args, kwargs)):
+                return method(*args, **kwargs)
+        return wrapper
+
+    def _wrap_coroutine(self, name: str, method: Callable, model_id: Callable) -> Callable:
+        """Wrap a coroutine stage method (wall time only)."""
+        async def wrapper(*args, **kwargs):
+            model = model_id(args, kwargs) or _current_model.get()
+            token = _current_model.set(model)
+            start = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                _current_model.reset(token)
+                self._record(name, model, start, time.perf_counter() - start, None, coroutine=True)
+        return wrapper
+
+    @contextmanager
+    def stage(self, name: str, model_id: Optional[str] = None):
+        """Record the time spent in a block of code as a stage.
+
+        Args:
+            name: Stage name
+            model_id: Model the stage works on (default: the enclosing stage's)
+        """
+        model_id = model_id or _current_model.get()
+        token = _current_model.set(model_id)
+        self._enter_cprofile()
+        start_cpu = time.thread_time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - start_cpu
+            self._exit_cprofile()
+            _current_model.reset(token)
+            self._record(name, model_id, start, wall, cpu)
+
+    def _enter_cprofile(self) -> None:
+        """Start this thread's cProfile profiler when entering its outermost stage."""
+        if not self.cprofile:
+            return
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        if depth:
+            return
+        profile = getattr(self._local, 'profile', None)
+        if profile is False:
+            return
+        if profile is None:
+            profile = self._local.profile = cProfile.Profile()
+            with self._lock:
+                self._profiles.append(profile)
+        try:
+            profile.enable()
+        except ValueError:
+            # Interpreters allowing a single active profiler (Python 3.12+)
+            # refuse a second thread's; that thread goes unprofiled
+            self._local.profile = False
+
+    def _exit_cprofile(self) -> None:
+        """Stop this thread's cProfile profiler when leaving its outermost stage."""
+        if not self.cprofile:
+            return
+        self._local.depth -= 1
+        if not self._local.depth and self._local.profile:
+            self._local.profile.disable()
+
+    def _record(
+        self,
+        name: str,
+        model_id: Optional[str],
+        start: float,
+        wall: float,
+        cpu: Optional[float],
+        coroutine: bool = False
+    ) -> None:
+        """Append one stage call to the events."""
+        thread = threading.current_thread()
+        # Coroutine stages interleave on one thread; give each model its own trace row
+        tid = f"async:{model_id}" if coroutine else thread.ident
+        thread_name = f"async {model_id}" if coroutine else thread.name
+        with self._lock:
+            self.events.append((name, model_id, tid, thread_name, start - self.started, wall, cpu))
+
+    def summary(self) -> Dict:
+        """Summarize the recorded stages.
+
+        Returns:
+            Dictionary with the total wall and CPU time, per stage totals and
+            latency percentiles, per model stage totals and, with cprofile,
+            the functions with the most internal time
+        """
+        stages: Dict[str, Dict] = {}
+        models: Dict[str, Dict] = {}
+        walls: Dict[str, List[float]] = {}
+
+        for name, model_id, _, _, _, wall, cpu in self.events:
+            walls.setdefault(name, []).append(wall)
+            stage = stages.setdefault(name, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': None})
+            stage['calls'] += 1
+            stage['wall_seconds'] += wall
+            if cpu is not None:
+                stage['cpu_seconds'] = (stage['cpu_seconds'] or 0.0) + cpu
+
+            if model_id:
+                per_model = models.setdefault(model_id, {}).setdefault(
+                    name, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': None}
+                )
+                per_model['calls'] += 1
+                per_model['wall_seconds'] += wall
+                if cpu is not None:
+                    per_model['cpu_seconds'] = (per_model['cpu_seconds'] or 0.0) + cpu
+
+        for name, stage in stages.items():
+            ordered = sorted(walls[name])
+            stage['wall_mean'] = stage['wall_seconds'] / len(ordered)
+            stage['wall_p50'] = ordered[(len(ordered) - 1) // 2]
+            stage['wall_p95'] = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+            stage['wall_max'] = ordered[-1]
+
+        summary = {
+            'wall_seconds': time.perf_counter() - self.started,
+            'cpu_seconds': time.process_time() - self.started_cpu,
+            'stages': dict(sorted(stages.items(), key=lambda item: -item[1]['wall_seconds'])),
+            'models': models,
+        }
+        stats = self.stats()
+        if stats is not None:
+            summary['functions'] = [
+                {
+                    'function': f"{filename}:{line}({function})",
+                    'calls': calls,
+                    'tottime': tottime,
+                    'cumtime': cumtime,
+                }
+                for (filename, line, function), (_, calls, tottime, cumtime, _) in sorted(
+                    stats.stats.items(), key=lambda item: -item[1][2]
+                )[:TOP_FUNCTIONS]
+            ]
+        return summary
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """Merged cProfile statistics of all threads, or None without cprofile."""
+        profiles = [profile for profile in self._profiles if profile.getstats()]
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def trace_events(self) -> Dict:
+        """Stages as Chrome trace events (complete events, in microseconds).
+
+        Returns:
+            Trace document for chrome://tracing or Perfetto
+        """
+        pid = os.getpid()
+        tids: Dict = {}
+        events = []
+        for name, model_id, tid, thread_name, start, wall, cpu in self.events:
+            if tid not in tids:
+                tids[tid] = len(tids) + 1
+                events.append({
+                    'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tids[tid],
+                    'args': {'name': thread_name},
+                })
+            args = {'model_id': model_id}
+            if cpu is not None:
+                args['cpu_ms'] = round(cpu * 1000, 3)
+            events.append({
+                'name': name,
+                'cat': 'stage',
+                'ph': 'X',
+                'ts': round(start * 1_000_000, 1),
+                'dur': round(wall * 1_000_000, 1),
+                'pid': pid,
+                'tid': tids[tid],
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, prefix: str) -> List[str]:
+        """Write the summary, the trace and (with cprofile) the raw profile.
+
+        Args:
+            prefix: Path prefix; writes PREFIX.json, PREFIX.trace.json and PREFIX.prof
+
+        Returns:
+            Paths of the files written
+        """
+        paths = [f"{prefix}.json", f"{prefix}.trace.json"]
+        with open(paths[0], 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+        with open(paths[1], 'w', encoding='utf-8') as f:
+            json.dump(self.trace_events(), f)
+        stats = self.stats()
+        if stats is not None:
+            paths.append(f"{prefix}.prof")
+            stats.dump_stats(paths[2])
+        return paths
+
+    def print_summary(self) -> None:
+        """Print the per stage totals."""
+        summary = self.summary()
+        print(f"\nStage profile ({summary['wall_seconds']:.2f}s wall, {summary['cpu_seconds']:.2f}s CPU):")
+        print(f"  {'stage':<32} {'calls':>7} {'wall s':>9} {'cpu s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        for name, stage in summary['stages'].items():
+            cpu = f"{stage['cpu_seconds']:.3f}" if stage['cpu_seconds'] is not None else '-'
+            print(f"  {name:<32} {stage['calls']:>7} {stage['wall_seconds']:>9.3f} {cpu:>9} "
+                  f"{stage['wall_p50'] * 1000:>9.1f} {stage['wall_p95'] * 1000:>9.1f}")
+
+
+def add_profile_arguments(parser, default_prefix: str) -> None:
+    """Add the shared profiling command-line options to an argument parser.
+
+    Args:
+        parser: argparse.ArgumentParser to extend
+        default_prefix: Output prefix used when --profile is given without one
+    """
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const=default_prefix,
+        metavar='PREFIX',
+        help=f'Record per-stage wall and CPU time and write PREFIX.json and PREFIX.trace.json '
+             f'(Chrome trace events) (default prefix: {default_prefix})'
+    )
+    parser.add_argument(
+        '--cprofile',
+        action='store_true',
+        help='With --profile, also run cProfile inside the stages and write PREFIX.prof'
+    )
+
+
+def profiler_from_args(args, parser=None) -> Optional[StageProfiler]:
+    """Create the stage profiler selected by the shared command-line options.
+
+    Args:
+        args: Parsed arguments (see add_profile_arguments)
+        parser: Parser used to report option errors
+
+    Returns:
+        StageProfiler, or None if profiling is disabled
+    """
+    if args.cprofile and not args.profile:
+        if parser is not None:
+            parser.error('--cprofile requires --profile')
+        raise SystemExit('error: --cprofile requires --profile')
+    if not args.profile:
+        return None
+    return StageProfiler(cprofile=args.cprofile)
+
+
+def finish_profile(profiler: Optional[StageProfiler], prefix: str) -> None:
+    """Print the stage summary and write the profile files, if profiling.
+
+    Args:
+        profiler: Profiler, or None if profiling is disabled
+        prefix: Output path prefix (see StageProfiler.write)
+    """
+    if profiler is None:
+        return
+    profiler.print_summary()
+    print(f"Profile written to: {', '.join(profiler.write(prefix))}")
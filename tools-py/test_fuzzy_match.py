@@ -0,0 +1,58 @@
+"""
+Tests for fuzzy_match.
+
+Run with:
+    python -m pytest test_fuzzy_match.py
+"""
+
+import pytest
+
+from fuzzy_match import FuzzyMatcher, extract_features
+
+
+def mot_model(file: str, name: str) -> dict:
+    """A MOT model entry as MissingModelsFinder.get_mot_models returns it."""
+    return {'file': file, 'name': name, 'origin': None, 'huggingface': None}
+
+
+def best_score(mot_names, model_id: str) -> float:
+    """Score of the best MOT match of a model ID, 0 if none."""
+    models = {name: mot_model(f'{name}.yml', name) for name in mot_names}
+    candidates = FuzzyMatcher(models).candidates(model_id, min_score=0.0)
+    return candidates[0][1] if candidates else 0.0
+
+
+@pytest.mark.parametrize('first, second', [
+    ('Qwen2-7B', 'Qwen-27B'),
+    ('Llama-3.1-8B', 'Llama-3-18B'),
+])
+def test_token_boundaries_keep_models_apart(first, second):
+    assert extract_features(first).key != extract_features(second).key
+    assert best_score([first], f'org/{second}') < 0.9
+    assert best_score([second], f'org/{first}') < 0.9
+
+
+@pytest.mark.parametrize('model_id', [
+    'meta-llama/Llama-3-8B-Instruct',
+    'someone/llama3-8b-instruct',
+    'someone/Llama-3-8B-Instruct-GGUF',
+])
+def test_spelling_and_format_variants_share_a_key(model_id):
+    assert extract_features(model_id).key == extract_features('Llama-3-8B-Instruct').key
+
+
+def test_exact_and_fork_scores():
+    assert best_score(['Llama-3-8B-Instruct'], 'meta-llama/Llama-3-8B-Instruct') == 1.0
+    assert best_score(['Llama-3-8B-Instruct'], 'someone/Llama-3-8B-Instruct-GGUF') == 0.95
+
+
+def test_different_size_is_not_a_match():
+    assert best_score(['Llama-2-7B'], 'meta-llama/Llama-2-70B') < 0.9
+    assert best_score(['Mistral-7B-v0.1'], 'mistralai/Mistral-7B-v0.2') < 0.9
+
+
+def test_candidates_ranked_best_first():
+    models = {name: mot_model(f'{name}.yml', name) for name in ('Falcon-7B', 'Falcon-40B', 'Phi-2')}
+    candidates = FuzzyMatcher(models).candidates('tiiuae/falcon-7b')
+    assert candidates[0] == ('Falcon-7B.yml', 1.0)
+    assert all(file != 'Phi-2.yml' for file, _ in candidates)
@@ -0,0 +1,164 @@
+"""
+Tests for the persistent HTTP response cache.
+
+Run with:
+    python -m pytest test_http_cache.py
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_cache import ResponseCache, classify_url
+from http_session import RateLimitedSession
+
+MODEL_URL = 'https://huggingface.co/api/models/org/model'
+CARD_URL = 'https://huggingface.co/org/model/raw/main/README.md'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(cache_dir=str(tmp_path))
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """Serves one body with an ETag, answering 304 to a matching If-None-Match."""
+
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            return
+        body = b'{"id": "org/model"}'
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def etag_server():
+    ETagHandler.requests_seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_key_separates_tokens(cache):
+    assert cache.make_key('get', MODEL_URL) == f"GET {MODEL_URL}"
+    anonymous = cache.make_key('GET', MODEL_URL)
+    token_a = cache.make_key('GET', MODEL_URL, 'Bearer a')
+    token_b = cache.make_key('GET', MODEL_URL, 'Bearer b')
+    assert len({anonymous, token_a, token_b}) == 3
+    assert 'Bearer' not in token_a
+
+
+def test_entries_are_not_shared_between_tokens(cache):
+    assert cache.put('GET', CARD_URL, 200, {}, b'gated card', authorization='Bearer a')
+    assert cache.get('GET', CARD_URL, 'Bearer a').body == b'gated card'
+    assert cache.get('GET', CARD_URL) is None
+    assert cache.get('GET', CARD_URL, 'Bearer b') is None
+
+
+def test_uncacheable_responses(cache):
+    assert not cache.put('GET', MODEL_URL, 500, {}, b'error')
+    assert not cache.put('GET', MODEL_URL, 429, {}, b'slow down')
+    assert not cache.put('GET', MODEL_URL, 200, {'Cache-Control': 'no-store'}, b'{}')
+    assert cache.put('GET', CARD_URL, 404, {}, b'not found')
+    assert cache.get('GET', MODEL_URL) is None
+    assert cache.get('GET', CARD_URL).status == 404
+
+
+def test_wire_headers_are_dropped(cache):
+    cache.put('GET', MODEL_URL, 200, {'Content-Encoding': 'gzip', 'Content-Length': '9', 'ETag': '"x"'}, b'{}')
+    entry = cache.get('GET', MODEL_URL)
+    assert entry.headers == {'ETag': '"x"'}
+    assert entry.etag == '"x"'
+
+
+def test_ttl_per_endpoint_class(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), ttls={'hf_model': 10})
+    cache.put('GET', MODEL_URL, 200, {}, b'{}')
+    entry = cache.get('GET', MODEL_URL)
+    assert classify_url(MODEL_URL) == 'hf_model'
+    assert cache.is_fresh(entry)
+    assert not cache.is_fresh(entry._replace(stored_at=time.time() - 11))
+
+    cache.refresh = True
+    assert not cache.is_fresh(entry)
+    cache.refresh = False
+    cache.offline = True
+    assert cache.is_fresh(entry._replace(stored_at=0))
+
+
+def test_touch_makes_entry_fresh(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), ttls={'hf_model': 10})
+    cache.put('GET', MODEL_URL, 200, {}, b'{}')
+    stale = cache.get('GET', MODEL_URL)._replace(stored_at=0)
+    cache.touch(stale)
+    assert cache.is_fresh(cache.get('GET', MODEL_URL))
+
+
+def test_session_revalidates_with_etag(tmp_path, etag_server):
+    cache = ResponseCache(cache_dir=str(tmp_path), ttls={'other': 0})
+    session = RateLimitedSession(cache=cache)
+    url = f"{etag_server}/api/item"
+
+    first = session.get(url)
+    second = session.get(url)
+
+    assert first.cache_status == 'miss'
+    assert second.cache_status == 'revalidated'
+    assert second.status_code == 200
+    assert second.content == first.content == b'{"id": "org/model"}'
+    assert ETagHandler.requests_seen == [None, '"v1"']
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), max_bytes=1000)
+    for i in range(4):
+        cache.put('GET', f"{MODEL_URL}{i}", 200, {}, b'x' * 250)
+        time.sleep(0.01)
+    cache.get('GET', f"{MODEL_URL}0")
+    assert cache.size() == 1000
+
+    cache.put('GET', f"{MODEL_URL}4", 200, {}, b'x' * 250)
+
+    # Over the limit: evicted down to 90%, oldest access first
+    assert cache.size() <= 900
+    assert cache.get('GET', f"{MODEL_URL}0") is not None
+    assert cache.get('GET', f"{MODEL_URL}1") is None
+    assert cache.get('GET', f"{MODEL_URL}4") is not None
+
+
+def test_running_total_tracks_replace_and_clear(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    cache.put('GET', MODEL_URL, 200, {}, b'x' * 100)
+    cache.put('GET', MODEL_URL, 200, {}, b'x' * 30)
+    cache.put('GET', CARD_URL, 200, {}, b'x' * 20)
+    assert cache.size() == 50
+
+    # A second handle on the same file sees the same total
+    assert ResponseCache(cache_dir=str(tmp_path)).size() == 50
+
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_oversized_body_is_not_stored(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path), max_bytes=10)
+    assert not cache.put('GET', MODEL_URL, 200, {}, b'x' * 11)
+    assert cache.size() == 0
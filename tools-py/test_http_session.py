@@ -0,0 +1,110 @@
+"""
+Tests for the streaming helpers of http_session.
+
+Run with:
+    python -m pytest test_http_session.py
+"""
+
+import io
+import json
+
+import pytest
+import requests
+
+from http_cache import ResponseCache
+from http_session import RateLimitedSession, iter_json_array
+
+
+def split_every(data: bytes, size: int):
+    """Cut data into chunks of size bytes."""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def streamed_response(body: bytes, url: str) -> requests.Response:
+    """Build a streamed 200 response whose body is still to be read."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.raw = io.BytesIO(body)
+    response.cache_pending = ('GET', url, None)
+    return response
+
+
+ITEMS = [
+    12345,
+    -0.5e10,
+    True,
+    None,
+    'plain',
+    'quote " backslash \\ slash / tab \t newline \n',
+    'unicode é中\U0001f600',
+    {'type': 'file', 'path': 'a/b.json', 'size': 1024, 'lfs': {'oid': 'x' * 40}},
+    [1, [2, [3]], {}],
+    '',
+    0,
+]
+DOCUMENT = json.dumps(ITEMS).encode('utf-8')
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 7, 64, len(DOCUMENT)])
+def test_items_split_across_chunks(size):
+    assert list(iter_json_array(split_every(DOCUMENT, size))) == ITEMS
+
+
+def test_number_split_at_chunk_boundary():
+    assert list(iter_json_array([b'[12', b'34, 5]'])) == [1234, 5]
+    assert list(iter_json_array([b'[1.', b'5e', b'3, tr', b'ue]'])) == [1500.0, True]
+
+
+def test_escapes_split_across_chunks():
+    document = json.dumps(['a\\"b', 'é\\u1234']).encode('utf-8')
+    for at in range(1, len(document)):
+        assert list(iter_json_array([document[:at], document[at:]])) == ['a\\"b', 'é\\u1234']
+    assert list(iter_json_array([b'["\\u00', b'e9", "\\', b'"x"]'])) == ['é', '"x']
+
+
+def test_truncated_stream_yields_complete_items_only():
+    assert list(iter_json_array([DOCUMENT[:-1]])) == ITEMS[:-1]
+    assert list(iter_json_array([b'[1, 2, {"path": "a'])) == [1, 2]
+    assert list(iter_json_array([b'[1, 23'])) == [1]
+    assert list(iter_json_array([b''])) == []
+
+
+def test_whitespace_and_empty_array():
+    assert list(iter_json_array([b' \n[ ', b']\n'])) == []
+    assert list(iter_json_array([b'[ 1 ,', b'\t2 ]'])) == [1, 2]
+
+
+def test_not_an_array():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"a": 1}']))
+
+
+def test_input_read_past_closing_bracket():
+    chunks = iter([b'[1, 2]', b'\n', b' '])
+    assert list(iter_json_array(chunks)) == [1, 2]
+    assert next(chunks, None) is None
+
+
+def test_streamed_array_is_cached(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    session = RateLimitedSession(cache=cache)
+    url = 'https://huggingface.co/api/models/org/model/tree/main'
+    body = json.dumps([{'type': 'file', 'path': 'f%d' % i} for i in range(20)]).encode('utf-8') + b'\n'
+
+    response = streamed_response(body, url)
+    items = list(iter_json_array(session.iter_capped(response, None, chunk_size=16)))
+
+    assert len(items) == 20
+    assert cache.get('GET', url).body == body
+
+
+def test_streamed_body_over_cap_is_not_cached(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path))
+    session = RateLimitedSession(cache=cache)
+    url = 'https://huggingface.co/org/model/raw/main/README.md'
+
+    response = streamed_response(b'x' * 100, url)
+    assert b''.join(session.iter_capped(response, 40, chunk_size=16)) == b'x' * 40
+    assert response.truncated
+    assert cache.get('GET', url) is None
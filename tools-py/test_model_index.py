@@ -0,0 +1,114 @@
+"""
+Tests for model_index.
+
+Run with:
+    python -m pytest test_model_index.py
+"""
+
+import os
+import shutil
+
+import pytest
+
+from model_index import ModelIndex, build_index, load_index
+
+MODEL_YAML = """\
+release:
+  name: {name}
+  origin: {origin}
+  huggingface: https://huggingface.co/org/{name}
+  license:
+    distribution:
+      name: {license}
+  components:
+    - name: Model architecture
+      license: Apache-2.0
+    - name: Model parameters (Final)
+"""
+
+
+def write_model(models_dir, name, license='MIT', origin='Base'):
+    """Write a MOT model YAML file and return its path."""
+    path = models_dir / f'{name}.yml'
+    path.write_text(MODEL_YAML.format(name=name, origin=origin, license=license), encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    models = tmp_path / 'models'
+    models.mkdir()
+    write_model(models, 'Alpha-7B', license='MIT')
+    write_model(models, 'Beta-1B', license='Llama-3.1', origin='Alpha-7B')
+    return models
+
+
+def test_build_and_lookup(models_dir, tmp_path):
+    index_path = tmp_path / 'models.idx'
+    assert build_index(str(models_dir), str(index_path)) == 2
+
+    with ModelIndex(str(index_path)) as index:
+        records = {model.name: model for model in index}
+        assert len(index) == 2
+        alpha = records['Alpha-7B']
+        assert alpha.file == 'Alpha-7B.yml'
+        assert alpha.origin == 'Base'
+        assert alpha.huggingface == 'https://huggingface.co/org/Alpha-7B'
+        assert alpha.licenses == ('MIT', 'Apache-2.0')
+        assert alpha.components == ('Model architecture', 'Model parameters (Final)')
+        assert records['Beta-1B'].licenses == ('Llama-3.1', 'Apache-2.0')
+        with pytest.raises(IndexError):
+            index[2]
+        assert not index.is_stale(str(models_dir))
+
+
+def test_stale_after_added_file(models_dir, tmp_path):
+    index_path = tmp_path / 'models.idx'
+    build_index(str(models_dir), str(index_path))
+    write_model(models_dir, 'Gamma-2B')
+    with ModelIndex(str(index_path)) as index:
+        assert index.is_stale(str(models_dir))
+
+
+def test_stale_after_rename(models_dir, tmp_path):
+    index_path = tmp_path / 'models.idx'
+    build_index(str(models_dir), str(index_path))
+    os.rename(models_dir / 'Beta-1B.yml', models_dir / 'Beta-2B.yml')
+    with ModelIndex(str(index_path)) as index:
+        assert index.is_stale(str(models_dir))
+
+
+def test_stale_after_replacing_with_older_file(models_dir, tmp_path):
+    index_path = tmp_path / 'models.idx'
+    build_index(str(models_dir), str(index_path))
+
+    # As after `cp -p` or a checkout: same count, no newer mtime than before
+    older = tmp_path / 'older.yml'
+    write_model(tmp_path, 'older', license='GPL-3.0-only')
+    stat = (models_dir / 'Alpha-7B.yml').stat()
+    os.utime(older, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 9))
+    shutil.copy2(older, models_dir / 'Alpha-7B.yml')
+
+    with ModelIndex(str(index_path)) as index:
+        assert index.is_stale(str(models_dir))
+    with load_index(str(models_dir), str(index_path)) as index:
+        assert 'GPL-3.0-only' in {license for model in index for license in model.licenses}
+
+
+def test_load_index_rebuilds_truncated_file(models_dir, tmp_path):
+    index_path = tmp_path / 'models.idx'
+    build_index(str(models_dir), str(index_path))
+    data = index_path.read_bytes()
+    index_path.write_bytes(data[:len(data) - 5])
+
+    with pytest.raises(ValueError):
+        ModelIndex(str(index_path))
+    with load_index(str(models_dir), str(index_path)) as index:
+        assert sorted(model.name for model in index) == ['Alpha-7B', 'Beta-1B']
+
+
+def test_not_an_index(tmp_path):
+    path = tmp_path / 'models.idx'
+    path.write_bytes(b'not an index at all, but long enough for a header')
+    with pytest.raises(ValueError):
+        ModelIndex(str(path))
@@ -0,0 +1,107 @@
+"""
+Tests for the scrape checkpoint journal.
+
+Run with:
+    python -m pytest test_scrape_journal.py
+"""
+
+import json
+
+from model_scraper import ModelScraper, run_batch
+from scrape_journal import ScrapeJournal
+
+
+def result(model_id, status='success'):
+    return {'model_id': model_id, 'status': status, 'output': f"{model_id}.yml", 'error': None, 'elapsed': 0.1}
+
+
+class FakeScraper(ModelScraper):
+    """Scraper that succeeds for every model without any request."""
+
+    def __init__(self):
+        super().__init__()
+        self.scraped = []
+
+    def iter_scrape_many(self, model_ids, output_dir, workers):
+        for model_id in model_ids:
+            self.scraped.append(model_id)
+            yield result(model_id)
+
+
+def test_entries_survive_reopen(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    with ScrapeJournal(str(path)) as journal:
+        journal.record(result('org/a'))
+        journal.record(result('org/b', 'failed'))
+        journal.record(result('org/b'))
+
+    with ScrapeJournal(str(path)) as journal:
+        assert journal.is_complete('org/a')
+        assert journal.is_complete('org/b')
+        assert journal.attempts('org/b') == 2
+        assert not journal.is_complete('org/c')
+
+
+def test_latest_attempt_wins(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    with ScrapeJournal(str(path)) as journal:
+        journal.record(result('org/a'))
+        journal.record(result('org/a', 'failed'))
+
+    with ScrapeJournal(str(path)) as journal:
+        assert not journal.is_complete('org/a')
+        assert journal.attempts('org/a') == 2
+
+
+def test_resume_from_truncated_journal(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    with ScrapeJournal(str(path)) as journal:
+        journal.record(result('org/a'))
+        journal.record(result('org/b'))
+    # Crash while writing the entry of org/b: its line lost the newline and more
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+
+    with ScrapeJournal(str(path)) as journal:
+        assert journal.is_complete('org/a')
+        assert not journal.is_complete('org/b')
+        journal.record(result('org/c'))
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['model_id'] for line in lines] == ['org/a', 'org/c']
+
+
+def test_torn_line_is_dropped_even_if_it_parses(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text(json.dumps({'model_id': 'org/a', 'status': 'success'}), encoding='utf-8')
+
+    with ScrapeJournal(str(path)) as journal:
+        assert not journal.is_complete('org/a')
+    assert path.read_bytes() == b''
+
+
+def test_corrupt_line_is_skipped(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text('not json\n' + json.dumps({'model_id': 'org/a', 'status': 'success'}) + '\n',
+                    encoding='utf-8')
+
+    with ScrapeJournal(str(path)) as journal:
+        assert journal.is_complete('org/a')
+
+
+def test_batch_resumes_remaining_models(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    with ScrapeJournal(str(path)) as journal:
+        journal.record(result('org/a'))
+        journal.record(result('org/b', 'failed'))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"model_id": "org/c", "sta')
+
+    scraper = FakeScraper()
+    with ScrapeJournal(str(path)) as journal:
+        status = run_batch(scraper, ['org/a', 'org/b', 'org/c'], str(tmp_path), workers=1, journal=journal)
+
+    assert status == 0
+    assert scraper.scraped == ['org/b', 'org/c']
+    with ScrapeJournal(str(path)) as journal:
+        assert all(journal.is_complete(m) for m in ('org/a', 'org/b', 'org/c'))
@@ -0,0 +1,148 @@
+"""
+Tests for the Prometheus text exposition of scrape_metrics.
+
+Run with:
+    python -m pytest test_scrape_metrics.py
+"""
+
+import argparse
+import re
+
+import pytest
+import requests
+
+from scrape_metrics import (
+    CONTENT_TYPE, Counter, Histogram, MetricsRegistry, ScrapeMetrics, add_metrics_arguments, metrics_from_args
+)
+
+# name{labels} value, as the text exposition format writes a sample
+SAMPLE_RE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="(\\.|[^"\\])*",?)*\})? \S+$')
+
+
+def sample_lines(text):
+    return [line for line in text.splitlines() if not line.startswith('#')]
+
+
+def test_every_line_is_valid_exposition_format():
+    metrics = ScrapeMetrics(tool='model_scraper')
+    metrics.model_scraped({'status': 'success', 'elapsed': 1.5})
+    metrics.record('GET', 'https://huggingface.co/api/models/org/m', 200, 0.0, 0.2, size=10)
+    metrics.record('GET', 'https://github.com/org/m', None, 0.0, 5.0, error='timeout')
+    text = metrics.render()
+
+    assert text.endswith('\n')
+    for line in text.splitlines():
+        if line.startswith('# HELP ') or line.startswith('# TYPE '):
+            continue
+        assert SAMPLE_RE.match(line), line
+
+
+def test_help_and_type_precede_samples():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter('mot_things_total', 'Things counted.', ['kind']))
+    counter.inc('a')
+    counter.inc('a', amount=2)
+    counter.inc('b')
+
+    assert registry.render().splitlines() == [
+        '# HELP mot_things_total Things counted.',
+        '# TYPE mot_things_total counter',
+        'mot_things_total{kind="a"} 3',
+        'mot_things_total{kind="b"} 1',
+    ]
+
+
+def test_tool_label_comes_first_on_every_sample():
+    metrics = ScrapeMetrics(tool='find_missing_models')
+    metrics.model_matched(False, 'high')
+    for line in sample_lines(metrics.render()):
+        assert line.split('{', 1)[1].startswith('tool="find_missing_models"'), line
+
+    assert 'tool=' not in ScrapeMetrics().render()
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter('mot_escaped_total', 'Escaping.', ['value']))
+    counter.inc('back\\slash "quoted"\nnewline')
+    assert 'mot_escaped_total{value="back\\\\slash \\"quoted\\"\\nnewline"} 1' in registry.render()
+
+
+def test_wrong_label_count_is_rejected():
+    counter = Counter('mot_labeled_total', 'Labeled.', ['a', 'b'])
+    with pytest.raises(ValueError):
+        counter.inc('only-one')
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram('mot_seconds', 'Durations.', ['endpoint'], buckets=(1.0, 0.5)))
+    for value in (0.2, 0.7, 0.7, 3.0):
+        histogram.observe(value, 'hf_model')
+
+    assert sample_lines(registry.render()) == [
+        'mot_seconds_bucket{endpoint="hf_model",le="0.5"} 1',
+        'mot_seconds_bucket{endpoint="hf_model",le="1"} 3',
+        'mot_seconds_bucket{endpoint="hf_model",le="+Inf"} 4',
+        'mot_seconds_sum{endpoint="hf_model"} 4.6',
+        'mot_seconds_count{endpoint="hf_model"} 4',
+    ]
+
+
+def test_requests_are_counted_by_host_endpoint_and_status():
+    metrics = ScrapeMetrics()
+    entry = metrics.record('GET', 'https://huggingface.co/api/models/org/m/tree/main', 200, 0.0, 0.1,
+                           retries=2, rate_limited=1, blocked=1.5, cache_status='revalidated')
+    metrics.set_size(entry, 100)
+    metrics.set_size(entry, 250)
+    metrics.record('GET', 'https://huggingface.co/org/m/raw/main/README.md', None, 0.0, 1.0, error='reset')
+    text = metrics.render()
+
+    assert 'mot_http_requests_total{host="huggingface.co",endpoint="hf_tree",status="200"} 1' in text
+    assert 'mot_http_requests_total{host="huggingface.co",endpoint="hf_file",status="error"} 1' in text
+    assert 'mot_http_response_bytes_total{endpoint="hf_tree"} 250' in text
+    assert 'mot_http_retries_total{endpoint="hf_tree"} 2' in text
+    assert 'mot_http_rate_limited_total{host="huggingface.co"} 1' in text
+    assert 'mot_http_blocked_seconds_total{host="huggingface.co"} 1.5' in text
+    assert 'mot_http_cache_hits_total{endpoint="hf_tree"} 1' in text
+
+
+def test_drafts_and_components_are_counted():
+    metrics = ScrapeMetrics()
+    metrics.draft_written([{'name': 'Model architecture'}, {'name': 'Model card'}], 'name: é\n')
+    text = metrics.render()
+    assert 'mot_yaml_files_written_total 1' in text
+    assert 'mot_yaml_bytes_written_total 9' in text
+    assert 'mot_components_detected_total{component="Model card"} 1' in text
+
+
+def test_http_endpoint_serves_metrics():
+    metrics = ScrapeMetrics(tool='model_scraper')
+    port = metrics.start_http_server(0)
+    try:
+        response = requests.get(f"http://127.0.0.1:{port}/metrics", timeout=5)
+        missing = requests.get(f"http://127.0.0.1:{port}/other", timeout=5)
+    finally:
+        metrics.close()
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == CONTENT_TYPE
+    assert 'mot_start_time_seconds{tool="model_scraper"}' in response.text
+    assert missing.status_code == 404
+
+
+def test_textfile_is_written_again_on_close(tmp_path):
+    path = tmp_path / 'mot.prom'
+    parser = argparse.ArgumentParser()
+    add_metrics_arguments(parser)
+
+    assert metrics_from_args(parser.parse_args([]), 'model_scraper') is None
+
+    metrics = metrics_from_args(parser.parse_args(['--metrics-textfile', str(path), '--metrics-interval', '60']),
+                                'model_scraper')
+    assert 'mot_yaml_files_written_total{tool="model_scraper"} 0' in path.read_text(encoding='utf-8')
+    metrics.draft_written([], 'x')
+    metrics.close()
+
+    assert 'mot_yaml_files_written_total{tool="model_scraper"} 1' in path.read_text(encoding='utf-8')
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,125 @@
+"""
+Tests for the missing models pipeline, against the local HuggingFace stand-in.
+
+Run with:
+    python -m pytest test_scrape_missing_models.py
+"""
+
+from pathlib import Path
+
+import pytest
+
+from find_missing_models import MissingModelsFinder
+from mock_hf_server import MockHuggingFaceServer, PayloadStore
+from model_scraper import ModelScraper
+from scrape_journal import ScrapeJournal
+from scrape_missing_models import MissingModelsPipeline
+
+
+class FlakyStore(PayloadStore):
+    """Payload store whose model info is invalid JSON for the first requests of some models."""
+
+    def __init__(self, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = dict(failures)
+
+    def model_info(self, model_id):
+        if self.failures.get(model_id, 0) > 0:
+            self.failures[model_id] -= 1
+            return '{"id": '
+        return super().model_info(model_id)
+
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def start(store):
+        servers.append(MockHuggingFaceServer(store).start())
+        return servers[-1]
+
+    yield start
+    for srv in servers:
+        srv.stop()
+
+
+def make_pipeline(srv, tmp_path, **kwargs):
+    models_dir = tmp_path / 'models'
+    models_dir.mkdir(exist_ok=True)
+    finder = MissingModelsFinder(models_dir=str(models_dir), fuzzy_threshold=None)
+    scraper = ModelScraper()
+    for tool in (finder, scraper):
+        tool.session.endpoints = srv.endpoints()
+        tool.session.backoff = 0.0
+    return MissingModelsPipeline(finder, scraper, str(tmp_path / 'out'), **kwargs)
+
+
+def test_scrapes_missing_models(server, tmp_path):
+    srv = server(PayloadStore(listing_size=50))
+    pipeline = make_pipeline(srv, tmp_path, workers=3)
+
+    results = pipeline.run(min_downloads=0, limit=50, max_models=10)
+
+    assert pipeline.discovered == 10
+    assert len(results) == 10
+    assert all(result['status'] == 'success' for result in results)
+    assert all(Path(result['output']).exists() for result in results)
+    assert {result['model_id'] for result in results} == {m['id'] for m in srv.store.listing[:10]}
+
+
+def test_max_models_closes_listing(server, tmp_path):
+    srv = server(PayloadStore(listing_size=3000))
+    pipeline = make_pipeline(srv, tmp_path, workers=1, queue_size=1)
+
+    pipeline.run(min_downloads=0, limit=3000, max_models=2)
+
+    # 30 pages would cover the limit; only the window fetched ahead was requested
+    assert pipeline.discovered == 2
+    assert 0 < pipeline.finder.listing_requests <= pipeline.finder.page_window + 1
+
+
+def test_discovery_shares_scraper_rate_limit(server, tmp_path):
+    pipeline = make_pipeline(server(PayloadStore(listing_size=1)), tmp_path)
+    assert pipeline.finder.session.rate_limiter is pipeline.scraper.session.rate_limiter
+
+
+def test_failed_models_are_retried(server, tmp_path):
+    flaky = PayloadStore.listing_entry(1)['id']
+    srv = server(FlakyStore({flaky: 1}, listing_size=5))
+    journal = ScrapeJournal(str(tmp_path / 'journal.jsonl'))
+    pipeline = make_pipeline(srv, tmp_path, workers=2, journal=journal, retries=2, retry_backoff=0.0)
+
+    results = pipeline.run(min_downloads=0, limit=5)
+    journal.close()
+
+    assert len(results) == 5
+    assert all(result['status'] == 'success' for result in results)
+    assert journal.attempts(flaky) == 2
+    assert srv.store.failures[flaky] == 0
+
+
+def test_journal_skips_completed_models(server, tmp_path):
+    srv = server(PayloadStore(listing_size=5))
+    done = srv.store.listing[0]['id']
+    with ScrapeJournal(str(tmp_path / 'journal.jsonl')) as journal:
+        journal.record({'model_id': done, 'status': 'success', 'output': 'x.yml'})
+        pipeline = make_pipeline(srv, tmp_path, journal=journal)
+        results = pipeline.run(min_downloads=0, limit=5)
+
+    assert pipeline.skipped == 1
+    assert done not in {result['model_id'] for result in results}
+    assert len(results) == 4
+
+
+def test_chunks_take_waiting_models(tmp_path):
+    pipeline = MissingModelsPipeline(MissingModelsFinder(models_dir=str(tmp_path)), ModelScraper(),
+                                     str(tmp_path), workers=1, queue_size=10)
+    assert pipeline.chunk_size == ModelScraper.PROBE_CHUNK_FACTOR
+    for i in range(6):
+        pipeline.queue.put(f"org/model-{i}")
+    pipeline.queue.put(None)
+
+    assert pipeline._next_chunk() == [f"org/model-{i}" for i in range(4)]
+    assert pipeline._next_chunk() == ['org/model-4', 'org/model-5']
+    assert pipeline._next_chunk() is None
+    assert pipeline._next_chunk() is None
@@ -0,0 +1,115 @@
+"""
+Tests for the memoized derived values of ScrapeResult.
+
+Run with:
+    python -m pytest test_scrape_result.py
+"""
+
+from collections import Counter
+
+import pytest
+
+from model_scraper import ModelScraper
+from repo_tree import RepoFeatures
+from scrape_result import ScrapeResult
+
+CARD = """---
+license: apache-2.0
+---
+# Model Card for Tiny-1B
+
+Tiny-1B is a transformer decoder. Code: https://github.com/org/tiny.
+Evaluation results are in the paper.
+"""
+
+
+class CountingScraper(ModelScraper):
+    """Scraper counting detector calls, with every GitHub repository existing."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = Counter()
+
+    def _check_repo_exists(self, repo_url):
+        self.calls['probe'] += 1
+        return True
+
+    def _extract_model_metadata(self, scraped_data):
+        self.calls['metadata'] += 1
+        return super()._extract_model_metadata(scraped_data)
+
+    def detect_components(self, scraped_data):
+        self.calls['components'] += 1
+        return super().detect_components(scraped_data)
+
+    def _detect_license(self, scraped_data):
+        self.calls['license'] += 1
+        return super()._detect_license(scraped_data)
+
+    def _detect_repository(self, scraped_data):
+        self.calls['repository'] += 1
+        return super()._detect_repository(scraped_data)
+
+
+@pytest.fixture
+def scraper():
+    return CountingScraper()
+
+
+def scraped(scraper, **fields):
+    data = {
+        'model_id': 'org/Tiny-1B',
+        'model_info': {'id': 'org/Tiny-1B', 'tags': ['text-generation'], 'cardData': {'license': 'apache-2.0'}},
+        'model_card': CARD,
+        'repo_files': ['README.md', 'config.json', 'model.safetensors', 'train.py'],
+        'confidence': {},
+    }
+    data.update(fields)
+    return ScrapeResult(scraper, data)
+
+
+def test_is_a_dict_of_the_raw_fields(scraper):
+    result = scraped(scraper)
+    assert isinstance(result, dict)
+    assert result['model_id'] == 'org/Tiny-1B'
+    assert scraper.as_result(result) is result
+
+
+def test_derived_values_are_computed_once(scraper):
+    result = scraped(scraper)
+    for _ in range(3):
+        result.metadata
+        result.components
+        result.license
+        result.repository
+    assert result.card_analysis is result.card_analysis
+    assert all(count == 1 for name, count in scraper.calls.items() if name != 'probe')
+    assert {'metadata', 'components', 'license', 'repository'} <= set(scraper.calls)
+
+
+def test_writing_a_draft_reuses_the_derived_values(scraper, tmp_path):
+    result = scraped(scraper)
+    path = scraper.write_draft(result, str(tmp_path))
+
+    assert path.endswith('.yml')
+    assert scraper.calls['metadata'] == 1
+    assert scraper.calls['components'] == 1
+    assert scraper.calls['license'] == 1
+    assert scraper.calls['repository'] == 1
+
+
+def test_repo_features_from_listing_or_given(scraper):
+    built = scraped(scraper)
+    assert built.repo_features.has_name('config.json')
+    assert built.repo_features is built.repo_features
+
+    features = RepoFeatures.from_paths(['LICENSE'])
+    given = ScrapeResult(scraper, {'repo_files': ['config.json']}, repo_features=features)
+    assert given.repo_features is features
+    assert 'repo_features' not in given
+
+
+def test_plain_dicts_are_wrapped_per_call(scraper):
+    data = dict(scraped(scraper))
+    assert scraper.as_result(data) is not scraper.as_result(data)
+    assert scraper.analyze_card(data).has('paper')
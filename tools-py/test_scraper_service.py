@@ -0,0 +1,173 @@
+"""
+Tests for the scraper service job API, against the local HuggingFace stand-in.
+
+Run with:
+    python -m pytest test_scraper_service.py
+"""
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+import requests
+
+from find_missing_models import MissingModelsFinder
+from mock_hf_server import MockHuggingFaceServer, PayloadStore
+from model_scraper import ModelScraper
+from scrape_metrics import CONTENT_TYPE
+from scraper_service import ScraperService, ServiceHTTPServer
+
+TOKEN = 'secret-token'
+AUTH = {'Authorization': f'Bearer {TOKEN}'}
+
+
+@pytest.fixture
+def hf_server():
+    srv = MockHuggingFaceServer(PayloadStore(listing_size=20)).start()
+    yield srv
+    srv.stop()
+
+
+@pytest.fixture
+def service(hf_server, tmp_path):
+    models_dir = tmp_path / 'models'
+    models_dir.mkdir()
+    finder = MissingModelsFinder(models_dir=str(models_dir), fuzzy_threshold=None)
+    scraper = ModelScraper()
+    for tool in (finder, scraper):
+        tool.session.endpoints = hf_server.endpoints()
+    return ScraperService(scraper, finder, str(tmp_path / 'out'), workers=2)
+
+
+@pytest.fixture
+def api(service):
+    service.start()
+    server = ServiceHTTPServer(('127.0.0.1', 0), service, token=TOKEN)
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    service.stop()
+
+
+def submit(api, spec, stream=False):
+    return requests.post(f"{api}/jobs{'?stream=1' if stream else ''}", json=spec, headers=AUTH,
+                         stream=stream, timeout=30)
+
+
+def read_stream(response):
+    return [json.loads(line) for line in response.iter_lines() if line]
+
+
+def test_health_needs_no_token(api):
+    assert requests.get(f"{api}/health", timeout=5).json() == {'status': 'ok'}
+
+
+def test_token_is_required(api):
+    assert requests.get(f"{api}/jobs", timeout=5).status_code == 401
+    assert requests.get(f"{api}/jobs", headers={'Authorization': 'Bearer wrong'}, timeout=5).status_code == 401
+    assert requests.get(f"{api}/jobs", headers=AUTH, timeout=5).status_code == 200
+
+
+def test_jobs_must_be_json(api):
+    response = requests.post(f"{api}/jobs", data='{"type": "scrape", "models": ["org/m"]}',
+                             headers=dict(AUTH, **{'Content-Type': 'text/plain'}), timeout=5)
+    assert response.status_code == 415
+
+
+@pytest.mark.parametrize('spec', [
+    {'type': 'unknown'},
+    {'type': 'scrape', 'models': []},
+    {'type': 'scrape', 'models': ['org/m'], 'priority': 'high'},
+    {'type': 'find-missing', 'limit': 'many'},
+])
+def test_invalid_jobs_are_rejected(api, spec):
+    response = submit(api, spec)
+    assert response.status_code == 400
+    assert 'error' in response.json()
+
+
+def test_scrape_job_streams_results(api, hf_server, service):
+    models = [m['id'] for m in hf_server.store.listing[:3]]
+    with submit(api, {'type': 'scrape', 'models': models}, stream=True) as response:
+        assert response.headers['Content-Type'] == 'application/x-ndjson'
+        lines = read_stream(response)
+
+    results = [line['result'] for line in lines if line['type'] == 'result']
+    assert sorted(result['model_id'] for result in results) == sorted(models)
+    assert all(result['status'] == 'success' for result in results)
+    assert all(Path(result['output']).parent == Path(service.output_dir).resolve() for result in results)
+    assert lines[-1]['type'] == 'end'
+    assert lines[-1]['job']['status'] == 'done'
+
+    job = requests.get(f"{api}/jobs/{lines[-1]['job']['id']}", headers=AUTH, timeout=5).json()
+    assert job['result_count'] == 3
+    assert len(job['results']) == 3
+
+
+def test_job_status_and_results_stream(api, hf_server):
+    job = submit(api, {'type': 'scrape', 'models': hf_server.store.listing[0]['id']})
+    assert job.status_code == 202
+    job_id = job.json()['id']
+
+    with requests.get(f"{api}/jobs/{job_id}/results", headers=AUTH, stream=True, timeout=30) as response:
+        lines = read_stream(response)
+    assert [line['type'] for line in lines] == ['result', 'end']
+
+    listed = requests.get(f"{api}/jobs", headers=AUTH, timeout=5).json()['jobs']
+    assert [j['id'] for j in listed] == [job_id]
+    assert requests.get(f"{api}/jobs/job-999", headers=AUTH, timeout=5).status_code == 404
+
+
+def test_job_output_dir_is_confined(api, hf_server, service, tmp_path):
+    model_id = hf_server.store.listing[0]['id']
+    for output_dir in ('../escape', str(tmp_path / 'elsewhere'), 'sub/../../escape'):
+        response = submit(api, {'type': 'scrape', 'models': [model_id], 'output_dir': output_dir})
+        assert response.status_code == 400, output_dir
+    assert not (tmp_path / 'escape').exists()
+    assert not (tmp_path / 'elsewhere').exists()
+
+    with submit(api, {'type': 'scrape', 'models': [model_id], 'output_dir': 'sub'}, stream=True) as response:
+        result = read_stream(response)[0]['result']
+    assert Path(result['output']).parent == (Path(service.output_dir) / 'sub').resolve()
+
+
+def test_find_missing_job_streams_records(api, hf_server):
+    with submit(api, {'type': 'find-missing', 'min_downloads': 0, 'limit': 5}, stream=True) as response:
+        lines = read_stream(response)
+
+    records = [line['result'] for line in lines if line['type'] == 'result']
+    assert [record['id'] for record in records] == [m['id'] for m in hf_server.store.listing[:5]]
+    assert lines[-1]['job']['status'] == 'done'
+
+
+def test_metrics_in_prometheus_format(api, hf_server):
+    submit(api, {'type': 'scrape', 'models': [hf_server.store.listing[0]['id']]}, stream=True).close()
+
+    response = requests.get(f"{api}/metrics", headers=dict(AUTH, Accept='text/plain'), timeout=5)
+    assert response.headers['Content-Type'] == CONTENT_TYPE
+    assert 'mot_service_queue_depth{tool="scraper_service"}' in response.text
+
+    assert 'queue_depth' in requests.get(f"{api}/metrics", headers=AUTH, timeout=5).json()
+
+
+def test_higher_priority_runs_first(service):
+    low = service.submit({'type': 'scrape', 'models': ['org/a', 'org/b']})
+    high = service.submit({'type': 'scrape', 'models': ['org/c'], 'priority': 10})
+
+    order = [service.queue.get()[2:4] for _ in range(3)]
+    assert order == [(high, 'org/c'), (low, 'org/a'), (low, 'org/b')]
+
+
+def test_cancelled_job_skips_queued_models(service):
+    job = service.submit({'type': 'scrape', 'models': ['org/a', 'org/b']})
+    service.cancel(job)
+    service.start()
+    try:
+        assert list(job.iter_results(poll=0.1)) == []
+    finally:
+        service.stop()
+    assert job.status == 'cancelled'
+    assert job.pending == 0
+    assert service.counts['cancelled'] == 2